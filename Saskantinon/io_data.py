@@ -6,6 +6,8 @@
 Saskan Data Management middleware.
 """
 
+import json
+import numpy as np
 import platform
 import pygame as pg
 
@@ -17,6 +19,7 @@ from pprint import pformat as pf    # noqa: F401
 
 from io_db import DataBase
 from io_file import FileIO
+from io_lazy import LazyInit
 from io_shell import ShellIO
 
 # may want to move generation of SQL code into DB class
@@ -24,8 +27,6 @@ DB = DataBase()
 FI = FileIO()
 SI = ShellIO()
 
-pg.init()     # Initialize PyGame for use in this module
-
 
 #  UNIQUE CONSTANTS / "TRUE" ENUMS
 # ================================
@@ -347,9 +348,12 @@ class Geom(object):
     SHP = "shape"
 
 
-class GameDisplay(object):
-    """Values related to constructing GUI's, but which do not require
-    importing and initialzing PyGame, nor reading values from configs.
+class GameDisplay(object, metaclass=LazyInit):
+    """Values related to constructing GUI's.
+    Typesetting values are plain constants. Values that need PyGame
+    initialized or config files read (fonts, window and map sizes)
+    are set by lazy_init() the first time one of them is used, so
+    importing this module does not start PyGame.
     """
     # Typesetting
     # -------------------
@@ -360,87 +364,101 @@ class GameDisplay(object):
     FONT_SM_SZ = 24
     FONT_TINY_SZ = 12
     LG_FONT_SZ = 36
-    # PyGame Fonts
-    # -------------------
-    F_SANS_TINY = pg.font.SysFont(FONT_SANS, FONT_TINY_SZ)
-    F_SANS_SM = pg.font.SysFont(FONT_SANS, FONT_SM_SZ)
-    F_SANS_MED = pg.font.SysFont(FONT_SANS, FONT_MED_SZ)
-    F_SANS_LG = pg.font.SysFont(FONT_SANS, LG_FONT_SZ)
-    F_FIXED_LG = pg.font.SysFont(FONT_FXD, LG_FONT_SZ)
-    # PyGame Cursors
-    # -------------------
-    CUR_ARROW = pg.cursors.Cursor(pg.SYSTEM_CURSOR_ARROW)
-    CUR_CROSS = pg.cursors.Cursor(pg.SYSTEM_CURSOR_CROSSHAIR)
-    CUR_HAND = pg.cursors.Cursor(pg.SYSTEM_CURSOR_HAND)
-    CUR_IBEAM = pg.cursors.Cursor(pg.SYSTEM_CURSOR_IBEAM)
-    CUR_WAIT = pg.cursors.Cursor(pg.SYSTEM_CURSOR_WAIT)
-    # PyGame Keyboard
-    # -------------------
-    KY_QUIT = (pg.K_q, pg.K_ESCAPE)
-    KY_ANIM = (pg.K_F3, pg.K_F4, pg.K_F5)
-    KY_DATA = (pg.K_a, pg.K_l)
-    KY_RPT_TYPE = (pg.K_KP1, pg.K_KP2, pg.K_KP3)
-    KY_RPT_MODE = (pg.K_UP, pg.K_RIGHT, pg.K_LEFT)
-    # Game Platform
-    # -------------------
-    INFO = pg.display.Info()
-    FRAME = "game_frame"  # --> c_frame.json
-    MENUS = "game_menus"  # --> c_menus.json
-    PLATFORM = (
-        FI.F[FRAME]["dsc"] +
-        #  " | " + platform.platform() +
-        #  " | " + platform.architecture()[0] +
-        f" | monitor (w, h): {INFO.current_w}, {INFO.current_h}" +
-        " | Python " + platform.python_version() +
-        " | Pygame " + pg.version.ver)
-    # Window/overall frame for Game
-    # -----------------------------
-    WIN_W = round(INFO.current_w * 0.9)
-    WIN_H = round(INFO.current_h * 0.9)
-    WIN_MID = (WIN_W / 2, WIN_H / 2)
-    pg.display.set_caption(FI.F[FRAME]["ttl"])
-    KEYMOD_NONE = 4096
-    TIMER = pg.time.Clock()
-    # Don't do display.set_mode() command in data structure
-    # It launches the pygame rendering environment
-    # Move this to Saskan game module or a rendering module -->
-    #    `WIN = pg.display.set_mode((WIN_W, WIN_H))`
-    # Menu bar for Game
-    # -------------------
-    MBAR_X = WIN_W * 0.01
-    MBAR_Y = WIN_H * 0.005
-    MBAR_H = WIN_H * 0.04
-    MBAR_W = 240 if (WIN_W - (MBAR_X * 2)) / len(FI.M[MENUS]["menu"]) > 240\
-        else (WIN_W - (MBAR_X * 2)) / len(FI.M[MENUS]["menu"])
-    MBAR_MARGIN = 6
-    # Game Map (grid) window size for Saskan game
-    # -------------------------------------------
-    GAMEMAP_TTL = FI.W["game_windows"]["gamemap"]["ttl"]
-    GAMEMAP_X = int(round(WIN_W * 0.01))
-    GAMEMAP_Y = int(round(WIN_H * 0.06))
-    GAMEMAP_W = int(round(WIN_W * 0.8))
-    GAMEMAP_H = int(round(WIN_H * 0.9))
-    # Console window for Saskan app
-    # -------------------------------
-    CONSOLE = FI.W["game_windows"]["console"]
-    CONSOLE_X = int(round(GAMEMAP_X + GAMEMAP_W + 20))
-    CONSOLE_Y = GAMEMAP_Y
-    CONSOLE_W = int(round(WIN_W * 0.15))
-    CONSOLE_H = GAMEMAP_H
-    CONSOLE_BOX = pg.Rect(CONSOLE_X, CONSOLE_Y,
-                          CONSOLE_W, CONSOLE_H)
-    # For now, the header/title on CONSOLE is static
-    CONSOLE_TTL_TXT = FI.W["game_windows"]["console"]["ttl"]
-    CONSOLE_TTL_IMG =\
-        F_SANS_MED.render(CONSOLE_TTL_TXT, True,
-                          Colors.CP_BLUEPOWDER,
-                          Colors.CP_BLACK)
-    CONSOLE_TTL_BOX = CONSOLE_TTL_IMG.get_rect()
-    CONSOLE_TTL_BOX.topleft = (CONSOLE_X + 5, CONSOLE_Y + 5)
-    # Info Bar for Saskan app
-    IBAR_LOC = (GAMEMAP_X, int(round(WIN_H * 0.97)))
-    # Help Pages -- external web pages, displayed in a browser
-    WHTM = FI.U["uri"]["help"]
+
+    def __getattr__(self,
+                    p_attr: str):
+        """Forward instance lookups to the class, so that
+        GameDisplay().WIN_W also triggers lazy_init()."""
+        return getattr(type(self), p_attr)
+
+    @classmethod
+    def lazy_init(cls):
+        """Initialize PyGame, then set fonts, cursors, keys, window,
+        menu bar, map and console values. Called once by LazyInit.
+        """
+        pg.init()
+        # PyGame Fonts
+        # -------------------
+        cls.F_SANS_TINY = pg.font.SysFont(cls.FONT_SANS, cls.FONT_TINY_SZ)
+        cls.F_SANS_SM = pg.font.SysFont(cls.FONT_SANS, cls.FONT_SM_SZ)
+        cls.F_SANS_MED = pg.font.SysFont(cls.FONT_SANS, cls.FONT_MED_SZ)
+        cls.F_SANS_LG = pg.font.SysFont(cls.FONT_SANS, cls.LG_FONT_SZ)
+        cls.F_FIXED_LG = pg.font.SysFont(cls.FONT_FXD, cls.LG_FONT_SZ)
+        # PyGame Cursors
+        # -------------------
+        cls.CUR_ARROW = pg.cursors.Cursor(pg.SYSTEM_CURSOR_ARROW)
+        cls.CUR_CROSS = pg.cursors.Cursor(pg.SYSTEM_CURSOR_CROSSHAIR)
+        cls.CUR_HAND = pg.cursors.Cursor(pg.SYSTEM_CURSOR_HAND)
+        cls.CUR_IBEAM = pg.cursors.Cursor(pg.SYSTEM_CURSOR_IBEAM)
+        cls.CUR_WAIT = pg.cursors.Cursor(pg.SYSTEM_CURSOR_WAIT)
+        # PyGame Keyboard
+        # -------------------
+        cls.KY_QUIT = (pg.K_q, pg.K_ESCAPE)
+        cls.KY_ANIM = (pg.K_F3, pg.K_F4, pg.K_F5)
+        cls.KY_DATA = (pg.K_a, pg.K_l)
+        cls.KY_RPT_TYPE = (pg.K_KP1, pg.K_KP2, pg.K_KP3)
+        cls.KY_RPT_MODE = (pg.K_UP, pg.K_RIGHT, pg.K_LEFT)
+        # Game Platform
+        # -------------------
+        cls.INFO = pg.display.Info()
+        cls.FRAME = "game_frame"  # --> c_frame.json
+        cls.MENUS = "game_menus"  # --> c_menus.json
+        cls.PLATFORM = (
+            FI.F[cls.FRAME]["dsc"] +
+            #  " | " + platform.platform() +
+            #  " | " + platform.architecture()[0] +
+            f" | monitor (w, h): {cls.INFO.current_w}, " +
+            f"{cls.INFO.current_h}" +
+            " | Python " + platform.python_version() +
+            " | Pygame " + pg.version.ver)
+        # Window/overall frame for Game
+        # -----------------------------
+        cls.WIN_W = round(cls.INFO.current_w * 0.9)
+        cls.WIN_H = round(cls.INFO.current_h * 0.9)
+        cls.WIN_MID = (cls.WIN_W / 2, cls.WIN_H / 2)
+        pg.display.set_caption(FI.F[cls.FRAME]["ttl"])
+        cls.KEYMOD_NONE = 4096
+        cls.TIMER = pg.time.Clock()
+        # Don't do display.set_mode() command in data structure
+        # It launches the pygame rendering environment
+        # Move this to Saskan game module or a rendering module -->
+        #    `WIN = pg.display.set_mode((WIN_W, WIN_H))`
+        # Menu bar for Game
+        # -------------------
+        cls.MBAR_X = cls.WIN_W * 0.01
+        cls.MBAR_Y = cls.WIN_H * 0.005
+        cls.MBAR_H = cls.WIN_H * 0.04
+        cls.MBAR_W = min(240, (cls.WIN_W - (cls.MBAR_X * 2)) /
+                         len(FI.M[cls.MENUS]["menu"]))
+        cls.MBAR_MARGIN = 6
+        # Game Map (grid) window size for Saskan game
+        # -------------------------------------------
+        cls.GAMEMAP_TTL = FI.W["game_windows"]["gamemap"]["ttl"]
+        cls.GAMEMAP_X = int(round(cls.WIN_W * 0.01))
+        cls.GAMEMAP_Y = int(round(cls.WIN_H * 0.06))
+        cls.GAMEMAP_W = int(round(cls.WIN_W * 0.8))
+        cls.GAMEMAP_H = int(round(cls.WIN_H * 0.9))
+        # Console window for Saskan app
+        # -------------------------------
+        cls.CONSOLE = FI.W["game_windows"]["console"]
+        cls.CONSOLE_X = int(round(cls.GAMEMAP_X + cls.GAMEMAP_W + 20))
+        cls.CONSOLE_Y = cls.GAMEMAP_Y
+        cls.CONSOLE_W = int(round(cls.WIN_W * 0.15))
+        cls.CONSOLE_H = cls.GAMEMAP_H
+        cls.CONSOLE_BOX = pg.Rect(cls.CONSOLE_X, cls.CONSOLE_Y,
+                                  cls.CONSOLE_W, cls.CONSOLE_H)
+        # For now, the header/title on CONSOLE is static
+        cls.CONSOLE_TTL_TXT = FI.W["game_windows"]["console"]["ttl"]
+        cls.CONSOLE_TTL_IMG =\
+            cls.F_SANS_MED.render(cls.CONSOLE_TTL_TXT, True,
+                                  Colors.CP_BLUEPOWDER,
+                                  Colors.CP_BLACK)
+        cls.CONSOLE_TTL_BOX = cls.CONSOLE_TTL_IMG.get_rect()
+        cls.CONSOLE_TTL_BOX.topleft = (cls.CONSOLE_X + 5, cls.CONSOLE_Y + 5)
+        # Info Bar for Saskan app
+        cls.IBAR_LOC = (cls.GAMEMAP_X, int(round(cls.WIN_H * 0.97)))
+        # Help Pages -- external web pages, displayed in a browser
+        cls.WHTM = FI.U["uri"]["help"]
 
 
 #  GAME SIMPLE DATA STRUCTURES
@@ -666,6 +684,243 @@ class GamePlane(object):
                        self.coords['height'])
 
 
+class GameGridCells(object):
+    """
+    Compact storage for the data held in each cell of a grid.
+    Each cell attribute is kept in its own NumPy array, shaped
+    (rows, cols, z-layers), so any cell is an O(1) lookup and a
+    whole z-layer can be sliced out in one step.
+
+    - fill: bool flag, is the cell filled
+    - fill_color, line_color: RGBA values as 4 x uint8
+    - text_id, state_id: int32 keys into the `texts` and `states`
+      lookup lists. ID 0 is always the empty value. Each list has
+      a {key: ID} dict beside it (`text_ids`, `state_ids`), so
+      looking up a value does not scan the list.
+    - touched: bool flag, cell was written since load or init
+
+    Z layers are addressed as in GameGridData: positive (up),
+    zero, and negative (down). Internally the z index is
+    offset by the number of "down" layers.
+
+    A copy() shares the arrays with the original. The first
+    write to an attribute on either object takes a private copy
+    of just that array (copy-on-write), so the two never alias.
+    """
+    ATTRS: tuple = ('fill', 'fill_color', 'line_color',
+                    'text_id', 'state_id', 'touched')
+
+    def __init__(self,
+                 p_rows: int = 1,
+                 p_cols: int = 1,
+                 p_z_up: int = 0,
+                 p_z_down: int = 0):
+        """
+        Allocate arrays for a matrix of rows x cols x z-layers.
+        :args:
+        - p_rows: number of rows
+        - p_cols: number of columns
+        - p_z_up: number of "up" layers
+        - p_z_down: number of "down" layers
+        """
+        self.z_up = p_z_up
+        self.z_down = p_z_down
+        shape = (max(p_rows, 1), max(p_cols, 1), p_z_up + p_z_down + 1)
+        self.fill = np.zeros(shape, dtype=np.bool_)
+        self.fill_color = np.zeros(shape + (4,), dtype=np.uint8)
+        self.fill_color[..., 3] = 255
+        self.line_color = self.fill_color.copy()
+        self.text_id = np.zeros(shape, dtype=np.int32)
+        self.state_id = np.zeros(shape, dtype=np.int32)
+        self.touched = np.zeros(shape, dtype=np.bool_)
+        self.texts: list = ['']
+        self.states: list = [{}]
+        self.text_ids: dict = dict()
+        self.state_ids: dict = dict()
+        self._owned: set = set(self.ATTRS)
+
+    @property
+    def shape(self) -> tuple:
+        """Return (rows, cols, z-layers)."""
+        return self.fill.shape
+
+    def _z_ix(self,
+              p_z: int) -> int:
+        """Convert a signed z-layer to an array index.
+        :args:
+        - p_z: z-layer, -z_down .. z_up
+        """
+        if p_z > self.z_up or p_z < -self.z_down:
+            raise IndexError(f"z-layer {p_z} out of range " +
+                             f"{-self.z_down}..{self.z_up}")
+        return p_z + self.z_down
+
+    def _writable(self,
+                  p_attr: str) -> np.ndarray:
+        """Return the array for an attribute, taking a private
+        copy first if it is still shared with another store.
+        :args:
+        - p_attr: name of the cell attribute
+        """
+        if p_attr not in self._owned:
+            setattr(self, p_attr, getattr(self, p_attr).copy())
+            self._owned.add(p_attr)
+        return getattr(self, p_attr)
+
+    def _intern(self,
+                p_list: list,
+                p_ids: dict,
+                p_value) -> int:
+        """Return the ID of a value in a lookup list, adding it
+        if it is not already there.
+        :args:
+        - p_list: the `texts` or `states` list
+        - p_ids: its {key: ID} dict, `text_ids` or `state_ids`
+        - p_value: value to look up
+        """
+        if p_value in ('', None, {}):
+            return 0
+        key = json.dumps(p_value, sort_keys=True)
+        if key not in p_ids:
+            p_list.append(json.loads(key) if isinstance(p_value, dict)
+                          else p_value)
+            p_ids[key] = len(p_list) - 1
+        return p_ids[key]
+
+    def copy(self) -> 'GameGridCells':
+        """Return a copy-on-write copy of this store."""
+        new = GameGridCells.__new__(GameGridCells)
+        new.z_up = self.z_up
+        new.z_down = self.z_down
+        for attr in self.ATTRS:
+            setattr(new, attr, getattr(self, attr))
+        new.texts = list(self.texts)
+        new.states = [json.loads(json.dumps(st)) for st in self.states]
+        new.text_ids = dict(self.text_ids)
+        new.state_ids = dict(self.state_ids)
+        new._owned = set()
+        self._owned = set()
+        return new
+
+    def get_cell(self,
+                 p_r: int,
+                 p_c: int,
+                 p_z: int = 0) -> dict:
+        """Return the data for one cell.
+        :args:
+        - p_r: row index
+        - p_c: column index
+        - p_z: z-layer, default zero-layer
+        :returns:
+        - (dict) fill, fill_color, line_color, text, state_data;
+          state_data is a copy, since states are shared between cells
+        """
+        ix = (p_r, p_c, self._z_ix(p_z))
+        return {'fill': bool(self.fill[ix]),
+                'fill_color': pg.Color(*self.fill_color[ix].tolist()),
+                'line_color': pg.Color(*self.line_color[ix].tolist()),
+                'text': self.texts[self.text_id[ix]],
+                'state_data':
+                    json.loads(json.dumps(self.states[self.state_id[ix]]))}
+
+    def set_cell(self,
+                 p_r: int,
+                 p_c: int,
+                 p_z: int = 0,
+                 **p_data):
+        """Set one or more values for one cell.
+        :args:
+        - p_r: row index
+        - p_c: column index
+        - p_z: z-layer, default zero-layer
+        - p_data: any of fill, fill_color, line_color, text, state_data
+        """
+        ix = (p_r, p_c, self._z_ix(p_z))
+        if 'fill' in p_data:
+            self._writable('fill')[ix] = p_data['fill']
+        for col in ('fill_color', 'line_color'):
+            if col in p_data:
+                self._writable(col)[ix] = tuple(pg.Color(p_data[col]))
+        if 'text' in p_data:
+            self._writable('text_id')[ix] =\
+                self._intern(self.texts, self.text_ids, p_data['text'])
+        if 'state_data' in p_data:
+            self._writable('state_id')[ix] =\
+                self._intern(self.states, self.state_ids,
+                             p_data['state_data'])
+        self._writable('touched')[ix] = True
+
+    def get_layer(self,
+                  p_attr: str,
+                  p_z: int = 0) -> np.ndarray:
+        """Return a read-only (rows, cols) view of one attribute
+        for a single z-layer.
+        :args:
+        - p_attr: name of the cell attribute
+        - p_z: z-layer, default zero-layer
+        """
+        layer = getattr(self, p_attr)[:, :, self._z_ix(p_z)]
+        layer.flags.writeable = False
+        return layer
+
+    def to_records(self,
+                   p_grid_nm: str,
+                   p_touched_only: bool = True) -> list:
+        """Convert cells to value tuples in GRID_CELL column order.
+        By default only cells written since init or load are returned.
+        :args:
+        - p_grid_nm: grid name, the GRID_CELL foreign key
+        - p_touched_only: if False, return every cell
+        :returns:
+        - (list) of tuples for INSERT_GRID_CELL
+        """
+        ixs = np.argwhere(self.touched) if p_touched_only\
+            else np.argwhere(np.ones(self.shape, dtype=np.bool_))
+        recs = []
+        for r, c, z in ixs.tolist():
+            recs.append((p_grid_nm, r, c, z - self.z_down,
+                         bool(self.fill[r, c, z]),
+                         self.fill_color[r, c, z].tobytes().hex(),
+                         self.line_color[r, c, z].tobytes().hex(),
+                         self.texts[self.text_id[r, c, z]],
+                         json.dumps(self.states[self.state_id[r, c, z]])))
+        return recs
+
+    def from_records(self,
+                     p_grid_nm: str,
+                     p_recs: OrderedDict):
+        """Load cell values from a GRID_CELL query result.
+        Rows for other grids are skipped. Loaded cells are
+        not marked as touched.
+        :args:
+        - p_grid_nm: grid name, the GRID_CELL foreign key
+        - p_recs: dict of lists, as returned by DataBase selects
+        """
+        if not p_recs or p_recs.get('grid_nm_fk') is None:
+            return
+        for i, grid_nm in enumerate(p_recs['grid_nm_fk']):
+            if grid_nm != p_grid_nm:
+                continue
+            ix = (p_recs['cell_r'][i], p_recs['cell_c'][i],
+                  self._z_ix(p_recs['cell_z'][i]))
+            self._writable('fill')[ix] = bool(p_recs['is_filled'][i])
+            self._writable('fill_color')[ix] =\
+                tuple(bytes.fromhex(p_recs['fill_rgba'][i]))
+            self._writable('line_color')[ix] =\
+                tuple(bytes.fromhex(p_recs['line_rgba'][i]))
+            self._writable('text_id')[ix] =\
+                self._intern(self.texts, self.text_ids,
+                             p_recs['cell_text'][i])
+            self._writable('state_id')[ix] =\
+                self._intern(self.states, self.state_ids,
+                             json.loads(p_recs['state_json'][i] or '{}'))
+        self.clear_touched()
+
+    def clear_touched(self):
+        """Mark all cells as unchanged, e.g. after a save or load."""
+        self._writable('touched')[...] = False
+
+
 class GameGridData(object):
     """
     Proivde a data structure to set up a matrix of cells within a grid,
@@ -793,34 +1048,36 @@ class GameGridData(object):
         h = self.cell_size['h'] * self.grid_size['rc'].r
         return {'x': x, 'y': y, 'w': w, 'h': h}
 
-    def set_grid_data(self) -> dict:
-        """Define a structure that holds cell data of various types.
-        Then assign a copy of that structure to each cell in the grid,
-        including the z directions, which here are keyed as positive (up)
-        and negative (down).
-        Might be more efficient to initialize to empty dicts or None?
+    def set_grid_data(self) -> GameGridCells:
+        """Define a structure that holds cell data of various types
+        for each cell in the grid, including the z directions, which
+        are addressed as positive (up) and negative (down).
+        Each cell has its own values; see GameGridCells.
+        """
+        return GameGridCells(self.grid_size['rc'].r,
+                             self.grid_size['rc'].c,
+                             self.grid_size['zz'].z_up,
+                             self.grid_size['zz'].z_down)
+
+    def save_grid_data(self,
+                       p_grid_nm: str):
+        """Write changed cells to the GRID_CELL table.
+        :args:
+        - p_grid_nm: name of the GRID record that owns the cells
+        """
+        DB.execute_insert_many('INSERT_GRID_CELL',
+                               self.grid_data.to_records(p_grid_nm),
+                               p_replace=True)
+        self.grid_data.clear_touched()
+
+    def load_grid_data(self,
+                       p_grid_nm: str):
+        """Read cells for a grid from the GRID_CELL table.
+        :args:
+        - p_grid_nm: name of the GRID record that owns the cells
         """
-        grid_matrix = dict()
-        cell_data = {
-            'fill': False,
-            'fill_color': Colors.CP_BLACK,
-            'line_color': Colors.CP_BLACK,
-            'text': '',
-            'img': Struct.Graphic,
-            'state_data': {}
-        }
-        for r in range(self.grid_size['rc'].r + 1):
-            grid_matrix[r] = dict()
-            for c in range(self.grid_size['rc'].c + 1):
-                grid_matrix[r][c] = dict()
-                for z in range(self.grid_size['zz'].z_up + 1):
-                    grid_matrix[r][c][z] = dict()
-                    grid_matrix[r][c][z] = cell_data
-                for d in range(self.grid_size['zz'].z_down + 1):
-                    z = d * -1
-                    grid_matrix[r][c][z] = dict()
-                    grid_matrix[r][c][z] = cell_data
-        return grid_matrix
+        self.grid_data.from_records(
+            p_grid_nm, DB.execute_select_all('SELECT_ALL_GRID_CELL'))
 
 
 # =============================================================
@@ -859,6 +1116,8 @@ class Backup(object):
 
     class Constraints(object):
         PK: list = ["bkup_nm", "bkup_dttm"]
+        INDEX: dict = {"ix_backup_dttm": ["bkup_dttm DESC",
+                                          "bkup_nm ASC"]}
         ORDER: list = ["bkup_dttm DESC", "bkup_nm ASC"]
 
 
@@ -922,6 +1181,8 @@ class ExternalUniv(object):
     class Constraints(object):
         PK: list = ["external_univ_nm_pk"]
         FK: dict = {"univ_nm_fk": ("UNIVERSE", "univ_nm_pk")}
+        INDEX: dict = {"ix_external_universe_univ":
+                       ["univ_nm_fk", "external_univ_nm_pk"]}
         ORDER: list = ["univ_nm_fk ASC",
                        "external_univ_nm_pk ASC"]
 
@@ -970,6 +1231,8 @@ class GalacticCluster(object):
                        "shape_axes": Struct.AxesABC,
                        "shape_rot":  Struct.PitchYawRollAngle,
                        "timing_pulsar_loc_gly": Struct.CoordXYZ}
+        INDEX: dict = {"ix_galactic_cluster_univ":
+                       ["univ_nm_fk", "galactic_cluster_nm_pk"]}
         ORDER: list = ["univ_nm_fk ASC",
                        "galactic_cluster_nm_pk ASC"]
 
@@ -1032,6 +1295,8 @@ class Galaxy(object):
                        "star_field_dim_from_center_ly": Struct.CoordXYZ,
                        "star_field_dim_axes": Struct.AxesABC,
                        "star_field_dim_rot": Struct.PitchYawRollAngle}
+        INDEX: dict = {"ix_galaxy_cluster":
+                       ["galactic_cluster_nm_fk", "galaxy_nm_pk"]}
         ORDER: list = ["galactic_cluster_nm_fk ASC",
                        "galaxy_nm_pk ASC"]
 
@@ -1197,6 +1462,14 @@ class StarSystem(object):
                        "center_from_galaxy_center_pc": Struct.CoordXYZ,
                        "system_dim_axes": Struct.AxesABC,
                        "system_dim_rot": Struct.PitchYawRollAngle}
+        INDEX: dict = {"ix_star_system_galaxy":
+                       ["galaxy_nm_fk", "star_system_nm_pk"],
+                       "ix_star_system_binary":
+                       ["binary_star_system_nm_fk"],
+                       "ix_star_system_pulsar":
+                       ["nearest_pulsar_nm_fk"],
+                       "ix_star_system_black_hole":
+                       ["nearest_black_hole_nm_fk"]}
         ORDER: list = ["galaxy_nm_fk ASC",
                        "star_system_nm_pk ASC"]
 
@@ -1263,6 +1536,8 @@ class World(object):
                      'molten', 'other'],
                     "rotation_direction": ['prograde', 'retrograde'],
                     "orbit_direction": ['prograde', 'retrograde']}
+        INDEX: dict = {"ix_world_star_system":
+                       ["star_system_nm_fk", "world_nm_pk"]}
         ORDER: list = ["star_system_nm_fk ASC",
                        "world_nm_pk ASC"]
 
@@ -1305,6 +1580,7 @@ class Moon(object):
                     "orbit_direction":
                     ['prograde', 'retrograde']}
         GROUP: dict = {"center_from_world_center_km": Struct.CoordXYZ}
+        INDEX: dict = {"ix_moon_world": ["world_nm_fk", "moon_nm_pk"]}
         ORDER: list = ["world_nm_fk ASC", "moon_nm_pk ASC"]
 
 
@@ -1363,9 +1639,45 @@ class Map(object):
         GROUP: dict = {"geo_map_loc": Struct.GameGeoLocation,
                        "three_d_map_loc":
                        Struct.Game3DLocation}
+        INDEX: dict = {"ix_map_container":
+                       ["container_map_nm_fk", "map_nm_pk"]}
         ORDER: list = ["map_nm_pk ASC"]
 
 
+class MapClosure(object):
+    """
+    Ancestor/descendant pairs for the MAP containment hierarchy
+    (MAP.container_map_nm_fk), so a whole chain of containing or
+    contained maps is found with one indexed lookup.
+    - Every map has a row for itself at depth 0, and one row for
+      each map that contains it, directly (depth 1) or not.
+    - Not edited directly. Kept current by triggers on MAP;
+      see DataBase.set_map_closure().
+    """
+    _tablename: str = "MAP_CLOSURE"
+    ancestor_map_nm: str = ''
+    descendant_map_nm: str = ''
+    depth: int = 0
+
+    def to_dict(self) -> dict:
+        """Convert object to dict.
+        """
+        all_vars = OrderedDict(vars(MapClosure))
+        public_vars = OrderedDict({k: v for k, v in all_vars.items()
+                                  if not k.startswith('_') and
+                                  k not in ('Constraints', 'to_dict')})
+        return {all_vars['_tablename']: public_vars}
+
+    class Constraints(object):
+        PK: list = ["ancestor_map_nm", "descendant_map_nm"]
+        INDEX: dict = {"ix_map_closure_ancestor":
+                       ["ancestor_map_nm", "depth", "descendant_map_nm"],
+                       "ix_map_closure_descendant":
+                       ["descendant_map_nm", "depth", "ancestor_map_nm"]}
+        ORDER: list = ["ancestor_map_nm ASC", "depth ASC",
+                       "descendant_map_nm ASC"]
+
+
 class MapXMap(object):
     """
     Associative keys --
@@ -1392,6 +1704,7 @@ class MapXMap(object):
         FK: dict = {"map_nm_1_fk": ("MAP", "map_nm_pk"),
                     "map_nm_2_fk": ("MAP", "map_nm_pk")}
         CK: dict = {"touch_type": ['borders', 'overlaps']}
+        INDEX: dict = {"ix_map_x_map_2": ["map_nm_2_fk", "map_nm_1_fk"]}
         ORDER: list = ["map_nm_1_fk ASC", "map_nm_2_fk ASC"]
 
 
@@ -1432,6 +1745,44 @@ class Grid(object):
         ORDER: list = ["grid_nm_pk ASC"]
 
 
+class GridCell(object):
+    """
+    Foreign key --
+    - GRID (1) contains --> GRID_CELLs (n)
+
+    Persisted contents of one cell of a grid, at one z-layer.
+    Colors are stored as RGBA hex strings. Only cells that have
+    been set are stored. See GameGridCells for in-memory use.
+    """
+    _tablename: str = "GRID_CELL"
+    grid_nm_fk: str = ''
+    cell_r: int = 0
+    cell_c: int = 0
+    cell_z: int = 0
+    is_filled: bool = False
+    fill_rgba: str = '000000ff'
+    line_rgba: str = '000000ff'
+    cell_text: str = ''
+    state_json: str = '{}'
+
+    def to_dict(self) -> dict:
+        """Convert object to dict.
+        """
+        all_vars = OrderedDict(vars(GridCell))
+        public_vars = OrderedDict({k: v for k, v in all_vars.items()
+                                  if not k.startswith('_') and
+                                  k not in ('Constraints', 'to_dict')})
+        return {all_vars['_tablename']: public_vars}
+
+    class Constraints(object):
+        PK: list = ["grid_nm_fk", "cell_r", "cell_c", "cell_z"]
+        FK: dict = {"grid_nm_fk": ("GRID", "grid_nm_pk")}
+        INDEX: dict = {"ix_grid_cell_layer":
+                       ["grid_nm_fk", "cell_z", "cell_r", "cell_c"]}
+        ORDER: list = ["grid_nm_fk ASC", "cell_z ASC",
+                       "cell_r ASC", "cell_c ASC"]
+
+
 class GridXMap(object):
     """
     Associative keys --
@@ -1455,6 +1806,7 @@ class GridXMap(object):
         PK: list = ["grid_nm_fk", "map_nm_fk"]
         FK: dict = {"grid_nm_fk": ("GRID", "grid_nm_pk"),
                     "map_nm_fk": ("MAP", "map_nm_pk")}
+        INDEX: dict = {"ix_grid_x_map_map": ["map_nm_fk", "grid_nm_fk"]}
         ORDER: list = ["grid_nm_fk ASC", "map_nm_fk ASC"]
 
 # Once the above have been tested, refactored, then add
@@ -1470,8 +1822,13 @@ class GridXMap(object):
 class InitGameDB(object):
     """Methods to:
     - Create set of SQL files to manage the game database.
-    - Boot the database by running the SQL files.
+    - Boot the database by migrating it to the data models,
+      or by running the SQL files.
     """
+    MODELS: list = [Backup,
+                    Universe, ExternalUniv, GalacticCluster, Galaxy,
+                    StarSystem, World, Moon,
+                    Map, MapClosure, MapXMap, Grid, GridCell, GridXMap]
 
     def __init__(self):
         """Initialize the InitGameDatabase object.
@@ -1481,20 +1838,30 @@ class InitGameDB(object):
     def create_sql_files(self):
         """Pass data object to create SQL files.
         """
-        for model in [Backup,
-                      Universe, ExternalUniv, GalacticCluster, Galaxy,
-                      StarSystem, World, Moon,
-                      Map, MapXMap, Grid, GridXMap]:
+        for model in self.MODELS:
             DB.generate_sql(model)
 
-    def boot_saskan_db(self):
+    def boot_saskan_db(self,
+                       p_rebuild: bool = False) -> dict:
         """
-        Backup DB if it exists.
-        Pass SQL DROP and CREATE files.
-        N.B. - This is a destructive operation.
+        Bring the DB up to date with the data models.
+        By default, only tables whose model changed are created or
+        altered, in one transaction, and existing rows are kept.
+        If p_rebuild is True:
+        - Pass SQL DROP and CREATE files.
+        - N.B. - This is a destructive operation.
         - Logged records appear in the backups, not in the
           refreshed database.
+        :args:
+        - p_rebuild (bool) drop and recreate every table
+        :returns:
+        - (dict) {table name: action} for tables that were changed
         """
+        if not p_rebuild:
+            changes = DB.migrate_db(self.MODELS)
+            DB.set_map_closure(
+                p_rebuild=bool({'MAP', 'MAP_CLOSURE'} & set(changes)))
+            return changes
         # file_path = Path(DB.DB)
         # if file_path.exists():
         #     DB.backup_db()
@@ -1503,3 +1870,5 @@ class InitGameDB(object):
             DB.execute_dml(sql.name)
         for sql in FI.scan_dir(DB.DB_PATH, 'CREATE'):
             DB.execute_dml(sql.name)
+        DB.set_map_closure(p_rebuild=True)
+        return dict()
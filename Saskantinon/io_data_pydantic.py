@@ -50,25 +50,26 @@ and keep all or most values in this module as constants.
 
 # from networkx import max_flow_min_cost
 import platform
+import time
 import pygame as pg
 
 from copy import copy
 from pprint import pprint as pp     # noqa: F401
 from pprint import pformat as pf    # noqa: F401
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from pydantic.dataclasses import dataclass
 from typing import ClassVar
 
 from io_db import DataBase
 from io_file import FileIO
+from io_lazy import LazyInit, lazy_import
 from io_shell import ShellIO
 
+np = lazy_import("numpy")
 DB = DataBase()
 FI = FileIO()
 SI = ShellIO()
 
-pg.init()                   # Initialize PyGame for use in this module
-
 pydantic_config = ConfigDict(arbitrary_types_allowed=True,
                              from_attributes=True,
                              populate_by_name=True,
@@ -690,10 +691,12 @@ class GameGrid(BaseModel):
 
 
 @dataclass(order=True, frozen=True, slots=True)
-class Display():
-    """Values related to constructing GUI's, but which do not require
-    importing and initialzing PyGame, nor reading values in from config
-    files.
+class Display(metaclass=LazyInit):
+    """Values related to constructing GUI's.
+    Typesetting values are plain constants. Values that need PyGame
+    initialized, a display opened or config files read (fonts, window,
+    grid and console) are set by lazy_init() the first time one of
+    them is used, so importing this module does not open a window.
     """
     # Typesetting
     # -------------------
@@ -704,175 +707,196 @@ class Display():
     FONT_SM_SZ = 24
     FONT_TINY_SZ = 12
     LG_FONT_SZ = 36
-    # PyGame Fonts
-    # -------------------
-    F_SANS_TINY = pg.font.SysFont(FONT_SANS, FONT_TINY_SZ)
-    F_SANS_SM = pg.font.SysFont(FONT_SANS, FONT_SM_SZ)
-    F_SANS_MED = pg.font.SysFont(FONT_SANS, FONT_MED_SZ)
-    F_SANS_LG = pg.font.SysFont(FONT_SANS, LG_FONT_SZ)
-    F_FIXED_LG = pg.font.SysFont(FONT_FXD, LG_FONT_SZ)
-    # PyGame Cursors
-    # -------------------
-    CUR_ARROW = pg.cursors.Cursor(pg.SYSTEM_CURSOR_ARROW)
-    CUR_CROSS = pg.cursors.Cursor(pg.SYSTEM_CURSOR_CROSSHAIR)
-    CUR_HAND = pg.cursors.Cursor(pg.SYSTEM_CURSOR_HAND)
-    CUR_IBEAM = pg.cursors.Cursor(pg.SYSTEM_CURSOR_IBEAM)
-    CUR_WAIT = pg.cursors.Cursor(pg.SYSTEM_CURSOR_WAIT)
-    # PyGame Keyboard
-    # -------------------
-    KY_QUIT = (pg.K_q, pg.K_ESCAPE)
-    KY_ANIM = (pg.K_F3, pg.K_F4, pg.K_F5)
-    KY_DATA = (pg.K_a, pg.K_l)
-    KY_RPT_TYPE = (pg.K_KP1, pg.K_KP2, pg.K_KP3)
-    KY_RPT_MODE = (pg.K_UP, pg.K_RIGHT, pg.K_LEFT)
-    # Saskan Game Platform
-    # -------------------
-    info = pg.Display.Info()
-    FRAME = "game_frame"  # --> c_frame.json
-    MENUS = "game_menus"  # --> c_menus.json
-    PLATFORM = (
-        FI.F[FRAME]["dsc"] +
-        #  " | " + platform.platform() +
-        #  " | " + platform.architecture()[0] +
-        f" | monitor (w, h): {info.current_w}, {info.current_h}" +
-        " | Python " + platform.python_version() +
-        " | Pygame " + pg.version.ver)
-    # Window/overall frame for Saskan Game app
-    # -------------------
-    WIN_W = round(info.current_w * 0.9)
-    WIN_H = round(info.current_h * 0.9)
-    WIN_MID = (WIN_W / 2, WIN_H / 2)
-    WIN = pg.Display.set_mode((WIN_W, WIN_H))
-    pg.Display.set_caption(FI.F[FRAME]["ttl"])
-    info = pg.Display.Info()
-    KEYMOD_NONE = 4096
-    TIMER = pg.time.Clock()
-    # Menu bar for Saskan Game app
-    # -------------------
-    MBAR_X = WIN_W * 0.01
-    MBAR_Y = WIN_H * 0.005
-    MBAR_H = WIN_H * 0.04
-    MBAR_W = (WIN_W - (MBAR_X * 2)) / len(FI.M[MENUS]["menu"])
-    MBAR_W = 240 if MBAR_W > 240 else MBAR_W
-    MBAR_MARGIN = 6
-    # Game Map (grid) window for Saskan game
-    # --------------------------------------
-    GAMEMAP_TTL = FI.W["game_windows"]["gamemap"]["ttl"]
-    GAMEMAP_X = int(round(WIN_W * 0.01))
-    GAMEMAP_Y = int(round(WIN_H * 0.06))
-    GAMEMAP_W = int(round(WIN_W * 0.8))
-    GAMEMAP_H = int(round(WIN_H * 0.9))
-    # Game Map Grid qualities for Saskan game
-    # The "grid" is drawn inside the Map window, but
-    #  it also serves to define how to draw maps;
-    #  in other words it is as much a data structure
-    #  as it is a set of drawing elements.
-    # @DEV:
-    # Consider what should be a constant, where it
-    # will be useful to use the Game data structures
-    # and where/how it will be better to use DB records.
-    # The values here are hard-coded for initial prototyping,
-    # but will be replaced by values from the DB in order to
-    # accomodate scaling of map info to different sizes and
-    # resolutions of displays.
-    # --------------------------------------
-    # Persistent values for the grid:
-    GRID_S_RECT = SR.make_rect(GAMEMAP_Y, GAMEMAP_X,
-                               GAMEMAP_W, GAMEMAP_H)
-    GRID_BOX = GRID_S_RECT["box"]
-    GRID_OFFSET_X = int(round(GAMEMAP_W * 0.01))
-    GRID_OFFSET_Y = int(round(GAMEMAP_H * 0.02))
-    # Dynamic (DB) values for the grid:
-    GRID_ROWS = 32
-    GRID_COLS = 46
-    GRID_VISIBLE = False
-    GRID_CELL_PX_W = int(round(GAMEMAP_W - GRID_OFFSET_X) / GRID_COLS)
-    GRID_CELL_PX_H = int(round(GAMEMAP_H - GRID_OFFSET_Y) / GRID_ROWS)
-    GRID_CELL_KM_W = 33
-    GRID_CELL_KM_H =\
-        int(round(GRID_CELL_KM_W * (GRID_CELL_PX_H / GRID_CELL_PX_W)))
-    G_LNS_PX_W = GRID_CELL_PX_W * GRID_COLS
-    G_LNS_PX_H = GRID_CELL_PX_H * GRID_ROWS
-    G_LNS_KM_W = GRID_CELL_KM_W * GRID_COLS
-    G_LNS_KM_H = GRID_CELL_KM_H * GRID_ROWS
-    G_LNS_X_LEFT = int(round(GRID_OFFSET_X + GRID_BOX.x))
-    G_LNS_X_RGHT = int(round(G_LNS_X_LEFT + G_LNS_PX_W))
-    G_LNS_Y_TOP = int(round(GRID_OFFSET_Y + GRID_BOX.y))
-    G_LNS_Y_BOT = int(round(G_LNS_Y_TOP + G_LNS_PX_H))
-    G_LNS_HZ = list()     # (x1, y1), (x2, y2)
-    G_LNS_VT = list()     # (x1, y1), (x2, y2)
-    # x,y each horiz or vert line segment
-    for hz in range(GRID_ROWS + 1):
-        y = G_LNS_Y_TOP + (hz * GRID_CELL_PX_H)
-        G_LNS_HZ.append([(G_LNS_X_LEFT, y), (G_LNS_X_RGHT, y)])
-    for vt in range(GRID_COLS + 1):
-        x = G_LNS_X_LEFT + (vt * GRID_CELL_PX_W)
-        G_LNS_VT.append([(x, G_LNS_Y_TOP), (x, G_LNS_Y_BOT)])
-    # G_CELL = grid data-cell matrix, a record for each grid-cell
-    # The static data for each grid-cell consists of:
-    # - KEY: unique string in "0n_0n" format
-    # - DATA:
-    #   - SaskanRect object for grid-cell
-    #   - PyGame Rect object for grid-cell
-    # Then will be overloaded as needed based on MAPs, DB recs, etc.
-    # --------------------------------------------------------------
-    GRID = GameGrid()
-    GRID.RowsCols = DataRec.ColRowIx(r=GRID_ROWS, c=GRID_COLS)
-    for c in range(0, GRID_COLS):
-        for r in range(0, GRID_ROWS):
-            ky = f"{str(c).zfill(2)}_{str(r).zfill(2)}"
-            x = G_LNS_VT[c][0][0]  # x of vert line
-            y = G_LNS_HZ[r][0][1]  # y of horz line
-            GRID.cells[ky] = GameCell(
-                    rc=DataRec.ColRowIx(r=r, c=c),
-                    wh=DataRec.WidthHeight(
-                        w=GRID_CELL_PX_W, h=GRID_CELL_PX_H),
-                    rect=GameRect(
-                        height_width=DataRec.WidthHeight(
-                            w=GRID_CELL_PX_W, h=GRID_CELL_PX_H),
-                        coord_rect=GameCoord(
-                            top_left=DataRec.CoordXY(x=x, y=y),
-                            top_right=DataRec.CoordXY(
-                                x=x + GRID_CELL_PX_W, y=y),
-                            bottom_left=DataRec.CoordXY(
-                                x=x, y=y + GRID_CELL_PX_H),
-                            bottom_right=DataRec.CoordXY(
-                                x=x + GRID_CELL_PX_W,
-                                y=y + GRID_CELL_PX_H)),
-                        center=DataRec.CoordXY(
-                            x=x + (GRID_CELL_PX_W / 2),
-                            y=y + (GRID_CELL_PX_H / 2)),
-                        fill=False,
-                        fill_color=SaskanConstants.Colors.CP_GREEN,
-                        line_color=SaskanConstants.Colors.CP_BLACK,
-                        box=pg.Rect(x, y, GRID_CELL_PX_W, GRID_CELL_PX_H)
+
+    def __getattr__(self,
+                    p_attr: str):
+        """Forward instance lookups to the class, so that
+        Display().WIN also triggers lazy_init()."""
+        return getattr(type(self), p_attr)
+
+    @classmethod
+    def lazy_init(cls):
+        """Initialize PyGame, open the window, then set fonts, cursors,
+        keys, menu bar, grid and console values. Called once by LazyInit.
+        """
+        pg.init()
+        # PyGame Fonts
+        # -------------------
+        cls.F_SANS_TINY = pg.font.SysFont(cls.FONT_SANS, cls.FONT_TINY_SZ)
+        cls.F_SANS_SM = pg.font.SysFont(cls.FONT_SANS, cls.FONT_SM_SZ)
+        cls.F_SANS_MED = pg.font.SysFont(cls.FONT_SANS, cls.FONT_MED_SZ)
+        cls.F_SANS_LG = pg.font.SysFont(cls.FONT_SANS, cls.LG_FONT_SZ)
+        cls.F_FIXED_LG = pg.font.SysFont(cls.FONT_FXD, cls.LG_FONT_SZ)
+        # PyGame Cursors
+        # -------------------
+        cls.CUR_ARROW = pg.cursors.Cursor(pg.SYSTEM_CURSOR_ARROW)
+        cls.CUR_CROSS = pg.cursors.Cursor(pg.SYSTEM_CURSOR_CROSSHAIR)
+        cls.CUR_HAND = pg.cursors.Cursor(pg.SYSTEM_CURSOR_HAND)
+        cls.CUR_IBEAM = pg.cursors.Cursor(pg.SYSTEM_CURSOR_IBEAM)
+        cls.CUR_WAIT = pg.cursors.Cursor(pg.SYSTEM_CURSOR_WAIT)
+        # PyGame Keyboard
+        # -------------------
+        cls.KY_QUIT = (pg.K_q, pg.K_ESCAPE)
+        cls.KY_ANIM = (pg.K_F3, pg.K_F4, pg.K_F5)
+        cls.KY_DATA = (pg.K_a, pg.K_l)
+        cls.KY_RPT_TYPE = (pg.K_KP1, pg.K_KP2, pg.K_KP3)
+        cls.KY_RPT_MODE = (pg.K_UP, pg.K_RIGHT, pg.K_LEFT)
+        # Saskan Game Platform
+        # -------------------
+        info = pg.display.Info()
+        cls.FRAME = "game_frame"  # --> c_frame.json
+        cls.MENUS = "game_menus"  # --> c_menus.json
+        cls.PLATFORM = (
+            FI.F[cls.FRAME]["dsc"] +
+            #  " | " + platform.platform() +
+            #  " | " + platform.architecture()[0] +
+            f" | monitor (w, h): {info.current_w}, {info.current_h}" +
+            " | Python " + platform.python_version() +
+            " | Pygame " + pg.version.ver)
+        # Window/overall frame for Saskan Game app
+        # -------------------
+        cls.WIN_W = round(info.current_w * 0.9)
+        cls.WIN_H = round(info.current_h * 0.9)
+        cls.WIN_MID = (cls.WIN_W / 2, cls.WIN_H / 2)
+        cls.WIN = pg.display.set_mode((cls.WIN_W, cls.WIN_H))
+        pg.display.set_caption(FI.F[cls.FRAME]["ttl"])
+        info = pg.display.Info()
+        cls.KEYMOD_NONE = 4096
+        cls.TIMER = pg.time.Clock()
+        # Menu bar for Saskan Game app
+        # -------------------
+        cls.MBAR_X = cls.WIN_W * 0.01
+        cls.MBAR_Y = cls.WIN_H * 0.005
+        cls.MBAR_H = cls.WIN_H * 0.04
+        cls.MBAR_W =\
+            (cls.WIN_W - (cls.MBAR_X * 2)) / len(FI.M[cls.MENUS]["menu"])
+        cls.MBAR_W = 240 if cls.MBAR_W > 240 else cls.MBAR_W
+        cls.MBAR_MARGIN = 6
+        # Game Map (grid) window for Saskan game
+        # --------------------------------------
+        cls.GAMEMAP_TTL = FI.W["game_windows"]["gamemap"]["ttl"]
+        cls.GAMEMAP_X = int(round(cls.WIN_W * 0.01))
+        cls.GAMEMAP_Y = int(round(cls.WIN_H * 0.06))
+        cls.GAMEMAP_W = int(round(cls.WIN_W * 0.8))
+        cls.GAMEMAP_H = int(round(cls.WIN_H * 0.9))
+        # Game Map Grid qualities for Saskan game
+        # The "grid" is drawn inside the Map window, but
+        #  it also serves to define how to draw maps;
+        #  in other words it is as much a data structure
+        #  as it is a set of drawing elements.
+        # @DEV:
+        # Consider what should be a constant, where it
+        # will be useful to use the Game data structures
+        # and where/how it will be better to use DB records.
+        # The values here are hard-coded for initial prototyping,
+        # but will be replaced by values from the DB in order to
+        # accomodate scaling of map info to different sizes and
+        # resolutions of displays.
+        # --------------------------------------
+        # Persistent values for the grid:
+        cls.GRID_S_RECT = SR.make_rect(cls.GAMEMAP_Y, cls.GAMEMAP_X,
+                                       cls.GAMEMAP_W, cls.GAMEMAP_H)
+        cls.GRID_BOX = cls.GRID_S_RECT["box"]
+        cls.GRID_OFFSET_X = int(round(cls.GAMEMAP_W * 0.01))
+        cls.GRID_OFFSET_Y = int(round(cls.GAMEMAP_H * 0.02))
+        # Dynamic (DB) values for the grid:
+        cls.GRID_ROWS = 32
+        cls.GRID_COLS = 46
+        cls.GRID_VISIBLE = False
+        cls.GRID_CELL_PX_W =\
+            int(round(cls.GAMEMAP_W - cls.GRID_OFFSET_X) / cls.GRID_COLS)
+        cls.GRID_CELL_PX_H =\
+            int(round(cls.GAMEMAP_H - cls.GRID_OFFSET_Y) / cls.GRID_ROWS)
+        cls.GRID_CELL_KM_W = 33
+        cls.GRID_CELL_KM_H =\
+            int(round(cls.GRID_CELL_KM_W *
+                      (cls.GRID_CELL_PX_H / cls.GRID_CELL_PX_W)))
+        cls.G_LNS_PX_W = cls.GRID_CELL_PX_W * cls.GRID_COLS
+        cls.G_LNS_PX_H = cls.GRID_CELL_PX_H * cls.GRID_ROWS
+        cls.G_LNS_KM_W = cls.GRID_CELL_KM_W * cls.GRID_COLS
+        cls.G_LNS_KM_H = cls.GRID_CELL_KM_H * cls.GRID_ROWS
+        cls.G_LNS_X_LEFT = int(round(cls.GRID_OFFSET_X + cls.GRID_BOX.x))
+        cls.G_LNS_X_RGHT = int(round(cls.G_LNS_X_LEFT + cls.G_LNS_PX_W))
+        cls.G_LNS_Y_TOP = int(round(cls.GRID_OFFSET_Y + cls.GRID_BOX.y))
+        cls.G_LNS_Y_BOT = int(round(cls.G_LNS_Y_TOP + cls.G_LNS_PX_H))
+        cls.G_LNS_HZ = list()     # (x1, y1), (x2, y2)
+        cls.G_LNS_VT = list()     # (x1, y1), (x2, y2)
+        # x,y each horiz or vert line segment
+        for hz in range(cls.GRID_ROWS + 1):
+            y = cls.G_LNS_Y_TOP + (hz * cls.GRID_CELL_PX_H)
+            cls.G_LNS_HZ.append([(cls.G_LNS_X_LEFT, y),
+                                 (cls.G_LNS_X_RGHT, y)])
+        for vt in range(cls.GRID_COLS + 1):
+            x = cls.G_LNS_X_LEFT + (vt * cls.GRID_CELL_PX_W)
+            cls.G_LNS_VT.append([(x, cls.G_LNS_Y_TOP),
+                                 (x, cls.G_LNS_Y_BOT)])
+        # G_CELL = grid data-cell matrix, a record for each grid-cell
+        # The static data for each grid-cell consists of:
+        # - KEY: unique string in "0n_0n" format
+        # - DATA:
+        #   - SaskanRect object for grid-cell
+        #   - PyGame Rect object for grid-cell
+        # Then will be overloaded as needed based on MAPs, DB recs, etc.
+        # --------------------------------------------------------------
+        cls.GRID = GameGrid()
+        cls.GRID.RowsCols = DataRec.ColRowIx(r=cls.GRID_ROWS,
+                                             c=cls.GRID_COLS)
+        for c in range(0, cls.GRID_COLS):
+            for r in range(0, cls.GRID_ROWS):
+                ky = f"{str(c).zfill(2)}_{str(r).zfill(2)}"
+                x = cls.G_LNS_VT[c][0][0]  # x of vert line
+                y = cls.G_LNS_HZ[r][0][1]  # y of horz line
+                cls.GRID.cells[ky] = GameCell(
+                        rc=DataRec.ColRowIx(r=r, c=c),
+                        wh=DataRec.WidthHeight(
+                            w=cls.GRID_CELL_PX_W, h=cls.GRID_CELL_PX_H),
+                        rect=GameRect(
+                            height_width=DataRec.WidthHeight(
+                                w=cls.GRID_CELL_PX_W, h=cls.GRID_CELL_PX_H),
+                            coord_rect=GameCoord(
+                                top_left=DataRec.CoordXY(x=x, y=y),
+                                top_right=DataRec.CoordXY(
+                                    x=x + cls.GRID_CELL_PX_W, y=y),
+                                bottom_left=DataRec.CoordXY(
+                                    x=x, y=y + cls.GRID_CELL_PX_H),
+                                bottom_right=DataRec.CoordXY(
+                                    x=x + cls.GRID_CELL_PX_W,
+                                    y=y + cls.GRID_CELL_PX_H)),
+                            center=DataRec.CoordXY(
+                                x=x + (cls.GRID_CELL_PX_W / 2),
+                                y=y + (cls.GRID_CELL_PX_H / 2)),
+                            fill=False,
+                            fill_color=SaskanConstants.Colors.CP_GREEN,
+                            line_color=SaskanConstants.Colors.CP_BLACK,
+                            box=pg.Rect(x, y, cls.GRID_CELL_PX_W,
+                                        cls.GRID_CELL_PX_H)
+                        )
                     )
-                )
-
-    # Console window for Saskan app
-    # -------------------------------
-    CONSOLE = FI.W["game_windows"]["console"]
-    CONSOLE_X = int(round(GAMEMAP_X + GAMEMAP_W + 20))
-    CONSOLE_Y = GAMEMAP_Y
-    CONSOLE_W = int(round(WIN_W * 0.15))
-    CONSOLE_H = GAMEMAP_H
-    CONSOLE_BOX = pg.Rect(CONSOLE_X, CONSOLE_Y,
-                          CONSOLE_W, CONSOLE_H)
-
-    # For now, the header/title on CONSOLE is static
-    CONSOLE_TTL_TXT = FI.W["game_windows"]["console"]["ttl"]
-    CONSOLE_TTL_IMG =\
-        F_SANS_MED.render(CONSOLE_TTL_TXT, True,
-                          SaskanConstants.Colors.CP_BLUEPOWDER,
-                          SaskanConstants.Colors.CP_BLACK)
-    CONSOLE_TTL_BOX = CONSOLE_TTL_IMG.get_rect()
-    CONSOLE_TTL_BOX.topleft = (CONSOLE_X + 5, CONSOLE_Y + 5)
-    # Inf Bar for Saskan app
-    # -------------------------------
-    IBAR_LOC = (GAMEMAP_X, int(round(WIN_H * 0.97)))
-    # Help Pages -- external web pages, displayed in a browser
-    # ----
-    WHTM = FI.U["uri"]["help"]  # links to web pages / help pages
+
+        # Console window for Saskan app
+        # -------------------------------
+        cls.CONSOLE = FI.W["game_windows"]["console"]
+        cls.CONSOLE_X = int(round(cls.GAMEMAP_X + cls.GAMEMAP_W + 20))
+        cls.CONSOLE_Y = cls.GAMEMAP_Y
+        cls.CONSOLE_W = int(round(cls.WIN_W * 0.15))
+        cls.CONSOLE_H = cls.GAMEMAP_H
+        cls.CONSOLE_BOX = pg.Rect(cls.CONSOLE_X, cls.CONSOLE_Y,
+                                  cls.CONSOLE_W, cls.CONSOLE_H)
+
+        # For now, the header/title on CONSOLE is static
+        cls.CONSOLE_TTL_TXT = FI.W["game_windows"]["console"]["ttl"]
+        cls.CONSOLE_TTL_IMG =\
+            cls.F_SANS_MED.render(cls.CONSOLE_TTL_TXT, True,
+                                  SaskanConstants.Colors.CP_BLUEPOWDER,
+                                  SaskanConstants.Colors.CP_BLACK)
+        cls.CONSOLE_TTL_BOX = cls.CONSOLE_TTL_IMG.get_rect()
+        cls.CONSOLE_TTL_BOX.topleft = (cls.CONSOLE_X + 5, cls.CONSOLE_Y + 5)
+        # Inf Bar for Saskan app
+        # -------------------------------
+        cls.IBAR_LOC = (cls.GAMEMAP_X, int(round(cls.WIN_H * 0.97)))
+        # Help Pages -- external web pages, displayed in a browser
+        # ----
+        cls.WHTM = FI.U["uri"]["help"]  # links to web pages / help pages
 
 
 # =============================================================
@@ -920,6 +944,11 @@ class Universe(BaseModel):
     def constraints(cls):
         return {
             "PK": ["univ_nm_pk"],
+            "RANGE": {"radius_gly": (0.0, None),
+                      "volume_gly3": (0.0, None),
+                      "volume_pc3": (0.0, None),
+                      "elapsed_time_gyr": (0.0, None),
+                      "mass_kg": (0.0, None)},
             "ORDER": ["univ_nm_ix ASC"]
         }
 
@@ -1172,6 +1201,13 @@ class StarSystem(BaseModel):
                    "intensity_of_flares":
                    ['low', 'medium', 'high'],
                    "frequency_of_comets": ['rare', 'occasional', 'frequent']},
+            "RANGE": {"volume_pc3": (0.0, None),
+                      "mass_kg": (0.0, None),
+                      "aprox_age_gyr": (0.0, None),
+                      "unbound_planets_cnt": (0, None),
+                      "orbiting_planets_cnt": (0, None),
+                      "inner_habitable_boundary_au": (0.0, None),
+                      "outer_habitable_boundary_au": (0.0, None)},
             "GROUP": {"center_from_galaxy_center_pc":
                       DataRec.CoordXYZ,
                       "bulge_dim_from_center_ly":
@@ -1246,6 +1282,12 @@ class World(BaseModel):
                     'molten', 'other'],
                    "rotation_direction": ['prograde', 'retrograde'],
                    "orbit_direction": ['prograde', 'retrograde']},
+            "RANGE": {"obliquity_dg": (0.0, 180.0),
+                      "distance_from_star_au": (0.0, None),
+                      "distance_from_star_km": (0.0, None),
+                      "radius_km": (0.0, None),
+                      "mass_kg": (0.0, None),
+                      "moons_cnt": (0, None)},
             "ORDER": ["star_system_nm_fk ASC",
                       "world_nm_pk ASC"]
         }
@@ -1283,6 +1325,9 @@ class Moon(BaseModel):
                    ['prograde', 'retrograde'],
                    "orbit_direction":
                    ['prograde', 'retrograde']},
+            "RANGE": {"mass_kg": (0.0, None),
+                      "radius_km": (0.0, None),
+                      "obliquity_dg": (0.0, 180.0)},
             "GROUP": {"center_from_world_center_km":
                       DataRec.CoordXYZ},
             "ORDER": ["world_nm_fk ASC",
@@ -2128,6 +2173,160 @@ Next:
 """
 
 
+class BulkRecords(object):
+    """Build many table-model records at once.
+    Creating models one at a time validates every field of every
+    record. For bulk loads, validate_columns() checks each column as
+    a whole instead: one pydantic validation of the list of values,
+    then numpy checks of the CK (allowed values) and RANGE (min, max)
+    constraints over the whole column. Records are then made the way
+    model_construct() does, without validation. Rows read back from
+    SASKAN.db were checked when written, so are only constructed.
+    """
+    _ADAPTERS: dict = dict()    # {(model, field name): TypeAdapter}
+
+    @classmethod
+    def get_adapter(cls,
+                    p_model: BaseModel,
+                    p_field_nm: str) -> TypeAdapter:
+        """Get a validator for a list of values of one model field.
+        :args:
+        - p_model (BaseModel): table model class
+        - p_field_nm (str): field name
+        :returns:
+        - (TypeAdapter) validates list[field type], built once
+        """
+        key = (p_model, p_field_nm)
+        if key not in cls._ADAPTERS:
+            annotation = p_model.model_fields[p_field_nm].annotation
+            cls._ADAPTERS[key] =\
+                TypeAdapter(list[annotation], config=pydantic_config)
+        return cls._ADAPTERS[key]
+
+    @classmethod
+    def validate_columns(cls,
+                         p_model: BaseModel,
+                         p_cols: dict) -> dict:
+        """Validate column arrays for a table model.
+        :args:
+        - p_model (BaseModel): table model class
+        - p_cols (dict): {field name: list of values}, one entry per
+            record. Fields left out take their defaults.
+        :returns:
+        - (dict) {field name: list of validated values}
+        :raises:
+        - ValueError if columns are unknown, missing, of unequal
+          length, or break a CK or RANGE constraint
+        - pydantic ValidationError if a value has the wrong type
+        """
+        fields = p_model.model_fields
+        unknown = [nm for nm in p_cols if nm not in fields]
+        missing = [nm for nm, fld in fields.items()
+                   if fld.is_required() and nm not in p_cols]
+        row_cnts = {len(vals) for vals in p_cols.values()}
+        if unknown or missing or len(row_cnts) > 1:
+            raise ValueError(
+                f"{p_model.__name__} columns: unknown {unknown}, " +
+                f"missing {missing}, row counts {sorted(row_cnts)}")
+        cols = {nm: cls.get_adapter(p_model, nm).validate_python(list(vals))
+                for nm, vals in p_cols.items()}
+        constraints = p_model.constraints()
+        errors = list()
+        for nm, allowed in constraints.get("CK", {}).items():
+            if nm in cols:
+                bad = np.flatnonzero(
+                    ~np.isin(np.asarray(cols[nm], dtype=str), allowed))
+                if bad.size:
+                    errors.append(f"{nm} not in {allowed} " +
+                                  f"at rows {bad[:5].tolist()}")
+        for nm, (v_min, v_max) in constraints.get("RANGE", {}).items():
+            if nm in cols:
+                vals = np.asarray(cols[nm], dtype=float)
+                is_bad = np.zeros(vals.shape, dtype=bool)
+                if v_min is not None:
+                    is_bad |= vals < v_min
+                if v_max is not None:
+                    is_bad |= vals > v_max
+                bad = np.flatnonzero(is_bad)
+                if bad.size:
+                    errors.append(f"{nm} not in ({v_min}, {v_max}) " +
+                                  f"at rows {bad[:5].tolist()}")
+        if errors:
+            raise ValueError(f"{p_model.__name__}: " + "; ".join(errors))
+        return cols
+
+    @classmethod
+    def construct_records(cls,
+                          p_model: BaseModel,
+                          p_cols: dict,
+                          p_validate: bool = True) -> list:
+        """Build table-model records from column arrays.
+        :args:
+        - p_model (BaseModel): table model class
+        - p_cols (dict): {field name: list of values}
+        - p_validate (bool): if False, trust the values as they are
+        :returns:
+        - (list) of p_model records
+        """
+        cols = cls.validate_columns(p_model, p_cols) if p_validate\
+            else p_cols
+        col_nms = list(cols.keys())
+        if p_model.__private_attributes__:
+            return [p_model.model_construct(**dict(zip(col_nms, row)))
+                    for row in zip(*cols.values())]
+        # Same result as model_construct(), but defaults are looked
+        # up once per call rather than once per record.
+        defaults = {nm: fld.get_default(call_default_factory=True)
+                    for nm, fld in p_model.model_fields.items()
+                    if nm not in cols and not fld.is_required()}
+        mutables = [nm for nm, val in defaults.items()
+                    if getattr(val, '__hash__', None) is None]
+        template = {nm: defaults.get(nm) for nm in p_model.model_fields
+                    if nm in defaults or nm in cols}   # keeps field order
+        new_rec, set_attr = p_model.__new__, object.__setattr__
+        records = list()
+        for row in zip(*cols.values()):
+            values = dict(template)
+            values.update(zip(col_nms, row))
+            for nm in mutables:
+                values[nm] = copy(values[nm])
+            rec = new_rec(p_model)
+            set_attr(rec, '__dict__', values)
+            set_attr(rec, '__pydantic_fields_set__', set(col_nms))
+            set_attr(rec, '__pydantic_extra__', None)
+            set_attr(rec, '__pydantic_private__', None)
+            records.append(rec)
+        return records
+
+    @classmethod
+    def from_db_result(cls,
+                       p_model: BaseModel,
+                       p_result: dict) -> list:
+        """Build records from a DataBase.execute_select_* result.
+        Columns split out of a GROUP field, e.g. shape_pc_x, are put
+        back together into the GROUP model. No validation is done.
+        :args:
+        - p_model (BaseModel): table model class
+        - p_result (dict): {column name: list of values}
+        :returns:
+        - (list) of p_model records, empty if no rows
+        """
+        if not p_result or any(v is None for v in p_result.values()):
+            return list()
+        cols = {nm: vals for nm, vals in p_result.items()
+                if nm in p_model.model_fields}
+        for grp_nm, grp_model in\
+                p_model.constraints().get("GROUP", {}).items():
+            sub_nms = [nm for nm in grp_model.model_fields
+                       if f"{grp_nm}_{nm}" in p_result]
+            if sub_nms:
+                cols[grp_nm] = cls.construct_records(
+                    grp_model,
+                    {nm: p_result[f"{grp_nm}_{nm}"] for nm in sub_nms},
+                    p_validate=False)
+        return cls.construct_records(p_model, cols, p_validate=False)
+
+
 class InitGameDatabase(object):
     """Methods to:
     - Create set of SQL files to manage the game database.
@@ -2546,3 +2745,34 @@ class GetGameData(object):
             data = FI.G[self.DATASRC["catg"]][self.DATASRC["item"]]
             if "map" in data.keys():
                 self.set_gamemap_dims(data["map"])
+
+
+def benchmark_bulk(p_rows: int = 20000):
+    """Compare records/sec for building Moon records one at a
+    time, from validated columns, and from trusted columns.
+    :args:
+    - p_rows (int): number of records to build
+    """
+    cols = {"moon_nm_pk": [f"moon_{i}" for i in range(p_rows)],
+            "world_nm_fk": ["Gavor"] * p_rows,
+            "center_from_world_center_km":
+            [{"x": float(i), "y": 0.0, "z": 0.0} for i in range(p_rows)],
+            "mass_kg": [7.3e22 + i for i in range(p_rows)],
+            "obliquity_dg": [float(i % 180) for i in range(p_rows)],
+            "rotation_direction": ["prograde", "retrograde"] * (p_rows // 2)
+            + ["prograde"] * (p_rows % 2)}
+    rows = [dict(zip(cols.keys(), vals)) for vals in zip(*cols.values())]
+    result = dict()
+    for nm, build in (
+            ("per_record", lambda: [Moon(**row) for row in rows]),
+            ("validated", lambda: BulkRecords.construct_records(Moon, cols)),
+            ("trusted", lambda: BulkRecords.construct_records(
+                Moon, cols, p_validate=False))):
+        t0 = time.perf_counter()
+        build()
+        result[nm] = round(p_rows / (time.perf_counter() - t0))
+    pp({"records_per_sec": result})
+
+
+if __name__ == '__main__':
+    benchmark_bulk()
@@ -9,26 +9,102 @@
 
 Manage data for saskan_data app using sqlite3.
 """
-import pendulum
+import hashlib
+# trunk-ignore(bandit/B403)
+import pickle
+import re
 import shutil
 import sqlite3 as sq3
+import threading
+import time
+import zlib
 
 from collections import OrderedDict
 from copy import copy
 from pathlib import Path
-from os import path
+from os import makedirs, path, remove
 from pprint import pprint as pp    # noqa: F401
 
 from io_file import FileIO
+from io_lazy import lazy_import
 from io_shell import ShellIO
 
+pendulum = lazy_import("pendulum")
 FI = FileIO()
 SI = ShellIO()
 
 
 class DataBase(object):
     """Support Sqlite3 database setup, usage, maintenance.
+
+    Table layouts come from the data model classes. SCHEMA_VERSION
+    keeps a hash of each table's generated CREATE SQL, so that
+    migrate_db() only inspects and alters tables whose model changed.
+
+    SELECT results are cached per process, shared by all DataBase
+    objects, keyed by (DB file, SQL name, key values). Writes through
+    execute_insert/update/delete drop cached results for the table
+    written and for tables that cascade from it. Entries also expire
+    after CACHE_TTL seconds, and the least recently used are evicted
+    past CACHE_SIZE entries.
     """
+    CACHE_TTL: float = 300.0
+    CACHE_SIZE: int = 256
+    _CACHE: OrderedDict = OrderedDict()   # {key: (expires, table, result)}
+    _CACHE_STATS: dict = {"hits": 0, "misses": 0,
+                          "evictions": 0, "invalidations": 0}
+    _CACHE_LOCK = threading.Lock()
+    _FK_CHILDREN: dict = dict()    # {DB file: {table: {child tables}}}
+    MAP_DEPTH_MAX: int = 64     # stops runaway recursion on a cycle
+    MAP_CLOSURE_TRIGGERS: str = """
+CREATE TRIGGER IF NOT EXISTS MAP_CLOSURE_INSERT AFTER INSERT ON MAP
+BEGIN
+    INSERT OR IGNORE INTO MAP_CLOSURE
+        (ancestor_map_nm, descendant_map_nm, depth)
+    SELECT NEW.map_nm_pk, NEW.map_nm_pk, 0
+    UNION ALL
+    SELECT ancestor_map_nm, NEW.map_nm_pk, depth + 1 FROM MAP_CLOSURE
+    WHERE descendant_map_nm = NEW.container_map_nm_fk;
+END;
+CREATE TRIGGER IF NOT EXISTS MAP_CLOSURE_UPDATE
+AFTER UPDATE OF map_nm_pk, container_map_nm_fk ON MAP
+WHEN OLD.map_nm_pk IS NOT NEW.map_nm_pk
+    OR OLD.container_map_nm_fk IS NOT NEW.container_map_nm_fk
+BEGIN
+    UPDATE MAP_CLOSURE SET ancestor_map_nm = NEW.map_nm_pk
+    WHERE ancestor_map_nm = OLD.map_nm_pk;
+    UPDATE MAP_CLOSURE SET descendant_map_nm = NEW.map_nm_pk
+    WHERE descendant_map_nm = OLD.map_nm_pk;
+    DELETE FROM MAP_CLOSURE
+    WHERE descendant_map_nm IN (SELECT descendant_map_nm FROM MAP_CLOSURE
+                                WHERE ancestor_map_nm = NEW.map_nm_pk)
+    AND ancestor_map_nm NOT IN (SELECT descendant_map_nm FROM MAP_CLOSURE
+                                WHERE ancestor_map_nm = NEW.map_nm_pk);
+    INSERT OR IGNORE INTO MAP_CLOSURE
+        (ancestor_map_nm, descendant_map_nm, depth)
+    SELECT up.ancestor_map_nm, down.descendant_map_nm,
+           up.depth + down.depth + 1
+    FROM MAP_CLOSURE AS up, MAP_CLOSURE AS down
+    WHERE up.descendant_map_nm = NEW.container_map_nm_fk
+    AND down.ancestor_map_nm = NEW.map_nm_pk;
+END;
+CREATE TRIGGER IF NOT EXISTS MAP_CLOSURE_DELETE AFTER DELETE ON MAP
+BEGIN
+    DELETE FROM MAP_CLOSURE
+    WHERE ancestor_map_nm = OLD.map_nm_pk
+    OR descendant_map_nm = OLD.map_nm_pk;
+END;
+"""
+    ARCV_MAGIC: bytes = b"SASKAN_ARCV_1\n"
+    ARCV_EXT: str = ".parcv"   # page archives; .arcv files are plain copies
+    ARCV_DIGEST: int = 16      # bytes of BLAKE2b page hash
+    ARCV_LEVEL: int = 1        # zlib level; pages compress well anyway
+    SCHEMA_SQL: str = (
+        "CREATE TABLE IF NOT EXISTS SCHEMA_VERSION (\n" +
+        "table_nm TEXT PRIMARY KEY,\n" +
+        "schema_hash TEXT DEFAULT '',\n" +
+        "version INTEGER DEFAULT 0,\n" +
+        "applied_dttm TEXT DEFAULT '');\n")
 
     def __init__(self):
         """
@@ -57,7 +133,7 @@ class DataBase(object):
         if 'JSON' in p_constraints.get('JSON', []):
             sql = ' JSON'
         else:
-            field_type = type(p_def_value).__name__
+            field_type = type(p_def_value)
             data_types = {
                 str: ' TEXT',
                 bool: ' BOOLEAN',
@@ -191,19 +267,38 @@ class DataBase(object):
             sql += f"CHECK ({ck_col} IN ({check_values})),\n"
         return sql
 
-    def generate_create_sql(self,
-                            p_table_nm: str,
-                            p_constraints: dict,
-                            p_col_fields: dict) -> list:
+    def set_sql_indexes(self,
+                        p_table_nm: str,
+                        p_constraints: dict) -> list:
+        """
+        Generate SQL CREATE INDEX code from a data model.
+        INDEX maps an index name to a list of columns, each optionally
+        followed by ASC or DESC. An index listing the columns a query
+        filters and sorts on lets SQLITE skip the sort; if it lists
+        every column the query reads, it covers the query and the
+        table itself is not read.
+        :args:
+        - p_table_nm (str) Name of table to index
+        - p_constraints (dict) Dict of constraints for the table
+        :returns:
+        - (list) CREATE INDEX statements
+        """
+        return [f"CREATE INDEX IF NOT EXISTS {ix_nm} ON {p_table_nm} " +
+                f"({', '.join(ix_cols)});\n"
+                for ix_nm, ix_cols in p_constraints.get('INDEX', {}).items()]
+
+    def get_create_sql(self,
+                       p_table_nm: str,
+                       p_constraints: dict,
+                       p_col_fields: dict) -> tuple:
         """
         Generate SQL CREATE TABLE code from data model.
         :args:
         - p_table_name (str) Name of table to create SQL for
         - p_constraints (dict) Dict of constraints for the table
         - p_col_fields (dict) Dict of column fields, default values
-        :writes:
-        - SQL file to [APP]/sql/CREATE_[p_table_name].sql
-        :returns:
+        :returns: tuple of:
+        - (str) SQL CREATE TABLE statement
         - (list) List of column names
         """
         col_names = []
@@ -232,10 +327,74 @@ class DataBase(object):
 
         sql = f"CREATE TABLE IF NOT EXISTS {p_table_nm} " +\
               f"(\n{''.join(sqlns)});\n"
-        FI.write_file(path.join(self.DB_PATH, f"CREATE_{p_table_nm}.sql"), sql)
+        return (sql, col_names)
 
+    def generate_create_sql(self,
+                            p_table_nm: str,
+                            p_constraints: dict,
+                            p_col_fields: dict) -> list:
+        """
+        Generate SQL CREATE TABLE code from data model.
+        :args:
+        - p_table_name (str) Name of table to create SQL for
+        - p_constraints (dict) Dict of constraints for the table
+        - p_col_fields (dict) Dict of column fields, default values
+        :writes:
+        - SQL file to [APP]/sql/CREATE_[p_table_name].sql,
+          with the table's CREATE INDEX statements, if any
+        :returns:
+        - (list) List of column names
+        """
+        sql, col_names =\
+            self.get_create_sql(p_table_nm, p_constraints, p_col_fields)
+        sql += ''.join(self.set_sql_indexes(p_table_nm, p_constraints))
+        self.write_sql_file(f"CREATE_{p_table_nm}.sql", sql)
         return col_names
 
+    def get_column_defs(self,
+                        p_constraints: dict,
+                        p_col_fields: dict) -> OrderedDict:
+        """
+        List column types and defaults the way PRAGMA table_info
+        reports them, including columns split out of GROUPs.
+        :args:
+        - p_constraints (dict) Dict of constraints for the table
+        - p_col_fields (dict) Dict of column fields, default values
+        :returns:
+        - (OrderedDict) {col_nm: (data type, default value SQL)}
+        """
+        col_defs: OrderedDict = OrderedDict()
+        for col_nm, def_value in p_col_fields.items():
+            if col_nm in p_constraints.get('GROUP', {}):
+                group_class = p_constraints['GROUP'][col_nm]
+                cols = {f'{col_nm}_{k}': v
+                        for k, v in group_class.__dict__.items()
+                        if not k.startswith('_')}
+            else:
+                cols = {col_nm: def_value}
+            for c_nm, c_value in cols.items():
+                data_type =\
+                    self.set_sql_data_type(c_value, p_constraints).strip()
+                col_defs[c_nm] = (
+                    data_type,
+                    self.set_sql_default(c_value, data_type)[9:])
+        return col_defs
+
+    def write_sql_file(self,
+                       p_file_nm: str,
+                       p_sql: str):
+        """
+        Write a generated SQL file, unless an identical one exists.
+        Regenerating from unchanged models then costs a read per
+        file and leaves mtimes alone.
+        :args:
+        - p_file_nm (str) Name of SQL file in [APP]/sql
+        - p_sql (str) SQL code
+        """
+        file_path = path.join(self.DB_PATH, p_file_nm)
+        if FI.get_file(file_path) != p_sql.strip():
+            FI.write_file(file_path, p_sql)
+
     def generate_drop_sql(self,
                           p_table_name: str):
         """
@@ -246,8 +405,7 @@ class DataBase(object):
         - SQL file to [APP]/sql/DROP_[p_table_name].sql
         """
         sql = f"DROP TABLE IF EXISTS {p_table_name};\n"
-        file_path = path.join(self.DB_PATH, f"DROP_{p_table_name}.sql")
-        FI.write_file(file_path, sql)
+        self.write_sql_file(f"DROP_{p_table_name}.sql", sql)
 
     def generate_insert_sql(self,
                             p_table_name: str,
@@ -264,8 +422,7 @@ class DataBase(object):
         columns = ',\n'.join(p_col_names)
         sql = f"INSERT INTO {p_table_name} (\n{columns}) " +\
               f"VALUES ({placeholders});\n"
-        file_path = path.join(self.DB_PATH, f"INSERT_{p_table_name}.sql")
-        FI.write_file(file_path, sql)
+        self.write_sql_file(f"INSERT_{p_table_name}.sql", sql)
 
     def generate_select_all_sql(self,
                                 p_table_name: str,
@@ -289,8 +446,7 @@ class DataBase(object):
 
         sql += ';\n'
 
-        file_path = path.join(self.DB_PATH, f"SELECT_ALL_{p_table_name}.sql")
-        FI.write_file(file_path, sql)
+        self.write_sql_file(f"SELECT_ALL_{p_table_name}.sql", sql)
 
     def generate_select_pk_sql(self,
                                p_table_name: str,
@@ -316,8 +472,7 @@ class DataBase(object):
 
         sql += ';\n'
 
-        file_path = path.join(self.DB_PATH, f"SELECT_BY_PK_{p_table_name}.sql")
-        FI.write_file(file_path, sql)
+        self.write_sql_file(f"SELECT_BY_PK_{p_table_name}.sql", sql)
 
     def generate_update_sql(self,
                             p_table_name: str,
@@ -342,8 +497,7 @@ class DataBase(object):
         sql = f"UPDATE {p_table_name} SET\n{set_columns}\n" +\
               f"WHERE {pk_conditions};\n"
 
-        file_path = path.join(self.DB_PATH, f"UPDATE_{p_table_name}.sql")
-        FI.write_file(file_path, sql)
+        self.write_sql_file(f"UPDATE_{p_table_name}.sql", sql)
 
     def generate_delete_sql(self,
                             p_table_name: str,
@@ -360,15 +514,18 @@ class DataBase(object):
         pk_conditions =\
             ' AND '.join([f'{col}=?' for col in p_constraints['PK']])
         sql = f"DELETE FROM {p_table_name}\nWHERE {pk_conditions};\n"
-        file_path = path.join(self.DB_PATH, f"DELETE_{p_table_name}.sql")
-        FI.write_file(file_path, sql)
+        self.write_sql_file(f"DELETE_{p_table_name}.sql", sql)
 
-    def generate_sql(self,
-                     p_data_model: object):
+    def get_model_parts(self,
+                        p_data_model: object) -> tuple:
         """
-        Generate full set of SQL code from a Pydantic data model.
+        Split a data model class into the parts used to generate SQL.
         :args:
         - p_data_model: data model class object
+        :returns: tuple of:
+        - (str) table name
+        - (dict) constraints
+        - (dict) column fields, default values
         """
         constraints = {k: v for k, v
                        in p_data_model.Constraints.__dict__.items()
@@ -377,6 +534,17 @@ class DataBase(object):
         model = {k: v for k, v in p_data_model.__dict__.items()
                  if not k.startswith('_')
                  and k not in ('to_dict', 'Constraints')}
+        return (table_name, constraints, model)
+
+    def generate_sql(self,
+                     p_data_model: object):
+        """
+        Generate full set of SQL code from a Pydantic data model.
+        :args:
+        - p_data_model: data model class object
+        """
+        table_name, constraints, model =\
+            self.get_model_parts(p_data_model)
         col_names = self.generate_create_sql(table_name, constraints, model)
         self.generate_drop_sql(table_name)
         self.generate_insert_sql(table_name, col_names)
@@ -385,34 +553,551 @@ class DataBase(object):
         self.generate_update_sql(table_name, constraints, col_names)
         self.generate_delete_sql(table_name, constraints)
 
+    # Schema Migration
+    # ===========================================
+    def diff_table(self,
+                   p_table_nm: str,
+                   p_constraints: dict,
+                   p_col_defs: OrderedDict,
+                   p_create_sql: str,
+                   p_index_sqls: list) -> tuple:
+        """
+        Compare an existing table to its data model and list the
+        SQL needed to bring it up to date.
+        - New columns are added and dropped columns removed with
+          ALTER TABLE. Indexes that are new or changed are created,
+          those no longer in the model are dropped.
+        - A change to a column's type or default, or to the PK, FK
+          or CHECK rules, cannot be done with ALTER in SQLITE, so
+          the table is rebuilt: create a copy, move the rows over,
+          drop the old table and rename the copy.
+        N.B. Assumes a connection and cursor are already open.
+        :args:
+        - p_table_nm (str) Name of table
+        - p_constraints (dict) Dict of constraints for the table
+        - p_col_defs (OrderedDict) from get_column_defs()
+        - p_create_sql (str) CREATE TABLE SQL for the model
+        - p_index_sqls (list) CREATE INDEX SQL for the model
+        :returns: tuple of:
+        - (list) SQL statements, empty if table matches the model
+        - (str) 'alter', 'rebuild' or '' if no change
+        """
+        self.cur.execute(f"PRAGMA table_info({p_table_nm})")
+        col_info = self.cur.fetchall()
+        db_cols = OrderedDict((r[1], (r[2], r[4])) for r in col_info)
+        db_pk = [r[1] for r in sorted(col_info, key=lambda r: r[5])
+                 if r[5] > 0]
+        self.cur.execute(f"PRAGMA foreign_key_list({p_table_nm})")
+        db_fk = {r[3]: (r[2], r[4]) for r in self.cur.fetchall()}
+        self.cur.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE tbl_name=?",
+            (p_table_nm,))
+        master = self.cur.fetchall()
+        table_sql = ''.join(r[2] for r in master if r[0] == 'table')
+        # SQLITE stores index SQL without IF NOT EXISTS or the ';'
+        db_ix = {r[1]: r[2] for r in master
+                 if r[0] == 'index' and r[2] is not None}
+        model_ix = {sql.split(' ')[5]: sql for sql in p_index_sqls}
+        stale_ix = [ix for ix, sql in db_ix.items()
+                    if ix not in model_ix or sql !=
+                    model_ix[ix].replace(' IF NOT EXISTS', '').strip()[:-1]]
+        checks = [ck[:-2] for ck in
+                  self.set_sql_check_constraints(p_constraints)
+                  .splitlines(keepends=True)]
+        model_fk = {k: tuple(v)
+                    for k, v in p_constraints.get('FK', {}).items()}
+        added = [c for c in p_col_defs if c not in db_cols]
+        dropped = [c for c in db_cols if c not in p_col_defs]
+
+        rebuild = (
+            db_pk != list(p_constraints.get('PK', [])) or
+            db_fk != model_fk or
+            table_sql.count('CHECK (') != len(checks) or
+            any(ck not in table_sql for ck in checks) or
+            any(p_col_defs[c] != db_cols[c]
+                for c in db_cols if c in p_col_defs) or
+            (dropped and sq3.sqlite_version_info < (3, 35, 0)))
+        if rebuild:
+            new_nm = f"{p_table_nm}__new"
+            cols = ', '.join(c for c in p_col_defs if c in db_cols)
+            return ([p_create_sql.replace(
+                        f"CREATE TABLE IF NOT EXISTS {p_table_nm} ",
+                        f"CREATE TABLE {new_nm} ", 1),
+                     f"INSERT INTO {new_nm} ({cols}) " +
+                     f"SELECT {cols} FROM {p_table_nm};",
+                     f"DROP TABLE {p_table_nm};",
+                     f"ALTER TABLE {new_nm} RENAME TO {p_table_nm};"] +
+                    p_index_sqls,
+                    'rebuild')
+        sqls = [f"DROP INDEX {ix};" for ix in stale_ix]
+        sqls += [f"ALTER TABLE {p_table_nm} ADD COLUMN {c} " +
+                 f"{p_col_defs[c][0]} DEFAULT {p_col_defs[c][1]};"
+                 for c in added]
+        sqls += [f"ALTER TABLE {p_table_nm} DROP COLUMN {c};"
+                 for c in dropped]
+        sqls += [sql for ix, sql in model_ix.items()
+                 if ix not in db_ix or ix in stale_ix]
+        return (sqls, 'alter' if sqls else '')
+
+    def plan_migration(self,
+                       p_data_models: list) -> list:
+        """
+        Work out which tables differ from their data models.
+        Tables whose CREATE SQL hash matches SCHEMA_VERSION are
+        skipped without being inspected, so the cost of a plan
+        grows with the number of changed models, not the DB size.
+        N.B. Assumes a connection and cursor are already open.
+        :args:
+        - p_data_models (list) data model class objects
+        :returns:
+        - (list) of (table name, action, SQL list, schema hash,
+          next version), where action is 'create', 'alter',
+          'rebuild' or '' if the table only needs to be versioned
+        """
+        self.cur.execute(self.SCHEMA_SQL)
+        self.cur.execute(
+            "SELECT table_nm, schema_hash, version FROM SCHEMA_VERSION")
+        versions = {r[0]: (r[1], r[2]) for r in self.cur.fetchall()}
+        self.cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        tables = {r[0] for r in self.cur.fetchall()}
+        plan = list()
+        for model in p_data_models:
+            table_nm, constraints, fields = self.get_model_parts(model)
+            create_sql, _ =\
+                self.get_create_sql(table_nm, constraints, fields)
+            index_sqls = self.set_sql_indexes(table_nm, constraints)
+            schema_hash = SI.get_hash(create_sql + ''.join(index_sqls))
+            db_hash, version = versions.get(table_nm, ('', 0))
+            if table_nm not in tables:
+                sqls, action = [create_sql] + index_sqls, 'create'
+            elif db_hash == schema_hash:
+                continue
+            else:
+                sqls, action = self.diff_table(
+                    table_nm, constraints,
+                    self.get_column_defs(constraints, fields),
+                    create_sql, index_sqls)
+            plan.append((table_nm, action, sqls, schema_hash, version + 1))
+        return plan
+
+    def migrate_db(self,
+                   p_data_models: list,
+                   p_backup: bool = False) -> dict:
+        """
+        Bring the DB tables in line with the data models, in place.
+        All changes are applied in one transaction; if any step
+        fails, or leaves a foreign key broken, none are kept.
+        Existing rows are preserved.
+        :args:
+        - p_data_models (list) data model class objects
+        - p_backup (bool) If True, back up the DB before changing
+          existing tables. Requires the BACKUP table.
+        :returns:
+        - (dict) {table name: action} for tables that were changed
+        """
+        self.connect_db()
+        plan = self.plan_migration(p_data_models)
+        self.disconnect_db()
+        if p_backup and any(p[1] in ('alter', 'rebuild') for p in plan):
+            self.backup_db()
+        if not plan:
+            return dict()
+        self.connect_db()
+        self.db_conn.isolation_level = None     # type: ignore
+        # Cannot be changed inside a transaction.
+        self.cur.execute("PRAGMA foreign_keys = OFF;")
+        try:
+            self.cur.execute("BEGIN;")
+            for table_nm, _, sqls, schema_hash, version in plan:
+                for sql in sqls:
+                    self.cur.execute(sql)
+                self.cur.execute(
+                    "INSERT OR REPLACE INTO SCHEMA_VERSION " +
+                    "VALUES (?, ?, ?, ?);",
+                    (table_nm, schema_hash, version,
+                     SI.get_iso_time_stamp()))
+            self.cur.execute("PRAGMA foreign_key_check;")
+            broken = self.cur.fetchall()
+            if broken:
+                raise sq3.IntegrityError(
+                    f"Migration breaks foreign keys: {broken[:5]}")
+            self.cur.execute("COMMIT;")
+            self.invalidate_cache()
+        except Exception as err:
+            if self.db_conn.in_transaction:     # type: ignore
+                self.cur.execute("ROLLBACK;")
+            raise (err)
+        finally:
+            self.disconnect_db()
+        return {p[0]: p[1] for p in plan if p[1] != ''}
+
+    def explain_sql_files(self,
+                          p_file_patterns: tuple = ('SELECT_*.sql',
+                                                    'UPDATE_*.sql',
+                                                    'DELETE_*.sql')
+                          ) -> dict:
+        """
+        Run EXPLAIN QUERY PLAN on the SQL files in the DB directory
+        and flag steps that read a whole table or sort in a temp
+        B-tree. A SCAN through an index is fine for an unfiltered,
+        ordered SELECT, but not for a statement with a WHERE clause.
+        Parameters are bound to NULL; the plan does not depend on
+        their values.
+        :args:
+        - p_file_patterns (tuple) file name patterns, case ignored
+        :returns:
+        - (dict) {file name: [flagged plan steps]}, only for files
+          with at least one flagged step
+        """
+        flagged: dict = dict()
+        self.connect_db()
+        try:
+            for pattern in p_file_patterns:
+                for sql_file in FI.scan_dir(self.DB_PATH, pattern, True):
+                    sql = FI.get_file(str(sql_file))
+                    try:
+                        self.cur.execute(f"EXPLAIN QUERY PLAN {sql}",
+                                         [None] * sql.count('?'))
+                    except sq3.Error as err:
+                        flagged[sql_file.name] = [f"ERROR {err}"]
+                        continue
+                    steps = [r[3] for r in self.cur.fetchall()
+                             if (r[3].startswith('SCAN ') and
+                                 (' USING ' not in r[3] or
+                                  'WHERE' in sql.upper())) or
+                             'TEMP B-TREE' in r[3]]
+                    if steps:
+                        flagged[sql_file.name] = steps
+        finally:
+            self.disconnect_db()
+        return flagged
+
+    # Map Hierarchy
+    # ===========================================
+    def set_map_closure(self,
+                        p_rebuild: bool = False):
+        """Install the triggers that keep MAP_CLOSURE current as
+        maps are inserted, moved to a new container, renamed or
+        deleted. Assumes the MAP and MAP_CLOSURE tables exist.
+        :args:
+        - p_rebuild (bool) If True, also refill MAP_CLOSURE from
+          MAP with a recursive query, e.g. after a migration.
+        """
+        self.connect_db()
+        try:
+            self.cur.executescript(self.MAP_CLOSURE_TRIGGERS)
+            if p_rebuild:
+                self.cur.execute("DELETE FROM MAP_CLOSURE;")
+                self.cur.execute(
+                    "INSERT OR IGNORE INTO MAP_CLOSURE " +
+                    "(ancestor_map_nm, descendant_map_nm, depth) " +
+                    "WITH RECURSIVE up(descendant, ancestor, depth) AS (" +
+                    "SELECT map_nm_pk, map_nm_pk, 0 FROM MAP " +
+                    "UNION ALL " +
+                    "SELECT up.descendant, m.container_map_nm_fk, " +
+                    "up.depth + 1 FROM up JOIN MAP AS m " +
+                    "ON m.map_nm_pk = up.ancestor " +
+                    "WHERE m.container_map_nm_fk IS NOT NULL " +
+                    "AND m.container_map_nm_fk <> '' " +
+                    f"AND up.depth < {self.MAP_DEPTH_MAX}) " +
+                    "SELECT ancestor, descendant, depth FROM up;")
+            self.db_conn.commit()   # type: ignore
+        finally:
+            self.disconnect_db()
+        self.invalidate_cache()
+
+    def get_map_chain(self,
+                      p_map_nm: str,
+                      p_ancestors: bool = True,
+                      p_use_closure: bool = True) -> OrderedDict:
+        """Get a map and every map that contains it, or every map
+        it contains, at any depth, with their grids, in one query.
+        - With p_use_closure, one indexed lookup on MAP_CLOSURE.
+        - Otherwise, a recursive CTE walks MAP.container_map_nm_fk;
+          use it if the closure table has not been built.
+        A map linked to more than one grid in GRID_X_MAP appears
+        once per grid.
+        :args:
+        - p_map_nm (str) map_nm_pk of the starting map
+        - p_ancestors (bool) If True, list containing maps, nearest
+          first. If False, list contained maps, by depth.
+        - p_use_closure (bool) use MAP_CLOSURE, else a recursive CTE
+        :returns:
+        - (OrderedDict) Dict of lists, {col_nms: [data values]},
+          with depth and grid_nm_fk ahead of the MAP columns
+        """
+        if p_use_closure:
+            near, far = ("descendant_map_nm", "ancestor_map_nm")\
+                if p_ancestors\
+                else ("ancestor_map_nm", "descendant_map_nm")
+            sql = (f"SELECT c.depth, g.grid_nm_fk, m.* " +
+                   "FROM MAP_CLOSURE AS c " +
+                   f"JOIN MAP AS m ON m.map_nm_pk = c.{far} " +
+                   "LEFT JOIN GRID_X_MAP AS g ON g.map_nm_fk = m.map_nm_pk " +
+                   f"WHERE c.{near} = ? " +
+                   "ORDER BY c.depth, m.map_nm_pk;")
+        else:
+            step = "m.map_nm_pk = chain.container_map_nm_fk"\
+                if p_ancestors\
+                else "m.container_map_nm_fk = chain.map_nm_pk"
+            sql = ("WITH RECURSIVE chain(map_nm_pk, container_map_nm_fk, " +
+                   "depth) AS (" +
+                   "SELECT map_nm_pk, container_map_nm_fk, 0 FROM MAP " +
+                   "WHERE map_nm_pk = ? " +
+                   "UNION ALL " +
+                   "SELECT m.map_nm_pk, m.container_map_nm_fk, " +
+                   f"chain.depth + 1 FROM MAP AS m JOIN chain ON {step} " +
+                   f"WHERE chain.depth < {self.MAP_DEPTH_MAX}) " +
+                   "SELECT chain.depth, g.grid_nm_fk, m.* FROM chain " +
+                   "JOIN MAP AS m ON m.map_nm_pk = chain.map_nm_pk " +
+                   "LEFT JOIN GRID_X_MAP AS g ON g.map_nm_fk = m.map_nm_pk " +
+                   "ORDER BY chain.depth, m.map_nm_pk;")
+        self.connect_db()
+        try:
+            self.cur.execute(sql, [p_map_nm])
+            result = self.set_dict_from_cursor(
+                [c[0] for c in self.cur.description])
+        finally:
+            self.disconnect_db()
+        return result
+
     # Backup, Archive and Restore
     # ===========================================
+    @classmethod
+    def copy_db(cls,
+                p_from_db: str,
+                p_to_db: str,
+                p_pages: int = 1024,
+                p_progress=None):
+        """Copy a DB using the SQLITE online backup API.
+        Pages are copied in steps of p_pages. Between steps the
+        source is unlocked, so the game can keep reading and writing
+        it; pages changed mid-copy are picked up before it finishes.
+        :args:
+        - p_from_db (str) path to source DB file
+        - p_to_db (str) path to target DB file, overwritten
+        - p_pages (int) pages copied per step
+        - p_progress (callable) Optional. Called after each step
+          with (status, remaining pages, total pages).
+        """
+        from_conn = sq3.connect(p_from_db)
+        to_conn = sq3.connect(p_to_db)
+        try:
+            from_conn.backup(to_conn, pages=p_pages, progress=p_progress)
+        finally:
+            to_conn.close()
+            from_conn.close()
 
-    def backup_db(self):
-        """Copy main DB file to backup location."""
+    def backup_db(self,
+                  p_progress=None):
+        """Copy main DB file to backup location.
+        :args:
+        - p_progress (callable) Optional. See copy_db().
+        """
         bkup_dttm = pendulum.now().format('YYYYMMDD_HHmmss')
         self.execute_insert(
             'INSERT_BACKUP',
             (SI.get_key(), bkup_dttm, 'backup', self.DB, self.DB_BKUP))
-        shutil.copyfile(self.DB, self.DB_BKUP)
+        self.copy_db(self.DB, self.DB_BKUP, p_progress=p_progress)
 
-    def archive_db(self):
-        """Copy main DB file to archive location."""
-        bkup_dttm = pendulum.now().format('YYYYMMDD_HHmmss')
-        file_nm = 'SASKAN_' + bkup_dttm + '.arcv'
+    @classmethod
+    def write_archive(cls,
+                      p_db_file: str,
+                      p_arcv_path: str,
+                      p_page_index: dict) -> dict:
+        """Write a compressed, page-deduplicated archive of a DB file.
+        The file is read one DB page at a time. Each page is hashed
+        and only pages not found in p_page_index, or earlier in this
+        archive, are compressed and stored. The archive ends with a
+        manifest listing the hash of every page in order.
+        Layout: ARCV_MAGIC, zlib pages, pickled manifest, 8-byte
+        manifest offset.
+        :args:
+        - p_db_file (str) path to a DB file not being written to,
+          e.g. a snapshot made with copy_db()
+        - p_arcv_path (str) path to archive file to create; an
+          existing file is not overwritten
+        - p_page_index (dict) from get_archive_index()
+        :returns:
+        - (dict) page counts and archive size in bytes
+        :raises:
+        - FileExistsError if p_arcv_path already exists
+        """
+        with open(p_db_file, 'rb') as f_db:
+            page_size = int.from_bytes(f_db.read(100)[16:18], 'big')
+            page_size = 65536 if page_size == 1 else page_size
+            f_db.seek(0)
+            digests = bytearray()
+            stored: dict = dict()
+            with open(p_arcv_path, 'xb') as f_arcv:
+                f_arcv.write(cls.ARCV_MAGIC)
+                for page in iter(lambda: f_db.read(page_size), b''):
+                    digest = hashlib.blake2b(
+                        page, digest_size=cls.ARCV_DIGEST).digest()
+                    digests += digest
+                    if digest not in p_page_index and\
+                            digest not in stored:
+                        data = zlib.compress(page, cls.ARCV_LEVEL)
+                        stored[digest] = (f_arcv.tell(), len(data))
+                        f_arcv.write(data)
+                manifest_at = f_arcv.tell()
+                f_arcv.write(pickle.dumps({"page_size": page_size,
+                                           "pages": bytes(digests),
+                                           "stored": stored}))
+                f_arcv.write(manifest_at.to_bytes(8, 'big'))
+                arcv_size = f_arcv.tell()
+        return {"pages": len(digests) // cls.ARCV_DIGEST,
+                "stored": len(stored),
+                "bytes": arcv_size}
+
+    @classmethod
+    def is_page_archive(cls,
+                        p_arcv_path: str) -> bool:
+        """Tell a page archive from an older plain DB copy.
+        :args:
+        - p_arcv_path (str) path to archive file
+        :returns:
+        - (bool) True if the file starts with ARCV_MAGIC
+        """
+        with open(p_arcv_path, 'rb') as f_arcv:
+            return f_arcv.read(len(cls.ARCV_MAGIC)) == cls.ARCV_MAGIC
+
+    @classmethod
+    def read_archive_manifest(cls,
+                              p_arcv_path: str) -> dict:
+        """Read the manifest at the end of an archive.
+        :args:
+        - p_arcv_path (str) path to archive file
+        :returns:
+        - (dict) page_size, pages (concatenated page hashes) and
+          stored ({page hash: (offset, length)})
+        """
+        with open(p_arcv_path, 'rb') as f_arcv:
+            if f_arcv.read(len(cls.ARCV_MAGIC)) != cls.ARCV_MAGIC:
+                raise Exception(f"{p_arcv_path} is not a page archive.")
+            f_arcv.seek(-8, 2)
+            manifest_end = f_arcv.tell()
+            manifest_at = int.from_bytes(f_arcv.read(8), 'big')
+            f_arcv.seek(manifest_at)
+            # trunk-ignore(bandit/B301)
+            return pickle.loads(f_arcv.read(manifest_end - manifest_at))
+
+    @classmethod
+    def get_archive_index(cls,
+                          p_arcv_dir: str,
+                          p_exclude: str = '') -> dict:
+        """Map every page stored in the archives in a directory to
+        where it is stored.
+        Files without the page archive header are skipped.
+        :args:
+        - p_arcv_dir (str) directory holding SASKAN_*.parcv files
+        - p_exclude (str) Optional. Archive path to leave out, e.g.
+          the one about to be written
+        :returns:
+        - (dict) {page hash: (archive path, offset, length)}
+        """
+        page_index: dict = dict()
+        for arcv in FI.scan_dir(p_arcv_dir, 'SASKAN_*' + cls.ARCV_EXT):
+            if path.abspath(arcv) == path.abspath(p_exclude or '') or\
+                    not cls.is_page_archive(str(arcv)):
+                continue
+            stored = cls.read_archive_manifest(str(arcv))['stored']
+            for digest, (offset, length) in stored.items():
+                page_index.setdefault(digest, (str(arcv), offset, length))
+        return page_index
+
+    @classmethod
+    def read_archive(cls,
+                     p_arcv_path: str,
+                     p_db_file: str,
+                     p_page_index: dict):
+        """Reassemble a DB file from an archive and the archives
+        it shares pages with.
+        :args:
+        - p_arcv_path (str) path to archive file
+        - p_db_file (str) path to DB file to write, overwritten
+        - p_page_index (dict) from get_archive_index()
+        """
+        pages = cls.read_archive_manifest(p_arcv_path)['pages']
+        arcv_files: dict = dict()
+        try:
+            with open(p_db_file, 'wb') as f_db:
+                for i in range(0, len(pages), cls.ARCV_DIGEST):
+                    digest = pages[i:i + cls.ARCV_DIGEST]
+                    if digest not in p_page_index:
+                        raise Exception(
+                            f"Page {digest.hex()} of {p_arcv_path} " +
+                            "is missing from the archives.")
+                    arcv, offset, length = p_page_index[digest]
+                    if arcv not in arcv_files:
+                        arcv_files[arcv] = open(arcv, 'rb')
+                    arcv_files[arcv].seek(offset)
+                    f_db.write(zlib.decompress(arcv_files[arcv].read(length)))
+        finally:
+            for f_arcv in arcv_files.values():
+                f_arcv.close()
+
+    def archive_db(self,
+                   p_progress=None) -> dict:
+        """Archive main DB file, storing only pages that are not
+        already in an earlier archive.
+        A snapshot is taken with the online backup API, so the game
+        can keep using the DB; the snapshot is then archived.
+        :args:
+        - p_progress (callable) Optional. See copy_db().
+        :returns:
+        - (dict) archive file name, page counts and size in bytes
+        """
+        now = pendulum.now()
+        bkup_dttm = now.format('YYYYMMDD_HHmmss')
+        # Microseconds, so two archives in one second get two files.
+        file_nm = 'SASKAN_' + now.format('YYYYMMDD_HHmmss_SSSSSS') +\
+            self.ARCV_EXT
         bkup_nm = path.join(self.DB_PATH, file_nm)
         self.execute_insert(
             'INSERT_BACKUP',
             (SI.get_key(), bkup_dttm, 'archive', self.DB, file_nm))
-        shutil.copyfile(self.DB, bkup_nm)
+        snapshot = bkup_nm + '.snap'
+        try:
+            self.copy_db(self.DB, snapshot, p_progress=p_progress)
+            result = self.write_archive(
+                snapshot, bkup_nm,
+                self.get_archive_index(self.DB_PATH, bkup_nm))
+        finally:
+            if path.exists(snapshot):
+                remove(snapshot)
+        result["file_nm"] = file_nm
+        return result
 
-    def restore_db(self):
-        """Copy backup DB file to main location."""
+    def restore_db(self,
+                   p_arcv_nm: str = '',
+                   p_progress=None):
+        """Copy backup DB file, or rebuild an archive, to main location.
+        :args:
+        - p_arcv_nm (str) Optional. Name of a SASKAN_*.parcv file in
+          the DB directory, or of an older SASKAN_*.arcv plain copy.
+          If not provided, restore the backup.
+        - p_progress (callable) Optional. See copy_db().
+        """
         bkup_dttm = pendulum.now().format('YYYYMMDD_HHmmss')
+        from_db = self.DB_BKUP if p_arcv_nm == ''\
+            else path.join(self.DB_PATH, p_arcv_nm)
         self.execute_insert(
             'INSERT_BACKUP',
-            (SI.get_key(), bkup_dttm, 'restore', self.DB_BKUP, self.DB))
-        shutil.copyfile(self.DB_BKUP, self.DB)
+            (SI.get_key(), bkup_dttm, 'restore', from_db, self.DB))
+        if p_arcv_nm == '' or not self.is_page_archive(from_db):
+            self.copy_db(from_db, self.DB, p_progress=p_progress)
+            self.invalidate_cache()
+            return
+        restored = from_db + '.restore'
+        try:
+            self.read_archive(from_db, restored,
+                              self.get_archive_index(self.DB_PATH))
+            self.copy_db(restored, self.DB, p_progress=p_progress)
+            self.invalidate_cache()
+        finally:
+            if path.exists(restored):
+                remove(restored)
 
     # DataBase Connections
     # ===========================================
@@ -530,6 +1215,162 @@ class DataBase(object):
                 result[col].append(row[i])
         return result
 
+    # Query Result Cache
+    # ===========================================
+    def get_sql_table(self,
+                      p_sql: str) -> str:
+        """Get the name of the table a SQL statement reads or writes,
+        i.e. the first name after FROM, INTO or UPDATE.
+        :args:
+        - p_sql (str) SQL code
+        :returns:
+        - (str) table name, upper case, or '' if none found
+        """
+        found = re.search(r"\b(?:FROM|INTO|UPDATE)\s+(\w+)", p_sql,
+                          re.IGNORECASE)
+        return found.group(1).upper() if found else ''
+
+    def get_cache_key(self,
+                      p_sql_nm: str,
+                      p_key_vals: list = None) -> tuple:
+        """Build the result cache key for a SQL file and its values.
+        :args:
+        - p_sql_nm (str) Name of external SQL file
+        - p_key_vals (list) Optional. Values bound to the SQL
+        :returns:
+        - (tuple) (DB file, SQL name, values)
+        """
+        return (self.DB, str(p_sql_nm.split('.')[0]).upper(),
+                tuple(p_key_vals or ()))
+
+    def copy_result(self,
+                    p_result: OrderedDict) -> OrderedDict:
+        """Copy a cached result, so callers can modify theirs.
+        :args:
+        - p_result (OrderedDict) Dict of lists
+        :returns:
+        - (OrderedDict) copy with new lists
+        """
+        return OrderedDict((k, None if v is None else list(v))
+                           for k, v in p_result.items())
+
+    def get_cached(self,
+                   p_key: tuple) -> OrderedDict:
+        """Look up a cached SELECT result.
+        :args:
+        - p_key (tuple) from get_cache_key()
+        :returns:
+        - (OrderedDict) copy of the result, or None if not cached
+          or expired
+        """
+        with self._CACHE_LOCK:
+            entry = self._CACHE.get(p_key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._CACHE[p_key]
+                self._CACHE_STATS["misses"] += 1
+                return None
+            self._CACHE.move_to_end(p_key)
+            self._CACHE_STATS["hits"] += 1
+            return self.copy_result(entry[2])
+
+    def set_cached(self,
+                   p_key: tuple,
+                   p_table_nm: str,
+                   p_result: OrderedDict):
+        """Cache a SELECT result, evicting the least recently used
+        entries if the cache is full.
+        :args:
+        - p_key (tuple) from get_cache_key()
+        - p_table_nm (str) table the result was read from
+        - p_result (OrderedDict) Dict of lists
+        """
+        with self._CACHE_LOCK:
+            self._CACHE[p_key] = (time.monotonic() + self.CACHE_TTL,
+                                  p_table_nm, self.copy_result(p_result))
+            self._CACHE.move_to_end(p_key)
+            while len(self._CACHE) > self.CACHE_SIZE:
+                self._CACHE.popitem(last=False)
+                self._CACHE_STATS["evictions"] += 1
+
+    def get_fk_children(self,
+                        p_table_nm: str) -> set:
+        """Get the tables whose rows can change when rows of a table
+        are deleted or replaced, following ON DELETE CASCADE chains
+        and tables written by triggers on the table.
+        N.B. Assumes a connection and cursor are already open.
+        :args:
+        - p_table_nm (str) Name of parent table
+        :returns:
+        - (set) names of child tables, at any depth
+        """
+        if self.DB not in self._FK_CHILDREN:
+            self.cur.execute(
+                "SELECT m.name, f.\"table\" FROM sqlite_master AS m, " +
+                "pragma_foreign_key_list(m.name) AS f " +
+                "WHERE m.type = 'table';")
+            fk_children: dict = dict()
+            for child, parent in self.cur.fetchall():
+                fk_children.setdefault(parent.upper(), set()).add(
+                    child.upper())
+            self.cur.execute("SELECT tbl_name, sql FROM sqlite_master " +
+                             "WHERE type = 'trigger';")
+            for parent, sql in self.cur.fetchall():
+                for child in re.findall(
+                        r"\b(?:INTO|UPDATE|DELETE\s+FROM)\s+(\w+)",
+                        sql.split("BEGIN", 1)[-1], re.IGNORECASE):
+                    fk_children.setdefault(parent.upper(), set()).add(
+                        child.upper())
+            self._FK_CHILDREN[self.DB] = fk_children
+        fk_children = self._FK_CHILDREN[self.DB]
+        children: set = set()
+        todo = [p_table_nm]
+        while todo:
+            for child in fk_children.get(todo.pop(), set()):
+                if child not in children:
+                    children.add(child)
+                    todo.append(child)
+        return children
+
+    def invalidate_cache(self,
+                         p_table_nm: str = ''):
+        """Drop cached results for a table and the tables that
+        cascade from it, or all cached results.
+        N.B. If a table is named, assumes a connection and cursor
+        are already open.
+        :args:
+        - p_table_nm (str) Optional. If not provided, clear the
+          whole cache and forget FK relations, e.g. after DDL.
+        """
+        if p_table_nm == '':
+            with self._CACHE_LOCK:
+                self._CACHE_STATS["invalidations"] += len(self._CACHE)
+                self._CACHE.clear()
+                self._FK_CHILDREN.clear()
+            return
+        if not self._CACHE:
+            return
+        tables = self.get_fk_children(p_table_nm) | {p_table_nm}
+        with self._CACHE_LOCK:
+            for key in [k for k, v in self._CACHE.items()
+                        if k[0] == self.DB and v[1] in tables]:
+                del self._CACHE[key]
+                self._CACHE_STATS["invalidations"] += 1
+
+    def get_cache_stats(self) -> dict:
+        """Report result cache counters for monitoring.
+        :returns:
+        - (dict) hits, misses, evictions, invalidations, current
+          size and hit ratio
+        """
+        with self._CACHE_LOCK:
+            stats = dict(self._CACHE_STATS)
+            stats["size"] = len(self._CACHE)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] =\
+            round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
     # Executing SQL Scripts
     # ===========================================
     def execute_dml(self,
@@ -547,29 +1388,40 @@ class DataBase(object):
             self.cur.execute(SQL)
         if self.db_conn is not None:
             self.db_conn.commit()
+        self.invalidate_cache()
         self.disconnect_db()
 
     def execute_select_all(self,
-                           p_sql_nm: str) -> OrderedDict:
+                           p_sql_nm: str,
+                           p_use_cache: bool = True) -> OrderedDict:
         """Run a SQL SELECT ALL file which does not use
            any dynamic parameters.
         Iterate (fetchall) over the cursor to see record(s).
         :args:
         - p_sql_nm (str): Name of external SQL file
+        - p_use_cache (bool): if False, always read the DB
         :returns:
         - (OrderedDict) Dict of lists, {col_nms: [data values]}
         """
+        cache_key = self.get_cache_key(p_sql_nm)
+        if p_use_cache:
+            result = self.get_cached(cache_key)
+            if result is not None:
+                return result
         self.connect_db()
         SQL: str = self.get_sql_file(p_sql_nm)
         COLS: list = self.get_db_columns(p_sql_select=SQL)
         self.cur.execute(SQL)
         result = self.set_dict_from_cursor(COLS)
         self.disconnect_db()
+        if p_use_cache:
+            self.set_cached(cache_key, self.get_sql_table(SQL), result)
         return result
 
     def execute_select_by_pk(self,
                              p_sql_nm: str,
-                             p_key_vals: list) -> OrderedDict:
+                             p_key_vals: list,
+                             p_use_cache: bool = True) -> OrderedDict:
         """Run a SQL SELECT by PK file which uses key values
         (primary key) for WHERE clause.
            For now I will assume that:
@@ -578,6 +1430,7 @@ class DataBase(object):
         :args:
         - p_sql_nm (str): Name of external SQL file
         - p_key_vals (list): Value of primary key(s) to match on
+        - p_use_cache (bool): if False, always read the DB
         :returns:
         - (dict) Dict of lists, {col_nms: [data values]}
 
@@ -588,12 +1441,19 @@ class DataBase(object):
         """
         if isinstance(p_key_vals, str):
             p_key_vals = [p_key_vals]
+        cache_key = self.get_cache_key(p_sql_nm, p_key_vals)
+        if p_use_cache:
+            result = self.get_cached(cache_key)
+            if result is not None:
+                return result
         self.connect_db()
         SQL = self.get_sql_file(p_sql_nm)
         COLS = self.get_db_columns(p_sql_select=SQL)
         self.cur.execute(SQL, p_key_vals)
         result = self.set_dict_from_cursor(COLS)
         self.disconnect_db()
+        if p_use_cache:
+            self.set_cached(cache_key, self.get_sql_table(SQL), result)
         return result
 
     def execute_insert(self,
@@ -612,6 +1472,31 @@ class DataBase(object):
         SQL = self.get_sql_file(p_sql_nm)
         self.cur.execute(SQL, p_values)
         self.db_conn.commit()   # type: ignore
+        self.invalidate_cache(self.get_sql_table(SQL))
+        self.disconnect_db()
+
+    def execute_insert_many(self,
+                            p_sql_nm: str,
+                            p_values_list: list,
+                            p_replace: bool = False):
+        """Run a SQL INSERT file once per set of values, using
+           a single connection and a single commit.
+           Same assumptions as execute_insert().
+        :args:
+        - p_sql_nm (str): Name of external SQL file
+        - p_values_list (list): list of n-tuples of values to insert
+        - p_replace (bool): if True, replace rows that have the
+            same primary key instead of failing
+        """
+        if not p_values_list:
+            return
+        self.connect_db()
+        SQL = self.get_sql_file(p_sql_nm)
+        if p_replace:
+            SQL = SQL.replace("INSERT INTO", "INSERT OR REPLACE INTO", 1)
+        self.cur.executemany(SQL, p_values_list)
+        self.db_conn.commit()   # type: ignore
+        self.invalidate_cache(self.get_sql_table(SQL))
         self.disconnect_db()
 
     def execute_update(self,
@@ -636,6 +1521,7 @@ class DataBase(object):
         self.cur.execute(SQL, p_values + p_key_vals)
         if self.db_conn is not None:
             self.db_conn.commit()   # type: ignore
+        self.invalidate_cache(self.get_sql_table(SQL))
         self.disconnect_db()
 
     def execute_delete(self,
@@ -656,18 +1542,33 @@ class DataBase(object):
         self.cur.execute(SQL, p_key_vals)
         if self.db_conn is not None:
             self.db_conn.commit()   # type: ignore
+        self.invalidate_cache(self.get_sql_table(SQL))
         self.disconnect_db()
 
     # =====================================================================
     # Saskan Database Management -- Backup, archive, restart
     # =====================================================================
 
-    def boot_saskan_db(self):
+    def boot_saskan_db(self,
+                       p_data_models: list = None) -> dict:
         """Create SASKAN.db database, if it does not already exist.
-        - If it already exists and has tables, back it up and then boot it.
-        - Do not wipe out any existing archives.
-        - Scan self.DB_PATH for DROP and CREATE SQL files.
+        - If data models are provided, migrate the DB to match them.
+          Only tables whose model changed are touched, and the DB
+          is backed up first if an existing table will be altered.
+        - Otherwise, rebuild from SQL files:
+          - If DB already exists and has tables, back it up and then
+            boot it.
+          - Do not wipe out any existing archives.
+          - Scan self.DB_PATH for DROP and CREATE SQL files.
+        :args:
+        - p_data_models (list) Optional. Data model class objects.
+        :returns:
+        - (dict) {table name: action} for tables that were changed,
+          empty if rebuilt from SQL files
         """
+        if p_data_models:
+            return self.migrate_db(p_data_models, p_backup=True)
+
         db_file_path = Path(self.DB)
         if db_file_path.exists():
             self.connect_db()
@@ -682,3 +1583,65 @@ class DataBase(object):
             self.execute_dml(sql.name)
 
         self.disconnect_db()
+        return dict()
+
+
+def benchmark_backup(p_db_mb: int = 2048,
+                     p_dir: str = "/tmp/saskan_bkup_bench",
+                     p_change_pct: float = 1.0):
+    """Time whole-file copy vs online backup, and full vs incremental
+    page archives, on a generated DB of about p_db_mb megabytes.
+    Rows are half random, half zero bytes, so pages compress about
+    as well as game data does. Reports seconds and archive sizes.
+    :args:
+    - p_db_mb (int) size of generated DB in MB
+    - p_dir (str) scratch directory, removed afterwards
+    - p_change_pct (float) percent of rows changed between archives
+    """
+    def timed(p_func, *p_args):
+        t0 = time.perf_counter()
+        result = p_func(*p_args)
+        return (round(time.perf_counter() - t0, 2), result)
+
+    makedirs(p_dir, exist_ok=True)
+    db_file = path.join(p_dir, "SASKAN.db")
+    db_rows = p_db_mb * 512     # 2 KB rows
+    conn = sq3.connect(db_file)
+    conn.execute("CREATE TABLE IF NOT EXISTS PAGES " +
+                 "(row_pk INTEGER PRIMARY KEY, data BLOB);")
+    conn.execute("WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL " +
+                 f"SELECT x + 1 FROM c WHERE x < {db_rows}) " +
+                 "INSERT OR REPLACE INTO PAGES SELECT x, " +
+                 "randomblob(1000) || zeroblob(1000) FROM c;")
+    conn.commit()
+    result = {"db_mb": round(path.getsize(db_file) / 2**20)}
+    result["copyfile_sec"], _ = timed(
+        shutil.copyfile, db_file, path.join(p_dir, "copy.db"))
+    result["backup_api_sec"], _ = timed(
+        DataBase.copy_db, db_file, path.join(p_dir, "bkup.db"))
+    arcv_1 = path.join(p_dir, "SASKAN_1" + DataBase.ARCV_EXT)
+    result["archive_full_sec"], stats = timed(
+        DataBase.write_archive, db_file, arcv_1, dict())
+    result["archive_full_mb"] = round(stats["bytes"] / 2**20, 1)
+    every = max(1, round(100 / p_change_pct))
+    conn.execute("UPDATE PAGES SET data = randomblob(1000) || " +
+                 f"zeroblob(1000) WHERE row_pk % {every} = 0;")
+    conn.commit()
+    conn.close()
+    arcv_2 = path.join(p_dir, "SASKAN_2" + DataBase.ARCV_EXT)
+    result["archive_incr_sec"], stats = timed(
+        DataBase.write_archive, db_file, arcv_2,
+        DataBase.get_archive_index(p_dir))
+    result["archive_incr_mb"] = round(stats["bytes"] / 2**20, 1)
+    restored = path.join(p_dir, "restored.db")
+    result["restore_sec"], _ = timed(
+        DataBase.read_archive, arcv_2, restored,
+        DataBase.get_archive_index(p_dir))
+    result["restore_same"] =\
+        FI.is_same_content(db_file, restored)
+    shutil.rmtree(p_dir)
+    pp(result)
+
+
+if __name__ == '__main__':
+    benchmark_backup()
@@ -6,39 +6,82 @@ module:    io_file.py
 class:     FileIO/0
 author:    GM <genuinemerit @ pm.me>
 """
+from __future__ import annotations
+
+import difflib
+import hashlib
 import json
-import pandas as pd
 # trunk-ignore(bandit/B403)
 import pickle
+import re
 import shutil
-
-from numbers_parser import Document as NumbersDoc
-from os import path, remove, symlink, system
+import subprocess
+import sys
+import threading
+import time
+
+from fnmatch import translate
+from itertools import islice, zip_longest
+from os import (chmod, environ, getuid, listdir, makedirs, path, remove,
+                replace, stat, symlink, system)
 from pathlib import Path
 from pprint import pprint as pp  # noqa: F401
 
+from io_lazy import lazy_import
 from io_shell import ShellIO
 
+np_parser = lazy_import("numbers_parser")
+odf_doc = lazy_import("odf.opendocument")
+odf_table = lazy_import("odf.table")
+odf_text = lazy_import("odf.teletype")
+pd = lazy_import("pandas")
 SI = ShellIO()
 
 
 class FileIO(object):
-    """File IO utilities."""
+    """File IO utilities.
+
+    Config and schema files are read as attributes, e.g. FI.D, FI.G.
+    Each file is parsed at most once per process, on first access,
+    and kept in a registry shared by all FileIO instances. A cached
+    file is re-read if its mtime or size changes. Treat the returned
+    dicts as read-only; copy before modifying.
+    """
+    CONFIGS: dict = {
+        "D": ("saskan/config", "d_dirs"),
+        "T": ("saskan/config", "t_texts_en"),
+        "F": ("saskan/config", "g_frame"),
+        "M": ("saskan/config", "g_menus"),
+        "W": ("saskan/config", "g_windows"),
+        "U": ("saskan/config", "g_uri"),
+        "S": ("saskan/schema", "svc_schema"),
+        "G": ("saskan/schema", "saskan_geo"),
+        "A": ("saskan/schema", "saskan_astro"),
+        "TM": ("saskan/schema", "saskan_time")}
+    SNAPSHOT: str = "/dev/shm/saskan/cache/config_snapshot.json"
+    SHEET_CACHE: str = "/dev/shm/saskan/cache/sheets"
+    BATCH_ROWS: int = 5000
+    CHECK_SEC: float = 1.0
+    _REGISTRY: dict = dict()    # {path: [mtime_ns, size, checked, data]}
+    _LOCK = threading.Lock()
+    _SNAPSHOT_READ: bool = False
 
     def __init__(self):
         """Initialize FileIO object.
+        Nothing is read here; see CONFIGS and get_config().
         Eventually move 'schema' data to DB.
         """
-        self.D: dict = self.get_config("saskan/config", "d_dirs")
-        self.T: dict = self.get_config("saskan/config", "t_texts_en")
-        self.F: dict = self.get_config("saskan/config", "g_frame")
-        self.M: dict = self.get_config("saskan/config", "g_menus")
-        self.W: dict = self.get_config("saskan/config", "g_windows")
-        self.U: dict = self.get_config("saskan/config", "g_uri")
-        self.S: dict = self.get_config("saskan/schema", "svc_schema")
-        self.G: dict = self.get_config("saskan/schema", "saskan_geo")
-        self.A: dict = self.get_config("saskan/schema", "saskan_astro")
-        self.T: dict = self.get_config("saskan/schema", "saskan_time")
+        pass
+
+    def __getattr__(self,
+                    p_attr: str):
+        """Load config or schema data on first use of FI.<key>.
+        Only called for attributes not found the normal way.
+        """
+        if p_attr in FileIO.CONFIGS:
+            return self.get_config(*FileIO.CONFIGS[p_attr])
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{p_attr}'")
 
     # Read methods
     # ==============================================================
@@ -46,29 +89,36 @@ class FileIO(object):
     @classmethod
     def scan_dir(cls,
                  p_dir_path: str,
-                 p_file_pattern: str = '') -> list:
+                 p_file_pattern: str = '',
+                 p_ignore_case: bool = False) -> list:
         """Scan a directory for files matching a specific pattern.
 
         Args:
             p_dir_path (str): Path to the directory.
-            p_file_pattern (str): Pattern to match the file names.
-                Not regex. Allow for * as wildcard, that's it.
+            p_file_pattern (str): Shell-style pattern to match the
+                file names: * any chars, ? one char, [seq] any char
+                in seq. A pattern with no wildcard matches names
+                containing it, e.g. 'DROP' is read as '*DROP*'.
                 Optional. If not provided, return all items in dir.
+            p_ignore_case (bool): If True, match 'x.sql' and 'X.SQL'.
 
         Returns:
-            list: List of file paths matching the pattern.
+            list: File paths matching the pattern, sorted by name.
         """
-        srch = p_file_pattern.split('*')
-        files: list = []
+        pattern = p_file_pattern
+        if pattern != '' and not any(c in pattern for c in '*?['):
+            pattern = f"*{pattern}*"
+        match = re.compile(translate(pattern),
+                           re.IGNORECASE if p_ignore_case else 0).match
+        f_names: list = []
         try:
-            if Path(p_dir_path).exists() and Path(p_dir_path).is_dir():
-                files = [f for f in Path(p_dir_path).iterdir()]
-                if p_file_pattern != '':
-                    files = [f for f in files
-                             if all(s in f.name for s in srch)]
+            if path.isdir(p_dir_path):
+                f_names = [f_nm for f_nm in listdir(p_dir_path)
+                           if pattern == '' or match(f_nm)]
         except Exception as err:
             raise (err)
-        return files
+        dir_path = Path(p_dir_path)
+        return [dir_path / f_nm for f_nm in sorted(f_names)]
 
     @classmethod
     def get_file(cls,
@@ -107,43 +157,200 @@ class FileIO(object):
         - (DataFrame): DataFrame of the sheet.
         """
         dataf = None
-        doc = NumbersDoc(p_file_path)
+        doc = np_parser.Document(p_file_path)
         sheets = doc.sheets
         tables = sheets[p_sheet_x].tables
         data = tables[0].rows(values_only=True)
         dataf = pd.DataFrame(data[1:], columns=data[0])
         return dataf
 
+    @classmethod
+    def get_file_hash(cls,
+                      p_path: str) -> str:
+        """Return SHA-256 hex digest of a file, read in 1 MB blocks.
+        :args:
+        - p_path (str): Legit path to file location.
+        """
+        sha = hashlib.sha256()
+        with open(p_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    @classmethod
+    def iter_ods_rows(cls,
+                      p_file_path: str,
+                      p_sheet: str = ''):
+        """Yield rows of an ODS sheet as tuples of typed values.
+        Floats, booleans and text are converted; dates stay ISO strings.
+        Repeated cells and rows are expanded as pandas' odf reader
+        does: blank rows are kept (as empty tuples) up to the last
+        non-empty row, and trailing empty cells are dropped. odfpy
+        parses the whole document, so this bounds the DataFrame size,
+        not the XML tree size.
+        :args:
+        - p_file_path (str): Path to the workbook.
+        - p_sheet (str): Name or index of sheet. Default is first sheet.
+        """
+        doc = odf_doc.load(p_file_path)
+        tables = doc.spreadsheet.getElementsByType(odf_table.Table)
+        if str(p_sheet).isdigit():
+            table = tables[int(p_sheet)]
+        elif p_sheet:
+            table = [t for t in tables
+                     if t.getAttribute("name") == p_sheet][0]
+        else:
+            table = tables[0]
+        blank_rows = 0
+        for row in table.getElementsByType(odf_table.TableRow):
+            vals: list = []
+            blank_cells = 0
+            for cell in row.childNodes:
+                if cell.qname[1] not in ("table-cell", "covered-table-cell"):
+                    continue
+                vtype = cell.getAttribute("valuetype")
+                if vtype in ("float", "percentage", "currency"):
+                    val = float(cell.getAttribute("value"))
+                elif vtype == "boolean":
+                    val = cell.getAttribute("booleanvalue") == "true"
+                elif vtype == "date":
+                    val = cell.getAttribute("datevalue")
+                else:
+                    val = odf_text.extractText(cell) or None
+                repeat = int(cell.getAttribute("numbercolumnsrepeated") or 1)
+                if val is None:
+                    # Only expanded if a value follows, so a trailing
+                    # run of thousands of empty cells costs nothing.
+                    blank_cells += repeat
+                    continue
+                vals.extend([None] * blank_cells + [val] * repeat)
+                blank_cells = 0
+            repeat = int(row.getAttribute("numberrowsrepeated") or 1)
+            if not vals:
+                blank_rows += repeat
+                continue
+            for _ in range(blank_rows):
+                yield ()
+            blank_rows = 0
+            for _ in range(repeat):
+                yield tuple(vals)
+
+    def iter_spreadsheet_data(self,
+                              p_file_path: str,
+                              p_sheet: str = '',
+                              p_batch_rows: int = 0):
+        """Yield a spreadsheet as DataFrame batches of p_batch_rows.
+        Row 1 is the header. Column types are inferred per batch.
+        - CSV, TSV, TXT: pandas chunked reader
+        - XLSX: openpyxl read-only row iterator
+        - XLS: pandas, read whole, then sliced
+        - ODS: odfpy row iterator (see iter_ods_rows)
+        - Numbers: numbers_parser row iterator
+        :args:
+        - p_file_path (str): Path to the workbook.
+        - p_sheet (str): Name or Index of sheet to load. Optional.
+            If it is a Numbers file, this needs to be an integer (index)
+        - p_batch_rows (int): rows per batch; default BATCH_ROWS
+        :yields:
+        - (DataFrame): next batch of rows
+        """
+        p_batch_rows = p_batch_rows or FileIO.BATCH_ROWS
+        ss_type = p_file_path.split('.')[-1].lower()
+        if ss_type in ('csv', 'tsv', 'txt'):
+            sep = '\t' if ss_type == 'tsv' else ','
+            for batch in pd.read_csv(p_file_path, sep=sep,
+                                     chunksize=p_batch_rows):
+                yield batch
+            return
+        if ss_type == 'xls':
+            dataf = pd.read_excel(p_file_path,
+                                  sheet_name=int(p_sheet) if
+                                  str(p_sheet).isdigit() else p_sheet or 0)
+            for ix in range(0, max(len(dataf.index), 1), p_batch_rows):
+                yield dataf.iloc[ix:ix + p_batch_rows]
+            return
+        if ss_type in ('xlsx', 'xlsm'):
+            openpyxl = lazy_import("openpyxl")
+            wb = openpyxl.load_workbook(p_file_path, read_only=True,
+                                        data_only=True)
+            sheet = wb.worksheets[int(p_sheet)] if str(p_sheet).isdigit()\
+                else wb[p_sheet] if p_sheet else wb.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+        elif ss_type == 'ods':
+            rows = self.iter_ods_rows(p_file_path, p_sheet)
+        elif ss_type == 'numbers':
+            doc = np_parser.Document(p_file_path)
+            table = doc.sheets[int(p_sheet or 0)].tables[0]
+            rows = table.iter_rows(values_only=True)
+        else:
+            raise ValueError(f"{self.T['err_file']} {p_file_path}")
+        header = list(next(rows, ()))
+        batch: list = []
+        batch_cnt = 0
+        for row in rows:
+            batch.append(tuple(row[:len(header)]) +
+                         (None,) * (len(header) - len(row)))
+            if len(batch) >= p_batch_rows:
+                yield pd.DataFrame(batch, columns=header).infer_objects()
+                batch_cnt += 1
+                batch = []
+        if batch or batch_cnt == 0:
+            yield pd.DataFrame(batch, columns=header).infer_objects()
+        if ss_type in ('xlsx', 'xlsm'):
+            wb.close()
+
+    def get_cached_sheet_path(self,
+                              p_file_path: str,
+                              p_sheet: str = '') -> str:
+        """Return path of the columnar cache file for a sheet.
+        The name is keyed by the source file's content hash, so an
+        edited workbook gets a new cache entry.
+        Feather is used if pyarrow is installed, else pickle.
+        :args:
+        - p_file_path (str): Path to the workbook.
+        - p_sheet (str): Name or Index of sheet.
+        """
+        try:
+            import pyarrow  # noqa: F401
+            ext = "feather"
+        except ImportError:
+            ext = "pickle"
+        sheet = str(p_sheet).replace(path.sep, "_") or "0"
+        return path.join(FileIO.SHEET_CACHE,
+                         f"{self.get_file_hash(p_file_path)}_{sheet}.{ext}")
+
     def get_spreadsheet_data(self,
                              p_file_path: str,
-                             p_sheet: str = '') -> pd.DataFrame:
+                             p_sheet: str = '',
+                             p_use_cache: bool = True) -> pd.DataFrame:
         """Get data from Excel, ODF, CSV (tab), or MacOS Numbers spreadsheet.
         Preference is for CSV files.
+        A sheet is read once, in batches, then stored in a columnar
+        cache keyed by the file hash. Later calls load the cache.
 
         :args:
         - p_file_path (str): Path to the workbook.
         - p_sheet (str): Name or Index of sheet to load. Optional.
             If it is a Numbers file, this needs to be an integer (index)
+        - p_use_cache (bool): read and write the sheet cache
         :return:
         - (DataFrame): DataFrame of the sheet.
         """
-        dataf = pd.DataFrame()
-        ss_type = p_file_path.split('.')[-1].lower()
-        sheet_nm = None if p_sheet == '' else p_sheet
-        if ss_type.lower() in ('xlsx', 'xls'):
-            data = pd.read_excel(p_file_path,
-                                 sheet_name=sheet_nm)
-        elif ss_type.lower() in ('ods'):
-            data = pd.read_excel(p_file_path, engine='odf',
-                                 sheet_name=sheet_nm)
-        elif ss_type.lower() in ('csv'):
-            data = pd.read_csv(p_file_path)
-        elif ss_type.lower() in ('numbers'):
-            data = self.get_numbers_data(p_file_path, int(p_sheet))
-        else:
-            raise ValueError(f"{self.A['M']['file']}: {p_file_path}")
-        if isinstance(data, pd.DataFrame):
-            dataf = data
+        cache_path = self.get_cached_sheet_path(p_file_path, p_sheet)\
+            if p_use_cache else ''
+        if cache_path and path.exists(cache_path):
+            if cache_path.endswith(".feather"):
+                return pd.read_feather(cache_path)
+            return pd.read_pickle(cache_path)
+        batches = list(self.iter_spreadsheet_data(p_file_path, p_sheet))
+        dataf = pd.concat(batches, ignore_index=True) if batches\
+            else pd.DataFrame()
+        if cache_path:
+            makedirs(FileIO.SHEET_CACHE, exist_ok=True)
+            if cache_path.endswith(".feather"):
+                dataf.to_feather(cache_path)
+            else:
+                dataf.to_pickle(cache_path)
         return dataf
 
     @classmethod
@@ -199,27 +406,90 @@ class FileIO(object):
                    p_file_dir: str,
                    p_cfg_nm: str) -> dict:
         """Read configuration data from APP config dir.
+        Parsed data is memoized in the process-wide registry.
+        The file is stat'd at most once per CHECK_SEC and
+        parsed again only if its mtime or size changed.
         :args:
         - p_file_dir (str): local app path for file
         - p_cfg_nm (str): name of config file to read
         :returns:
         - (dict) Config file values as python dict, or None.
         """
-        cfg = dict()
         p_cfg_nm = p_cfg_nm.lower().replace(".json", "") + ".json"
+        cfg_path = path.join(SI.get_cwd_home(), p_file_dir, p_cfg_nm)
+        now = time.monotonic()
+        entry = FileIO._REGISTRY.get(cfg_path)
+        if entry is not None and now - entry[2] < FileIO.CHECK_SEC:
+            return entry[3]
         try:
-            cfg_j = self.get_file(path.join(
-                SI.get_cwd_home(), p_file_dir, p_cfg_nm))
-
-            # pp(('cfg_j', cfg_j))
-
-            cfg = json.loads(cfg_j)
-            return cfg
+            with FileIO._LOCK:
+                if not FileIO._SNAPSHOT_READ:
+                    FileIO._SNAPSHOT_READ = True
+                    self.load_config_snapshot()
+                    entry = FileIO._REGISTRY.get(cfg_path)
+                f_stat = stat(cfg_path)
+                if (entry is None or
+                        entry[0] != f_stat.st_mtime_ns or
+                        entry[1] != f_stat.st_size):
+                    cfg = json.loads(self.get_file(cfg_path))
+                    entry = [f_stat.st_mtime_ns, f_stat.st_size, now, cfg]
+                    FileIO._REGISTRY[cfg_path] = entry
+                entry[2] = now
+            return entry[3]
         except Exception as err:
             raise (err)
 
+    @classmethod
+    def load_config_snapshot(cls,
+                             p_path: str = '') -> int:
+        """Seed the config registry from a JSON snapshot, if one
+        exists. Entries are still checked against file mtime and size
+        before use, so a stale snapshot only costs a re-parse.
+        The cache dir is shared, so a snapshot not owned by this user,
+        or writable by others, is ignored.
+        :args:
+        - p_path (str): snapshot file; default is FileIO.SNAPSHOT
+        :returns:
+        - (int) number of entries loaded
+        """
+        p_path = p_path or cls.SNAPSHOT
+        if not path.exists(p_path):
+            return 0
+        s_stat = stat(p_path)
+        if s_stat.st_uid != getuid() or s_stat.st_mode & 0o022:
+            return 0
+        try:
+            snap = json.loads(cls.get_file(p_path))
+        except ValueError:
+            return 0
+        for cfg_path, (mtime_ns, size, cfg) in snap.items():
+            if cfg_path not in cls._REGISTRY:
+                cls._REGISTRY[cfg_path] = [mtime_ns, size, 0.0, cfg]
+        return len(snap)
+
     # Write methods
     # ==============================================================
+    def save_config_snapshot(self,
+                             p_path: str = '') -> int:
+        """Parse every file in CONFIGS and save the registry as JSON,
+        readable only by this user, so later processes can skip
+        parsing each config file at startup.
+        :args:
+        - p_path (str): snapshot file; default is FileIO.SNAPSHOT
+        :returns:
+        - (int) number of entries saved
+        """
+        p_path = p_path or FileIO.SNAPSHOT
+        for cfg_dir, cfg_nm in FileIO.CONFIGS.values():
+            self.get_config(cfg_dir, cfg_nm)
+        snap = {cfg_path: (e[0], e[1], e[3])
+                for cfg_path, e in FileIO._REGISTRY.items()}
+        makedirs(path.dirname(p_path), exist_ok=True)
+        self.write_file(p_path + ".tmp", json.dumps(snap))
+        chmod(p_path + ".tmp", 0o600)
+        replace(p_path + ".tmp", p_path)
+        return len(snap)
+
     @classmethod
     def make_dir(cls, p_path: str):
         """Create directory at specified location.
@@ -436,12 +706,9 @@ class FileIO(object):
         :returns:
         - (list): Unique values in column
         """
-        u_vals = pd.DataFrame()
-        u_vals = p_df.dropna(subset=[p_col])
-        u_vals = u_vals.drop_duplicates(subset=[p_col], keep='first')
-        vals: list = []
-        if len(u_vals) > 1:
-            vals = u_vals[p_col].values.tolist()
+        vals: list = p_df[p_col].dropna().unique().tolist()
+        if len(vals) < 2:
+            vals = []
         vals.sort()
         return vals
 
@@ -458,29 +725,227 @@ class FileIO(object):
         :returns:
         - (list): Unique values in column(s) or None
         """
-        df = p_df.copy()
         df_meta = {'row_cnt': 0,
                    'columns': {}}
-        df_meta['row_count'] = len(df.index)
-        cols = cls.get_df_col_names(df)
+        df_meta['row_count'] = len(p_df.index)
+        cols = cls.get_df_col_names(p_df)
         for col_nm in cols:
-            df_meta['columns'][col_nm] = cls.get_df_col_unique_vals(col_nm, df)
+            df_meta['columns'][col_nm] =\
+                cls.get_df_col_unique_vals(col_nm, p_df)
+        return df_meta
+
+    def get_sheet_metadata(self,
+                           p_file_path: str,
+                           p_sheet: str = '',
+                           p_max_vals: int = 1000) -> dict:
+        """Get the same metadata as get_df_metadata() while streaming
+        a sheet in batches, so the whole sheet is never in memory.
+        Unique values per column are capped at p_max_vals; columns
+        that hit the cap are listed in 'truncated'.
+        :args:
+        - p_file_path (str): Path to the workbook.
+        - p_sheet (str): Name or Index of sheet.
+        - p_max_vals (int): most unique values to keep per column
+        :returns:
+        - (dict) row count, unique values per column, truncated cols
+        """
+        df_meta = {'row_cnt': 0,
+                   'row_count': 0,
+                   'columns': {},
+                   'truncated': []}
+        uniques: dict = {}
+        for batch in self.iter_spreadsheet_data(p_file_path, p_sheet):
+            df_meta['row_count'] += len(batch.index)
+            for col_nm in self.get_df_col_names(batch):
+                seen = uniques.setdefault(col_nm, set())
+                if len(seen) >= p_max_vals:
+                    continue
+                for val in batch[col_nm].dropna().unique().tolist():
+                    seen.add(val)
+                    if len(seen) >= p_max_vals:
+                        df_meta['truncated'].append(col_nm)
+                        break
+        for col_nm, seen in uniques.items():
+            df_meta['columns'][col_nm] = sorted(seen) if len(seen) > 1\
+                else []
         return df_meta
 
     @classmethod
     def diff_files(cls,
                    p_file_a: str,
-                   p_file_b: str) -> str:
-        """Diff two files and return the result.
+                   p_file_b: str,
+                   p_first_only: bool = False) -> str:
+        """Diff two text files and return the result.
+        Files of equal size are first compared block by block as they
+        are read, stopping at the first difference; identical files
+        return '' without building a diff.
         :args:
         - p_file_a (str): full path to file A
         - p_file_b (str): full path to file B
+        - p_first_only (bool): if True, only report the line number
+            and both versions of the first differing line
+        :returns:
+        - (str) unified diff, first difference, or '' if the same
         """
         try:
-            cmd = f"diff {p_file_a} {p_file_b}"
-            ok, msg = SI.run_cmd(cmd)
-            if not ok:
-                raise (msg)
-            return msg
+            same_size = stat(p_file_a).st_size == stat(p_file_b).st_size
+            if same_size and cls.is_same_content(p_file_a, p_file_b):
+                return ''
+            if p_first_only:
+                line_no = cls.find_first_diff(p_file_a, p_file_b)
+                with open(p_file_a, 'r') as f_a,\
+                        open(p_file_b, 'r') as f_b:
+                    line_a = next(islice(f_a, line_no - 1, None), '')
+                    line_b = next(islice(f_b, line_no - 1, None), '')
+                return (f"{line_no}c{line_no}\n< {line_a.rstrip()}" +
+                        f"\n---\n> {line_b.rstrip()}")
+            with open(p_file_a, 'r') as f_a, open(p_file_b, 'r') as f_b:
+                return "".join(difflib.unified_diff(
+                    f_a.readlines(), f_b.readlines(),
+                    fromfile=p_file_a, tofile=p_file_b))
         except Exception as err:
             raise (err)
+
+    @classmethod
+    def is_same_content(cls,
+                        p_file_a: str,
+                        p_file_b: str,
+                        p_block: int = 1 << 16) -> bool:
+        """Compare two files in binary blocks, stopping at the first
+        block that differs.
+        :args:
+        - p_file_a (str): full path to file A
+        - p_file_b (str): full path to file B
+        - p_block (int): bytes read per step
+        :returns:
+        - (bool) True if the contents are identical
+        """
+        with open(p_file_a, 'rb') as f_a, open(p_file_b, 'rb') as f_b:
+            while True:
+                block_a = f_a.read(p_block)
+                if block_a != f_b.read(p_block):
+                    return False
+                if not block_a:
+                    return True
+
+    @classmethod
+    def find_first_diff(cls,
+                        p_file_a: str,
+                        p_file_b: str) -> int:
+        """Stream two text files and find the first differing line.
+        :args:
+        - p_file_a (str): full path to file A
+        - p_file_b (str): full path to file B
+        :returns:
+        - (int) 1-based line number of first difference, 0 if none
+        """
+        with open(p_file_a, 'r') as f_a, open(p_file_b, 'r') as f_b:
+            for line_no, (line_a, line_b) in enumerate(
+                    zip_longest(f_a, f_b), start=1):
+                if line_a != line_b:
+                    return line_no
+        return 0
+
+
+def benchmark_native_io(p_dir: str = "/dev/shm/saskan/bench",
+                        p_lines: int = 100000,
+                        p_files: int = 2000,
+                        p_runs: int = 20):
+    """Compare in-process file and port utilities to shelled-out ones.
+    Times FileIO.diff_files against `diff`, scan_dir against the old
+    iterdir-and-substring scan, and ShellIO.get_used_ports against
+    `netstat -lant`. Reports mean ms per call.
+    :args:
+    - p_dir (str): scratch directory, removed afterwards
+    - p_lines (int): lines per diffed file
+    - p_files (int): files in the scanned directory
+    - p_runs (int): calls per timing
+    """
+    def mean_ms(p_func, *p_args):
+        t0 = time.perf_counter()
+        for _ in range(p_runs):
+            p_func(*p_args)
+        return round((time.perf_counter() - t0) * 1000 / p_runs, 2)
+
+    def old_scan(p_dir_path, p_file_pattern):
+        srch = p_file_pattern.split('*')
+        return [f for f in Path(p_dir_path).iterdir()
+                if all(s in f.name for s in srch)]
+
+    makedirs(p_dir, exist_ok=True)
+    file_a = path.join(p_dir, "a.txt")
+    file_b = path.join(p_dir, "b.txt")
+    file_c = path.join(p_dir, "c.txt")
+    lines = [f"{i}\tsome saskan record text\n" for i in range(p_lines)]
+    with open(file_a, 'w') as f:
+        f.writelines(lines)
+    shutil.copyfile(file_a, file_b)
+    lines[10] = "changed\n"
+    with open(file_c, 'w') as f:
+        f.writelines(lines)
+    for i in range(p_files):
+        prefix = "DROP" if i % 2 else "CREATE"
+        open(path.join(p_dir, f"{prefix}_T{i}.SQL"), 'w').close()
+    result = {
+        "diff_same": {"shell": mean_ms(SI.run_cmd,
+                                       f"diff {file_a} {file_b}"),
+                      "native": mean_ms(FileIO.diff_files,
+                                        file_a, file_b)},
+        "diff_first": {"shell": mean_ms(SI.run_cmd,
+                                        f"diff {file_a} {file_c}"),
+                       "native": mean_ms(FileIO.diff_files,
+                                         file_a, file_c, True)},
+        "scan_dir": {"old": mean_ms(old_scan, p_dir, "DROP*.SQL"),
+                     "native": mean_ms(FileIO.scan_dir,
+                                       p_dir, "DROP*.SQL")},
+        "ports": {"shell": mean_ms(SI.run_cmd, "netstat -lant"),
+                  "native": mean_ms(SI.get_used_ports)}}
+    shutil.rmtree(p_dir)
+    pp(result)
+
+
+def benchmark_imports(p_modules: tuple = ("io_db", "io_data",
+                                          "saskan_game", "saskan_admin",
+                                          "saskan_install")):
+    """Report cold-start cost of the main entry points.
+    For each module, a fresh `python -X importtime` process imports
+    it and prints wall time and peak RSS. Also lists the slowest
+    modules pulled in. Run from the Saskantinon directory.
+    :args:
+    - p_modules (tuple): module names to import
+    """
+    for mod in p_modules:
+        code = ("import resource, time; t = time.perf_counter(); " +
+                f"import {mod}; print(time.perf_counter() - t, " +
+                "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True,
+            env=dict(environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+        proc_sec = time.perf_counter() - t0
+        rows = list()
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, cum_us, name = [c.strip() for c in
+                                     line.split(":", 1)[1].split("|")]
+            rows.append((int(cum_us), int(self_us), name))
+        result = {"ok": proc.returncode == 0,
+                  "process_ms": round(proc_sec * 1000, 1)}
+        if proc.returncode == 0:
+            import_sec, rss_kb = proc.stdout.split()[-2:]
+            result["import_ms"] = round(float(import_sec) * 1000, 1)
+            result["max_rss_mb"] = round(int(rss_kb) / 1024, 1)
+        else:
+            result["error"] = [line for line in proc.stderr.splitlines()
+                               if not line.startswith("import time:")][-1]
+        result["slowest_ms"] = [(r[2], round(r[1] / 1000, 1))
+                                for r in sorted(rows, key=lambda r: r[1],
+                                                reverse=True)[:5]]
+        pp({mod: result})
+
+
+if __name__ == '__main__':
+    benchmark_imports()
+    benchmark_native_io()
@@ -30,20 +30,25 @@ Goals:
   graph data. Maybe rename this to io_analysis or something.
 """
 
+from __future__ import annotations
+
 # import networkx as nx                   # type: ignore
-import pandas as pd                     # type: ignore
 # import pickle
+import random
+import time
 
 # from copy import deepcopy
+from itertools import product
 from os import path
-from pandas import DataFrame
 from pprint import pformat as pf        # noqa: F401
 from pprint import pprint as pp         # noqa: F401
 
 from io_file import FileIO              # type: ignore
+from io_lazy import lazy_import         # type: ignore
 from io_shell import ShellIO            # type: ignore
 from saskan_report import SaskanReport  # type: ignore
 
+pd = lazy_import("pandas")
 FI = FileIO()
 SI = ShellIO()
 SR = SaskanReport()
@@ -73,24 +78,35 @@ class GraphIO(object):
                   p_set: str,
                   p_node_nm: str):
         """Return node type for a given node name.
+        Uses the N["type"] index built by set_node_names().
+
+        :args:
+        - p_set (str): Name of a schema/ontology, e.g. "scenes"
+        - p_node_nm (str): Node name.
+        """
+        return self.N[p_set]["type"].get(p_node_nm)
+
+    def get_node_recs(self,
+                      p_set: str,
+                      p_ntype: str,
+                      p_node_nm: str) -> list:
+        """Return indexes of dataset records that mention a node.
+        Uses the N["recs"] postings built by set_node_names().
 
         :args:
         - p_set (str): Name of a schema/ontology, e.g. "scenes"
+        - p_ntype (str): Node type, e.g. "people"
         - p_node_nm (str): Node name.
         """
-        node_type = None
-        for nt, nodes in self.N[p_set]["name"].items():
-            if p_node_nm in nodes:
-                node_type = nt
-                break
-        return node_type
+        return self.N[p_set]["recs"][p_ntype].get(p_node_nm, [])
 
     # Data load and scrub functions
     def get_data(self,
                  p_file_path: str,
-                 p_sheet_nm: str = None) -> DataFrame:
+                 p_sheet_nm: str = None) -> pd.DataFrame:
         """Get data from a file.
            It can be Excel, ODS, or CSV/TSV
+           Read in batches and cached by FI.get_spreadsheet_data().
 
         @DEV:
         - Eventually point to regular file stores and
@@ -106,23 +122,7 @@ class GraphIO(object):
         :return:
         - (DataFrame): DataFrame of the data.
         """
-        sheet_df = None
-        ss_type = p_file_path.split('.')[-1].lower()
-        if ss_type.lower() in ('xlsx', 'xls'):
-            sheet_df = pd.read_excel(p_file_path,
-                                     sheet_name=p_sheet_nm)
-        elif ss_type.lower() in ('ods'):
-            sheet_df = pd.read_excel(p_file_path, engine='odf',
-                                     sheet_name=p_sheet_nm)
-        elif ss_type.lower() in ('csv', 'txt'):
-            sheet_df = pd.read_csv(p_file_path)
-        elif ss_type.lower() in ('tsv'):
-            sheet_df = pd.read_csv(p_file_path, sep='\t')
-        elif ss_type.lower() in ('txt'):
-            sheet_df = pd.read_csv(p_file_path, sep='|', header=True)
-        else:
-            raise Exception(f"{FI.T['err_file']} {p_file_path}/{p_sheet_nm}")
-        return sheet_df
+        return FI.get_spreadsheet_data(p_file_path, p_sheet_nm or '')
 
     def set_source(self,
                    p_file_name: str,
@@ -173,7 +173,8 @@ class GraphIO(object):
         ds = FI.get_schema(p_set)
         self.DS[p_set] = list(ds.values())[0]
         self.N[p_set] = {"types": list(),
-                         "name": dict(), "size": dict(), "color": dict()}
+                         "name": dict(), "size": dict(), "color": dict(),
+                         "type": dict(), "recs": dict()}
         self.E[p_set] = {"types": list(),
                          "name": dict(), "color": dict()}
         self.N[p_set]["types"] = sorted(list(set(self.DS[p_set][0].keys())))
@@ -184,19 +185,31 @@ class GraphIO(object):
         Node names are stored as a list indexed by node type.
         List is sorted and duplicates removed.
         Assign a color to each node type.
+        Also index the nodes, in the same pass over the records:
+        - N["recs"][type][node]: list of record indexes (postings)
+        - N["type"][node]: node type. If a name is used in more
+          than one type, the first type in N["types"] wins.
 
         :args:
         - p_set (str): Name of a schema/ontology, e.g. "scenes"
         """
         for nt in self.N[p_set]["types"]:
-            self.N[p_set]["name"][nt] = list()
-        for rec in self.DS[p_set]:
+            self.N[p_set]["recs"][nt] = dict()
+        for rix, rec in enumerate(self.DS[p_set]):
             for nt in self.N[p_set]["types"]:
+                postings = self.N[p_set]["recs"][nt]
                 for node in rec[nt]:
-                    self.N[p_set]["name"][nt].append(node)
+                    if node in postings:
+                        if postings[node][-1] != rix:
+                            postings[node].append(rix)
+                    else:
+                        postings[node] = [rix]
+        self.N[p_set]["type"] = dict()
         for nix, ntyp in enumerate(self.N[p_set]["types"]):
             self.N[p_set]["name"][ntyp] =\
-                sorted(list(set(self.N[p_set]["name"][ntyp])))
+                sorted(self.N[p_set]["recs"][ntyp].keys())
+            for node in self.N[p_set]["name"][ntyp]:
+                self.N[p_set]["type"].setdefault(node, ntyp)
             cix = nix if nix < len(self.PALETTE) else len(self.PALETTE) - nix
             color = f"{self.PALETTE[cix]}"
             for node in self.N[p_set]["name"][ntyp]:
@@ -234,20 +247,18 @@ class GraphIO(object):
         Store edges as a list indexed by edge-type.
         Sort each list of edges ascending, no dups.
         Assign colors to each edge type (node-tuple).
+        Edges of every type are collected in a single pass over
+        the records, pairing the nodes each record holds.
 
         :args:
         - p_set (str): Name of a schema/ontology, e.g. "scenes"
         """
+        edges: dict = {etyp: set() for etyp in self.E[p_set]["types"]}
+        for rec in self.DS[p_set]:
+            for (n1, n2), e_set in edges.items():
+                e_set.update(product(rec[n1], rec[n2]))
         for eix, etyp in enumerate(self.E[p_set]["types"]):
-            self.E[p_set]["name"][etyp] = list()
-            n1, n2 = etyp
-            for n in self.N[p_set]["name"][n1]:
-                for rec in self.DS[p_set]:
-                    if n in rec[n1]:
-                        for m in rec[n2]:
-                            self.E[p_set]["name"][etyp].append((n, m))
-            self.E[p_set]["name"][etyp] =\
-                sorted(list(set(self.E[p_set]["name"][etyp])))
+            self.E[p_set]["name"][etyp] = sorted(edges[etyp])
             # colors
             cix = eix if eix < len(self.PALETTE) else len(self.PALETTE) - eix
             color = f"{self.PALETTE[cix]}"
@@ -291,3 +302,49 @@ class GraphIO(object):
                                     '003 Full Moons Waning'])))
         pp((SR.get_degrees(p_set, G, self.N[p_set])))
         # SR.draw_graph(p_set, G, self.N[p_set], self.E[p_set])
+
+
+def benchmark(p_rec_cnt: int = 100000):
+    """Time graph building on a synthetic scenes ontology.
+    Records look like saskan_scenes.json: each has a few scene,
+    people, groups, places and time nodes drawn from pools.
+    Reports build times and the cost of node-type lookups.
+
+    :args:
+    - p_rec_cnt (int): number of synthetic scene records
+    """
+    rnd = random.Random(11)
+    pools = {"scene": 50000, "people": 5000, "groups": 500,
+             "places": 2000, "time": 10000}
+    GIO = GraphIO()
+    GIO.DS["bench"] = [
+        {nt: [f"{nt}-{rnd.randrange(cnt)}"
+              for _ in range(1 if nt in ("scene", "time")
+                             else rnd.randint(1, 6))]
+         for nt, cnt in pools.items()}
+        for _ in range(p_rec_cnt)]
+    GIO.N["bench"] = {"types": sorted(pools.keys()),
+                      "name": dict(), "size": dict(), "color": dict(),
+                      "type": dict(), "recs": dict()}
+    GIO.E["bench"] = {"types": list(), "name": dict(), "color": dict()}
+    times = dict()
+    t0 = time.perf_counter()
+    GIO.set_node_names("bench")
+    times["set_node_names"] = time.perf_counter() - t0
+    GIO.set_edge_types("bench", [("people", "groups")])
+    t0 = time.perf_counter()
+    GIO.set_edges("bench")
+    times["set_edges"] = time.perf_counter() - t0
+    nodes = list(GIO.N["bench"]["type"].keys())
+    t0 = time.perf_counter()
+    for node in nodes:
+        GIO.get_ntype("bench", node)
+    times["get_ntype_all_nodes"] = time.perf_counter() - t0
+    pp(({"records": p_rec_cnt,
+         "nodes": len(nodes),
+         "edges": sum(len(e) for e in GIO.E["bench"]["name"].values())},
+        {k: round(v, 3) for k, v in times.items()}))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,81 @@
+#!python
+"""
+:module:    io_lazy.py
+:author:    GM (genuinemerit @ pm.me)
+
+Defer the cost of heavy imports and of PyGame setup until first use.
+
+Most Saskan modules create FileIO, ShellIO, etc. objects at import
+time, and several used to import pandas, matplotlib, networkx or
+pendulum at the top even when only a CLI path is taken. Use:
+
+    pd = lazy_import("pandas")
+
+in place of `import pandas as pd`. The real import runs on first
+attribute access, e.g. pd.read_csv. Annotations that name a lazy
+module, like `-> pd.DataFrame`, need `from __future__ import
+annotations` so they are not evaluated at def time.
+
+For classes of constants that need PyGame initialized or a display
+opened (fonts, window size, grid geometry), use the LazyInit
+metaclass and put that setup in a `lazy_init()` classmethod. It
+runs once, on first access to any attribute not yet defined.
+Metaclass lookups only cover class access (GameDisplay.WIN_W), so
+such classes also forward instance misses to the class.
+
+:classes:
+- LazyModule    # module proxy, imports on first attribute access
+- LazyInit      # metaclass, calls cls.lazy_init() on first miss
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that is imported on first use.
+    After the import, the real module's namespace is copied in,
+    so later lookups do not go through __getattr__.
+    """
+    def __getattr__(self,
+                    p_attr: str):
+        """Import the real module and return the requested attribute.
+        """
+        mod = importlib.import_module(self.__name__)
+        self.__dict__.update(mod.__dict__)
+        return getattr(mod, p_attr)
+
+
+def lazy_import(p_mod_nm: str) -> types.ModuleType:
+    """Return a module, deferring its import if not yet loaded.
+    :args:
+    - p_mod_nm (str): dotted module name, e.g. "matplotlib.pyplot"
+    :returns:
+    - (module) the module if already imported, else a LazyModule
+    """
+    if p_mod_nm in sys.modules:
+        return sys.modules[p_mod_nm]
+    return LazyModule(p_mod_nm)
+
+
+class LazyInit(type):
+    """Metaclass for constant classes with deferred setup.
+    The first time a missing class attribute is read, call the
+    class's lazy_init() to define the rest of its attributes,
+    then look the attribute up again.
+    """
+    def __getattr__(cls,
+                    p_attr: str):
+        """Run lazy_init() once, on first miss."""
+        if p_attr.startswith('__') or\
+                cls.__dict__.get('_LAZY_DONE', False):
+            raise AttributeError(
+                f"type object '{cls.__name__}' has no attribute '{p_attr}'")
+        cls._LAZY_DONE = True
+        try:
+            cls.lazy_init()
+        except Exception as err:
+            cls._LAZY_DONE = False
+            raise (err)
+        return getattr(cls, p_attr)
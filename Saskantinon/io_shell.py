@@ -9,15 +9,17 @@ Generic system command runner.
 """
 import hashlib      # generate hash keys
 import inspect      # getdoc
-import pendulum
 import secrets
+import socket
 import subprocess as shl
 
 from os import environ, path, system
 from pathlib import Path
 
+from io_lazy import lazy_import         # type: ignore
 from saskan_report import SaskanReport  # type: ignore
 
+pendulum = lazy_import("pendulum")
 SR = SaskanReport()
 
 
@@ -121,6 +123,47 @@ class ShellIO(object):
                 cmd_rc = True
         return (cmd_rc, cmd_result.decode('utf-8').strip())
 
+    @classmethod
+    def get_used_ports(cls) -> set:
+        """Get the local TCP ports in use on this host.
+        Reads /proc/net/tcp and /proc/net/tcp6 directly rather than
+        running netstat. Where /proc is not available, return None
+        so callers fall back to a bind probe (is_port_free).
+
+        :Return: {set} port numbers bound by any TCP socket, or None
+        """
+        ports: set = set()
+        found = False
+        for proc_f in ("/proc/net/tcp", "/proc/net/tcp6"):
+            try:
+                with open(proc_f, 'r') as f:
+                    next(f)     # header
+                    for line in f:
+                        # sl  local_address:port  rem_address:port ...
+                        ports.add(int(line.split()[1].rsplit(':', 1)[1],
+                                      16))
+                found = True
+            except OSError:
+                continue
+        return ports if found else None
+
+    @classmethod
+    def is_port_free(cls,
+                     p_port: int,
+                     p_host: str = "127.0.0.1") -> bool:
+        """Probe a TCP port by trying to bind to it.
+
+        :Args:  {int} port number, {str} host address
+
+        :Return: {bool} True if the port could be bound
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((p_host, p_port))
+                return True
+            except OSError:
+                return False
+
     @classmethod
     def run_nohup_py(cls,
                      pypath,
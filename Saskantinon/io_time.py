@@ -71,21 +71,22 @@ northern hemisphere.
 
 import glob
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 # import json
 import pickle
 import time
 
 from copy import copy
 from dataclasses import dataclass   # fields
-from matplotlib.animation import FuncAnimation
 from pprint import pformat as pf        # noqa: F401
 from pprint import pprint as pp         # noqa: F401
 
 from io_file import FileIO              # type: ignore
+from io_lazy import lazy_import         # type: ignore
 from saskan_math import SaskanMath      # type: ignore
 
+animation = lazy_import("matplotlib.animation")
+np = lazy_import("numpy")
+plt = lazy_import("matplotlib.pyplot")
 FI = FileIO()
 SM = SaskanMath()
 
@@ -796,7 +797,8 @@ class AstroIO(object):
             orbit_line.set_data(moon_positions[:frame, 0], moon_positions[:frame, 1])
             return orbit_line,
 
-        ani = FuncAnimation(fig, animate, frames=num_steps, interval=50, blit=True)
+        ani = animation.FuncAnimation(fig, animate, frames=num_steps,
+                                      interval=50, blit=True)
 
         plt.show()
 
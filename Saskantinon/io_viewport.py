@@ -0,0 +1,365 @@
+#!python
+"""
+:module:    io_viewport.py
+
+:author:    GM (genuinemerit @ pm.me)
+
+:classes:
+- QuadTree      # Spatial index of map feature bounding boxes
+- MapViewport   # Pan, zoom and cull map features for display
+
+Map features live in "world" units, which are decimal degrees
+of longitude (x, increasing to the east) and latitude (y, here
+increasing to the south so that it matches screen coordinates).
+The viewport maps a window of world space onto a screen rectangle,
+such as the GAMEMAP grid box, and returns only the features that
+intersect it and are big enough on screen to be worth drawing.
+
+Features are loaded from MAP, GRID_X_MAP and MAP_X_MAP query results
+(dict of lists, as returned by io_db.DataBase selects). Nothing here
+depends on PyGame, so drawing is left to the caller.
+
+Run this module directly for a culling benchmark.
+"""
+
+import random
+import time
+
+from pprint import pprint as pp     # noqa: F401
+
+
+class QuadTree(object):
+    """Region quadtree of axis-aligned bounding boxes.
+
+    A box is stored in the deepest node that fully contains it.
+    Boxes that straddle a split line stay in the parent node.
+    Boxes are (x, y, w, h) tuples in world units.
+    """
+    MAX_ITEMS: int = 16
+    MAX_DEPTH: int = 12
+
+    def __init__(self,
+                 p_bounds: tuple,
+                 p_depth: int = 0):
+        """
+        :args:
+        - p_bounds: (x, y, w, h) world area covered by this node
+        - p_depth: depth of this node; root is zero
+        """
+        self.bounds = p_bounds
+        self.depth = p_depth
+        self.items: list = []
+        self.kids: list = []
+
+    @classmethod
+    def contains(cls,
+                 p_outer: tuple,
+                 p_inner: tuple) -> bool:
+        """Return True if box outer fully contains box inner."""
+        return (p_inner[0] >= p_outer[0] and
+                p_inner[1] >= p_outer[1] and
+                p_inner[0] + p_inner[2] <= p_outer[0] + p_outer[2] and
+                p_inner[1] + p_inner[3] <= p_outer[1] + p_outer[3])
+
+    @classmethod
+    def intersects(cls,
+                   p_a: tuple,
+                   p_b: tuple) -> bool:
+        """Return True if box a and box b overlap or touch."""
+        return (p_a[0] <= p_b[0] + p_b[2] and
+                p_b[0] <= p_a[0] + p_a[2] and
+                p_a[1] <= p_b[1] + p_b[3] and
+                p_b[1] <= p_a[1] + p_a[3])
+
+    def split(self):
+        """Create four child nodes and push down what fits."""
+        x, y, w, h = self.bounds
+        hw, hh = w / 2, h / 2
+        self.kids = [QuadTree((x, y, hw, hh), self.depth + 1),
+                     QuadTree((x + hw, y, hw, hh), self.depth + 1),
+                     QuadTree((x, y + hh, hw, hh), self.depth + 1),
+                     QuadTree((x + hw, y + hh, hw, hh), self.depth + 1)]
+        items = self.items
+        self.items = []
+        for item in items:
+            self.insert(item[0], item[1])
+
+    def insert(self,
+               p_fid,
+               p_box: tuple):
+        """Add a feature ID and its bounding box to the tree.
+        :args:
+        - p_fid: feature ID, any hashable
+        - p_box: (x, y, w, h) bounding box in world units
+        """
+        node = self
+        while True:
+            if node.kids:
+                for kid in node.kids:
+                    if QuadTree.contains(kid.bounds, p_box):
+                        node = kid
+                        break
+                else:
+                    node.items.append((p_fid, p_box))
+                    return
+            else:
+                node.items.append((p_fid, p_box))
+                if (len(node.items) > QuadTree.MAX_ITEMS and
+                        node.depth < QuadTree.MAX_DEPTH):
+                    node.split()
+                return
+
+    def query(self,
+              p_view: tuple,
+              p_min_size: float = 0.0) -> list:
+        """Return (fid, box) for every box intersecting the view.
+        Subtrees whose whole area is smaller than p_min_size are
+        skipped, since nothing stored in them can be bigger.
+        :args:
+        - p_view: (x, y, w, h) area to search, world units
+        - p_min_size: skip boxes whose larger side is below this
+        """
+        found = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not QuadTree.intersects(node.bounds, p_view):
+                continue
+            if max(node.bounds[2], node.bounds[3]) < p_min_size:
+                continue
+            for fid, box in node.items:
+                if (max(box[2], box[3]) >= p_min_size and
+                        QuadTree.intersects(box, p_view)):
+                    found.append((fid, box))
+            stack.extend(node.kids)
+        return found
+
+
+class MapViewport(object):
+    """Continuous pan and zoom over map features much larger
+    than the screen.
+
+    - zoom is in screen pixels per world unit
+    - center is the world point shown at the middle of the screen
+    - visible() returns screen rects for features in view, culled
+      by level of detail, and is cached until the view changes
+    """
+    MIN_PX: float = 2.0     # smallest feature worth drawing, px
+    ZOOM_STEP: float = 1.25
+
+    def __init__(self,
+                 p_screen: tuple,
+                 p_world: tuple = (-180.0, -90.0, 360.0, 180.0)):
+        """
+        :args:
+        - p_screen: (x, y, w, h) screen rect to draw into, px
+        - p_world: (x, y, w, h) world bounds for the index
+        """
+        self.screen = p_screen
+        self.world = p_world
+        self.features: dict = dict()
+        self.index = QuadTree(p_world)
+        self.center = (p_world[0] + p_world[2] / 2,
+                       p_world[1] + p_world[3] / 2)
+        self.zoom = min(p_screen[2] / p_world[2], p_screen[3] / p_world[3])
+        self.zoom_min = self.zoom / 4
+        self.zoom_max = self.zoom * 4096
+        self._cache_key: tuple = ()
+        self._cache: list = []
+
+    # Feature loading
+    # ==============================================================
+    def add_feature(self,
+                    p_fid,
+                    p_box: tuple,
+                    p_data: dict = {}):
+        """Add one feature to the index.
+        :args:
+        - p_fid: unique feature ID
+        - p_box: (x, y, w, h) in world units
+        - p_data: attributes used for drawing, e.g. type, name
+        """
+        self.features[p_fid] = {'box': p_box, **p_data}
+        self.index.insert(p_fid, p_box)
+        self._cache_key = ()
+
+    def load_maps(self,
+                  p_recs: dict):
+        """Add a feature for each MAP record with a geo location.
+        :args:
+        - p_recs: dict of lists from SELECT_ALL_MAP
+        """
+        if not p_recs or p_recs.get('map_nm_pk') is None:
+            return
+        for i, map_nm in enumerate(p_recs['map_nm_pk']):
+            north = float(p_recs['geo_map_loc_latitude_north_dg'][i])
+            south = float(p_recs['geo_map_loc_latitude_south_dg'][i])
+            east = float(p_recs['geo_map_loc_longitude_east_dg'][i])
+            west = float(p_recs['geo_map_loc_longitude_west_dg'][i])
+            self.add_feature(
+                map_nm, (west, -north, east - west, north - south),
+                {'type': 'map',
+                 'name': map_nm,
+                 'container': p_recs['container_map_nm_fk'][i],
+                 'touches': []})
+
+    def load_map_links(self,
+                       p_recs: dict):
+        """Record borders/overlaps from MAP_X_MAP on loaded maps.
+        :args:
+        - p_recs: dict of lists from SELECT_ALL_MAP_X_MAP
+        """
+        if not p_recs or p_recs.get('map_nm_1_fk') is None:
+            return
+        for i, map_1 in enumerate(p_recs['map_nm_1_fk']):
+            map_2 = p_recs['map_nm_2_fk'][i]
+            touch = p_recs['touch_type'][i]
+            if map_1 in self.features and map_2 in self.features:
+                self.features[map_1]['touches'].append((map_2, touch))
+                self.features[map_2]['touches'].append((map_1, touch))
+
+    def load_grids(self,
+                   p_grid_recs: dict,
+                   p_link_recs: dict):
+        """Add a grid-lines feature over each map that has a grid.
+        :args:
+        - p_grid_recs: dict of lists from SELECT_ALL_GRID
+        - p_link_recs: dict of lists from SELECT_ALL_GRID_X_MAP
+        """
+        if (not p_grid_recs or p_grid_recs.get('grid_nm_pk') is None or
+                not p_link_recs or p_link_recs.get('grid_nm_fk') is None):
+            return
+        grids = {nm: (p_grid_recs['row_cnt'][i], p_grid_recs['col_cnt'][i])
+                 for i, nm in enumerate(p_grid_recs['grid_nm_pk'])}
+        for i, grid_nm in enumerate(p_link_recs['grid_nm_fk']):
+            map_nm = p_link_recs['map_nm_fk'][i]
+            if grid_nm in grids and map_nm in self.features:
+                rows, cols = grids[grid_nm]
+                self.add_feature(
+                    f"{grid_nm}~{map_nm}", self.features[map_nm]['box'],
+                    {'type': 'grid', 'name': grid_nm,
+                     'rows': int(rows), 'cols': int(cols)})
+
+    # View control
+    # ==============================================================
+    def fit(self,
+            p_box: tuple):
+        """Center and zoom so a world box fills the screen.
+        :args:
+        - p_box: (x, y, w, h) in world units
+        """
+        self.center = (p_box[0] + p_box[2] / 2, p_box[1] + p_box[3] / 2)
+        if p_box[2] > 0 and p_box[3] > 0:
+            self.zoom = min(self.screen[2] / p_box[2],
+                            self.screen[3] / p_box[3])
+            self.zoom = min(max(self.zoom, self.zoom_min), self.zoom_max)
+
+    def pan(self,
+            p_dx_px: float,
+            p_dy_px: float):
+        """Move the view by a screen distance, e.g. a mouse drag.
+        Dragging right moves the map right, i.e. looks further west.
+        :args:
+        - p_dx_px, p_dy_px: distance moved in pixels
+        """
+        self.center = (self.center[0] - p_dx_px / self.zoom,
+                       self.center[1] - p_dy_px / self.zoom)
+
+    def zoom_at(self,
+                p_steps: float,
+                p_screen_pt: tuple = ()):
+        """Zoom in (steps > 0) or out (steps < 0), keeping the
+        world point under p_screen_pt fixed on screen.
+        :args:
+        - p_steps: number of zoom steps, e.g. mouse wheel clicks
+        - p_screen_pt: (x, y) px; defaults to screen center
+        """
+        if not p_screen_pt:
+            p_screen_pt = (self.screen[0] + self.screen[2] / 2,
+                           self.screen[1] + self.screen[3] / 2)
+        anchor = self.screen_to_world(p_screen_pt)
+        zoom = self.zoom * (MapViewport.ZOOM_STEP ** p_steps)
+        self.zoom = min(max(zoom, self.zoom_min), self.zoom_max)
+        self.center = (
+            anchor[0] - (p_screen_pt[0] - self.screen[0] -
+                         self.screen[2] / 2) / self.zoom,
+            anchor[1] - (p_screen_pt[1] - self.screen[1] -
+                         self.screen[3] / 2) / self.zoom)
+
+    # Coordinate transforms
+    # ==============================================================
+    def view_box(self) -> tuple:
+        """Return the world (x, y, w, h) currently on screen."""
+        w = self.screen[2] / self.zoom
+        h = self.screen[3] / self.zoom
+        return (self.center[0] - w / 2, self.center[1] - h / 2, w, h)
+
+    def screen_to_world(self,
+                        p_pt: tuple) -> tuple:
+        """Convert a screen (x, y) px to world units."""
+        view = self.view_box()
+        return (view[0] + (p_pt[0] - self.screen[0]) / self.zoom,
+                view[1] + (p_pt[1] - self.screen[1]) / self.zoom)
+
+    def world_to_screen(self,
+                        p_box: tuple) -> tuple:
+        """Convert a world (x, y, w, h) box to screen px."""
+        view = self.view_box()
+        return (self.screen[0] + (p_box[0] - view[0]) * self.zoom,
+                self.screen[1] + (p_box[1] - view[1]) * self.zoom,
+                p_box[2] * self.zoom,
+                p_box[3] * self.zoom)
+
+    # Culling
+    # ==============================================================
+    def visible(self) -> list:
+        """Return (fid, screen box) for features to draw now.
+        Features smaller than MIN_PX on screen are dropped; that is
+        the level-of-detail rule. Results are ordered largest first
+        so that smaller features are drawn on top.
+        The list is reused until the center or zoom changes.
+        """
+        key = (self.center, self.zoom)
+        if key != self._cache_key:
+            found = self.index.query(self.view_box(),
+                                     MapViewport.MIN_PX / self.zoom)
+            found.sort(key=lambda f: f[1][2] * f[1][3], reverse=True)
+            self._cache = [(fid, self.world_to_screen(box))
+                           for fid, box in found]
+            self._cache_key = key
+        return self._cache
+
+
+def benchmark(p_count: int = 100000,
+              p_frames: int = 300):
+    """Time index build and per-frame culling on synthetic features.
+    Simulates a pan/zoom sequence at regional scale over p_count
+    random map features, most of them small, like towns and cells.
+    A frame budget at 30 FPS is about 33 ms.
+    """
+    rnd = random.Random(7)
+    view = MapViewport((0, 0, 1600, 1000))
+    t0 = time.perf_counter()
+    for fid in range(p_count):
+        size = rnd.choice((0.01, 0.05, 0.2, 1.0, 5.0))
+        view.add_feature(fid, (rnd.uniform(-180, 180 - size),
+                               rnd.uniform(-90, 90 - size),
+                               size, size))
+    t_build = time.perf_counter() - t0
+    view.fit((-15.0, -10.0, 30.0, 20.0))
+    counts = []
+    t0 = time.perf_counter()
+    for frame in range(p_frames):
+        view.zoom_at(0.05 if (frame // 60) % 2 == 0 else -0.05)
+        view.pan(3, 2)
+        counts.append(len(view.visible()))
+    t_frames = time.perf_counter() - t0
+    pp({'features': p_count,
+        'build_sec': round(t_build, 3),
+        'avg_cull_ms': round(t_frames / p_frames * 1000, 3),
+        'max_visible': max(counts),
+        'avg_visible': round(sum(counts) / len(counts))})
+
+
+if __name__ == '__main__':
+    benchmark()
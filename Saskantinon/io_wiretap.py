@@ -12,7 +12,8 @@ import uuid
 import zlib
 
 from datetime import datetime, timedelta, timezone
-from os import path
+from os import path, replace
+from pathlib import Path
 from pprint import pprint as pp   # noqa: F401
 
 from io_file import FileIO    # type: ignore
@@ -51,7 +52,7 @@ class WireTap(object):
         creating the appropriate directories.
         - log_level
         - log_dir_nm
-        - mon_dir_nm (not used yet)
+        - mon_dir_nm
         """
         self.llvl = {
             "CRITICAL": 50,
@@ -84,7 +85,7 @@ class WireTap(object):
         self.log_dir_nm = "/dev/shm/saskan/cache/log"
         self.log_level = self.llvl["DEBUG"]
         # self.log_level = self.llvl["NOTSET"]
-        self.mon_dir_nm = "/dev/shm/saskan/cache/mon"   # not used yet
+        self.mon_dir_nm = "/dev/shm/saskan/cache/mon"
 
     # Helper functions
     # =========================================================================
@@ -267,6 +268,39 @@ class WireTap(object):
                     self.log_level <= self.llvl["DEBUG"]):
                 write_log('DEBUG', msg)
 
+    # Monitor function
+    # ==============================================================
+    def monitor(self,
+                p_name: str,
+                p_data: dict,
+                p_expire: int = 1) -> str:
+        """Write a metrics snapshot to the monitor namespace.
+        Written to a temp name, then renamed, so readers never
+        see a partial record. Then the older records for p_name,
+        and any expired mon~ records, are removed, so there is one
+        current record per name.
+
+        Args:
+        - p_name: what is being monitored, e.g. "sv_server_52010"
+        - p_data: JSON-serializable metrics
+        - p_expire: hours until the record may be purged
+        Return: path of the record written
+        """
+        Path(self.mon_dir_nm).mkdir(parents=True, exist_ok=True)
+        mon_dt = WireTap.get_iso_timestamp(datetime.utcnow())
+        expire_dt = WireTap.set_expire_dt(p_expire)
+        rec_nm = path.join(
+            self.mon_dir_nm,
+            f"mon~{p_name}~{mon_dt}~{expire_dt}~{WireTap.get_token(16)}")
+        FI.write_file(rec_nm + ".tmp", json.dumps(p_data))
+        replace(rec_nm + ".tmp", rec_nm)
+        for key in WireTap.find_keys(self.mon_dir_nm, "mon~*"):
+            parts = key.name.split("~")
+            if str(key) != rec_nm and len(parts) == 5 and\
+                    (parts[1] == p_name or parts[3] < mon_dt):
+                key.unlink(missing_ok=True)
+        return rec_nm
+
     # Generic DDL functions
     # =========================================================================
     @classmethod
@@ -274,9 +308,8 @@ class WireTap(object):
                   p_ns: str,
                   p_key_pattern: str):
         """Return keys of records that match search pattern."""
-        keys = FI.get_dir(p_ns)
-        keys = [f for f in keys if p_key_pattern in str(f)]
-        return sorted(keys)
+        return [k for k in FI.scan_dir(p_ns, p_key_pattern)
+                if not k.name.endswith(".tmp")]
 
     @classmethod
     def count_keys(cls,
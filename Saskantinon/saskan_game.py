@@ -106,8 +106,12 @@ import pickle           # remove this eventually
 # from numpy import append
 import pygame as pg
 import sys
+import time
 import webbrowser
 
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 # from dataclasses import dataclass
 from pprint import pprint as pp     # noqa: F401, format like pp for files
@@ -129,6 +133,7 @@ from io_data import SaskanRect          # type: ignore
 from io_db import DataBase              # type: ignore
 from io_file import FileIO              # type: ignore
 from io_shell import ShellIO            # type: ignore
+from io_viewport import MapViewport     # type: ignore
 
 # Constants
 # ================================================
@@ -246,7 +251,29 @@ class GameData(object):
                             "img": None,
                             "box": None}
         self.CONSOLE_TEXT: list = list()
+        self.CONSOLE_WORK: list = list()
         self.MAP_BOX = None
+        self.VIEW = MapViewport((CDI.GRID_BOX.x, CDI.GRID_BOX.y,
+                                 CDI.GRID_BOX.w, CDI.GRID_BOX.h))
+
+    def set_map_view(self):
+        """Load MAP, MAP_X_MAP, GRID and GRID_X_MAP records into
+        the viewport index and fit the view to the loaded maps.
+        The GAMEMAP then pans and zooms over these features,
+        drawing only what is on screen.
+        """
+        maps = DB.execute_select_all('SELECT_ALL_MAP')
+        self.VIEW.load_maps(maps)
+        self.VIEW.load_map_links(DB.execute_select_all('SELECT_ALL_MAP_X_MAP'))
+        self.VIEW.load_grids(DB.execute_select_all('SELECT_ALL_GRID'),
+                             DB.execute_select_all('SELECT_ALL_GRID_X_MAP'))
+        boxes = [f['box'] for f in self.VIEW.features.values()]
+        if boxes:
+            left = min(b[0] for b in boxes)
+            top = min(b[1] for b in boxes)
+            self.VIEW.fit((left, top,
+                           max(b[0] + b[2] for b in boxes) - left,
+                           max(b[1] + b[3] for b in boxes) - top))
 
     def make_grid_key(self,
                       p_col: int,
@@ -294,7 +321,7 @@ class GameData(object):
                   f"  {p_attr['name']}"]:
             rec = copy(self.CONSOLE_REC)
             rec['txt'] = t
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
 
     def set_label_name_type(self,
                             p_attr: dict):
@@ -311,7 +338,7 @@ class GameData(object):
                   f"  {p_attr['type']}"]:
             rec = copy(self.CONSOLE_REC)
             rec['txt'] = t
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
 
     def set_proper_names(self,
                          p_attr: dict):
@@ -329,12 +356,12 @@ class GameData(object):
                   f"  {p_attr['common']}"]:
             rec = copy(self.CONSOLE_REC)
             rec['txt'] = t
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
         if "other" in p_attr.keys():
             for k, v in p_attr["other"].items():
                 rec = copy(self.CONSOLE_REC)
                 rec['txt'] = f"    {k}: {v}"
-                self.CONSOLE_TEXT.append(rec)
+                self.CONSOLE_WORK.append(rec)
 
     def set_map_attr(self,
                      p_attr: dict):
@@ -353,18 +380,18 @@ class GameData(object):
                 ["top", "bottom", "left", "right"]
             rec = copy(self.CONSOLE_REC)
             rec['txt'] = CDI.DASH16
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
             rec = copy(self.CONSOLE_REC)
             rec["txt"] =\
                 f"{p_attr[ky]['label']}:"
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
             for s in sub_k:
                 rec = copy(self.CONSOLE_REC)
                 rec["txt"] =\
                     f"  {p_attr[ky][s]['label']}:  " +\
                     f"{p_attr[ky][s]['amt']} " +\
                     f"{p_attr[ky]['unit']}"
-                self.CONSOLE_TEXT.append(rec)
+                self.CONSOLE_WORK.append(rec)
 
     def set_contains_attr(self,
                           p_attr: dict):
@@ -378,36 +405,36 @@ class GameData(object):
         """
         rec = copy(self.CONSOLE_REC)
         rec["txt"] = CDI.DASH16
-        self.CONSOLE_TEXT.append(rec)
+        self.CONSOLE_WORK.append(rec)
         rec = copy(self.CONSOLE_REC)
         rec["txt"] = f"{p_attr['label']}:"
-        self.CONSOLE_TEXT.append(rec)
+        self.CONSOLE_WORK.append(rec)
 
         if "sub-region" in p_attr.keys():
             rec = copy(self.CONSOLE_REC)
             rec["txt"] =\
                 f"  {p_attr['sub-region']['label']}:"
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
             for n in p_attr["sub-region"]["names"]:
                 rec = copy(self.CONSOLE_REC)
                 rec["txt"] = f"    {n}"
-                self.CONSOLE_TEXT.append(rec)
+                self.CONSOLE_WORK.append(rec)
 
         if "movement" in p_attr.keys():
             # roads, waterways, rivers and lakes
             rec = copy(self.CONSOLE_REC)
             rec["txt"] = f"  {p_attr['movement']['label']}:"
-            self.CONSOLE_TEXT.append(rec)
+            self.CONSOLE_WORK.append(rec)
             attr = {k: v for k, v in p_attr["movement"].items()
                     if k != "label"}
             for _, v in attr.items():
                 rec = copy(self.CONSOLE_REC)
                 rec["txt"] = f"    {v['label']}:"
-                self.CONSOLE_TEXT.append(rec)
+                self.CONSOLE_WORK.append(rec)
                 for n in v["names"]:
                     rec = copy(self.CONSOLE_REC)
                     rec["txt"] = f"      {n}"
-                    self.CONSOLE_TEXT.append(rec)
+                    self.CONSOLE_WORK.append(rec)
 
     # Data rendering methods for CDI.CONSOLE
     # ==================================
@@ -437,11 +464,25 @@ class GameData(object):
 
             pp(("ix: ", ix, "self.CONSOLE_TEXT[ix]: ", self.CONSOLE_TEXT[ix]))
 
-    def set_console_text(self):
+    def post_console_text(self,
+                          p_lines: list):
+        """Swap in newly formatted console lines and render them.
+        Called on the main loop thread, at a frame boundary.
+        :args:
+        - p_lines (list): CONSOLE_REC-style dicts from set_console_text()
+        """
+        self.CONSOLE_TEXT = p_lines
+        self.render_text_lines()
+
+    def set_console_text(self) -> list:
         """Format text lines for display in CDI.CONSOLE.
         - "catg" identifies source of config data to format.
         - "item" identifies type of data to format.
 
+        Lines are built in CONSOLE_WORK, not CONSOLE_TEXT, so this
+        can run on a worker thread while the current console is drawn.
+        Pass the returned list to post_console_text() to display it.
+
         @TODO:
         - Move the geo data, etc. into a database.
         - May want to revisit, optimize the methods for formatting
@@ -451,7 +492,7 @@ class GameData(object):
               the user clicks on a menu item. No point in persisting to DB.
         - Use config files only for install-level customizations, overrides.
         """
-        self.CONSOLE_TEXT.clear()
+        self.CONSOLE_WORK = list()
         # Contents
 
         pp((self.DATASRC["catg"], self.DATASRC["item"]))
@@ -471,7 +512,7 @@ class GameData(object):
                 self.set_map_attr(ci["map"])
             if "contains" in ci.keys():
                 self.set_contains_attr(ci["contains"])
-            self.render_text_lines()
+        return self.CONSOLE_WORK
 
     def compute_map_scale(self,
                           p_attr: dict):
@@ -479,11 +520,13 @@ class GameData(object):
         :attr:
         - p_attr (dict): 'map' data for the "Saskan Lands" region from
             the saskan_geo.json file.
-        :sets:
-        - CDI.GRID['map']: map km dimensions and scaling factors
+        :returns:
+        - (dict) map km dimensions, scaling factors and px position,
+            for CDI.GRID['map']; CDI.GRID itself is not changed
 
         - Get km dimensions for entire map rectangle
-        - Reject maps that are too big
+        - Maps that are too big are scaled down to fit the grid;
+          use GDAT.VIEW to pan and zoom over them.
         - Divide g km by m km to get # of grid-cells for map box
             - This should be a float.
         - Multiply # of grid-cells in the map box by px per grid-cell
@@ -507,18 +550,21 @@ class GameData(object):
         map['ln']['km'] =\
             {'w': round(int(p_attr["distance"]["width"]["amt"])),
              'h': round(int(p_attr["distance"]["height"]["amt"]))}
-        if map['ln']['km']['w'] > CDI.G_LNS_KM_W:
-            err = f"Map km w {map['w']} > grid km w {CDI.G_LNS_KM_W}"
-        if map['ln']['km']['h'] > CDI.G_LNS_KM_H:
-            err = f"Map km h {map['h']} > grid km h {CDI.G_LNS_KM_H}"
+        if map['ln']['km']['w'] <= 0 or map['ln']['km']['h'] <= 0:
+            err = f"Map km w, h {map['ln']['km']} must be > 0"
         if err != "":
             raise ValueError(err)
-        # Verified that the map rect is smaller than the grid rect.
         # Compute a ratio of map to grid.
         # Divide map km w, h by grid km w, h
+        # If the map is bigger than the grid, shrink both ratios
+        #  by the same factor so the map fits and keeps its shape.
+        map['ln']['ratio'] =\
+            {'w': map['ln']['km']['w'] / CDI.G_LNS_KM_W,
+             'h': map['ln']['km']['h'] / CDI.G_LNS_KM_H}
+        fit = max(1.0, map['ln']['ratio']['w'], map['ln']['ratio']['h'])
         map['ln']['ratio'] =\
-            {'w': round((map['ln']['km']['w'] / CDI.G_LNS_KM_W), 4),
-             'h': round((map['ln']['km']['h'] / CDI.G_LNS_KM_H), 4)}
+            {'w': round(map['ln']['ratio']['w'] / fit, 4),
+             'h': round(map['ln']['ratio']['h'] / fit, 4)}
         # Compute map line dimensions in px
         # Multiply grid line px w, h by map ratio w, h
         map['ln']['px'] =\
@@ -538,21 +584,24 @@ class GameData(object):
         map['ln']['px']['top'] =\
             int(round((CDI.G_LNS_PX_H - map['ln']['px']['h']) / 2) +
                      (CDI.GRID_OFFSET_Y * 4))  # not sure why, but I need this
-        CDI.GRID["map"] = map
+        return map
 
-    def set_map_grid_collisions(self):
-        """ Store collisions between CDI.GRIDS and 'map' box.
+    def set_map_grid_collisions(self,
+                                p_map_box) -> dict:
+        """ Find collisions between CDI.GRIDS cells and 'map' box.
+        Only reads the cells' boxes, so it can run on a worker thread.
+        :returns:
+        - (dict) cell key: (is_inside, overlaps)
         """
-        cells = {k: v for k, v in CDI.GRID.items() if k != "map"}
-        for ck, crec in cells.items():
-            CDI.GRID[ck]["is_inside"] = False
-            CDI.GRID[ck]["overlaps"] = False
-            if SR.rect_contains(
-                    CDI.GRID["map"]["box"], crec["box"]):
-                CDI.GRID[ck]["is_inside"] = True
-            elif SR.rect_overlaps(
-                    CDI.GRID["map"]["box"], crec["box"]):
-                CDI.GRID[ck]["overlaps"] = True
+        collisions: dict = dict()
+        for ck, crec in list(CDI.GRID.items()):
+            if ck == "map":
+                continue
+            is_inside = SR.rect_contains(p_map_box, crec["box"])
+            collisions[ck] = (
+                is_inside,
+                not is_inside and SR.rect_overlaps(p_map_box, crec["box"]))
+        return collisions
 
     # Set "map" dimensions and other content in CDI.GRIDS
     # =================================================
@@ -568,28 +617,50 @@ class GameData(object):
         - Compute ratio, offsets of map to g_ width & height.
         - Define saskan rect and pygame box for the map
         - Do collision checks between the map box and grid cells
+        :returns:
+        - (tuple) map dict, collisions dict; see post_map_grid()
         """
-        self.compute_map_scale(p_attr)
-        map_px = CDI.GRID["map"]["ln"]["px"]
-        CDI.GRID["map"]["s_rect"] = SR.make_rect(map_px["top"],
-                                                 map_px["left"],
-                                                 map_px["w"],
-                                                 map_px["h"])
-        CDI.GRID["map"]["box"] =\
-            CDI.GRID["map"]["s_rect"]["pg_rect"]
-        self.set_map_grid_collisions()
+        map = self.compute_map_scale(p_attr)
+        map_px = map["ln"]["px"]
+        map["s_rect"] = SR.make_rect(map_px["top"],
+                                     map_px["left"],
+                                     map_px["w"],
+                                     map_px["h"])
+        map["box"] = map["s_rect"]["pg_rect"]
+        return (map, self.set_map_grid_collisions(map["box"]))
 
     def set_map_grid(self):
         """
         Based on currently selected .DATASRC["catg"] and .DATASRC["item"]:
-        - assign values to CDI.GRIDS for "map".
+        - compute values for CDI.GRIDS "map" and cell collisions.
         Note:
         - For now, only "geo" data (saskan_geo.json) is handled
+
+        Runs on a worker thread and does not change CDI.GRID.
+        Pass the result to post_map_grid() to apply it.
+        :returns:
+        - (tuple) map dict, collisions dict; or None if no map
         """
         if self.DATASRC["catg"] == "geo":
             data = FI.G[self.DATASRC["catg"]][self.DATASRC["item"]]
             if "map" in data.keys():
-                self.set_gamemap_dims(data["map"])
+                return self.set_gamemap_dims(data["map"])
+        return None
+
+    def post_map_grid(self,
+                      p_result: tuple):
+        """Write map dims and cell collisions into CDI.GRID.
+        Called on the main loop thread, at a frame boundary.
+        :args:
+        - p_result (tuple): from set_map_grid(), or None
+        """
+        if p_result is None:
+            return
+        map, collisions = p_result
+        CDI.GRID["map"] = map
+        for ck, (is_inside, overlaps) in collisions.items():
+            CDI.GRID[ck]["is_inside"] = is_inside
+            CDI.GRID[ck]["overlaps"] = overlaps
 
 
 class GameMenu(object):
@@ -606,6 +677,10 @@ class GameMenu(object):
     A menu bar member is a clickable item in the menu bar.
     A menu is a vertical list of menu items.
     A menu item is a clickable item in a menu.
+
+    Clicks are resolved with a hit-test index of sorted box edges:
+    left edges for the (horizontal) menu bar, top edges for each
+    (vertical) menu. Only the open menu is checked and drawn.
     """
     def __init__(self):
         """Initialize the GameMenu object.
@@ -616,11 +691,13 @@ class GameMenu(object):
         """
         self.mbars: dict = dict()
         self.mitems: dict = dict()
+        self.hit_index: dict = dict()
+        self.open_mb_k: str = ''
+        self.sel_mi_k: tuple = ('', '')
         self.set_menu_bars()
         self.set_menus()
         self.draw_menu_bars()
-        for mb_k in self.mitems.keys():
-            self.draw_menu_items(mb_k)
+        self.draw_menu_items(self.open_mb_k)
 
     def set_menu_bars(self):
         """Set up the menu bar and the menu bar members,
@@ -759,6 +836,47 @@ class GameMenu(object):
             for mi_k, mi_v in mlist.items():
                 self.set_menu_item(mb_k, mi_k, mi_x, mi_v)
                 mi_x += 1
+        self.set_hit_index()
+
+    def set_hit_index(self):
+        """Build the hit-test index from menu bar and menu item boxes.
+        Menu bar members sit side by side, so sort them by left edge.
+        Items in a menu are stacked, so sort each menu by top edge.
+        A click is then resolved with one bisect plus one
+           collidepoint, instead of testing every box.
+        :sets:
+        - hit_index["mbar"]: ([left edges], [menu bar keys])
+        - hit_index[mb_k]: ([top edges], [menu item keys])
+        """
+        bars = sorted((v["mbox"].left, k) for k, v in self.mbars.items())
+        self.hit_index = {"mbar": ([b[0] for b in bars],
+                                   [b[1] for b in bars])}
+        for mb_k, mlist in self.mitems.items():
+            items = sorted((v["mitm_box"].top, k) for k, v in mlist.items())
+            self.hit_index[mb_k] = ([i[0] for i in items],
+                                    [i[1] for i in items])
+
+    def hit_test(self,
+                 p_index_k: str,
+                 p_mouse_loc: tuple) -> str:
+        """Find the box, if any, under the mouse.
+        :args:
+        - p_index_k: "mbar" for the menu bar, else a menu bar key
+        - p_mouse_loc: tuple (number: x, number: y)
+        :returns:
+        - (str) key of the menu bar or menu item clicked, else ''
+        """
+        edges, keys = self.hit_index[p_index_k]
+        if p_index_k == "mbar":
+            ix = bisect_right(edges, p_mouse_loc[0]) - 1
+            box = self.mbars[keys[ix]]["mbox"] if ix >= 0 else None
+        else:
+            ix = bisect_right(edges, p_mouse_loc[1]) - 1
+            box = self.mitems[p_index_k][keys[ix]]["mitm_box"]\
+                if ix >= 0 else None
+        if box is not None and box.collidepoint(p_mouse_loc):
+            return keys[ix]
+        return ''
 
     def draw_menu_bars(self):
         """ Draw each Menu Bar member.
@@ -772,16 +890,16 @@ class GameMenu(object):
         for _, mb_vals in self.mbars.items():
             pg.draw.rect(CDI.WIN, CCL.CP_BLUEPOWDER, mb_vals["mbox"], 2)
             CDI.WIN.blit(mb_vals["txt"], mb_vals["tbox"])
-        mbox = [mb_vals["mbox"] for _, mb_vals in self.mbars.items()
-                if mb_vals["selected"] is True]
-        if len(mbox) > 0:
-            pg.draw.rect(CDI.WIN, CCL.CP_GREEN, mbox[0], 2)
+        if self.open_mb_k != '':
+            pg.draw.rect(CDI.WIN, CCL.CP_GREEN,
+                         self.mbars[self.open_mb_k]["mbox"], 2)
 
     def draw_menu_items(self,
                         mb_k: str = ''):
         """ Draw the list of Menu Items for the selected menu bar.
         Draw the list bounding box, then blit each menu item using
           the text surface that matches its current status.
+        Pass open_mb_k; closed menus are not drawn at all.
         :attr:
         - mb_k: key to the menu bar member data
         :renders:
@@ -812,17 +930,13 @@ class GameMenu(object):
         - p_mouse_loc: tuple (number: x, number: y)
         :return: id of currently selected menu bar, else ''
         """
-        mbar_key = ''
-        for mb_k, v in self.mbars.items():
-            if v["mbox"].collidepoint(p_mouse_loc):
-                self.mbars[mb_k]["selected"] = True\
-                    if self.mbars[mb_k]["selected"] is False else False
-                for ky in [ky for ky in self.mbars.keys() if ky != mb_k]:
-                    self.mbars[ky]["selected"] = False
-                break
-        mb_k = [k for k, v in self.mbars.items() if v["selected"] is True]
-        mbar_key = mb_k[0] if len(mb_k) > 0 else ''
-        return mbar_key
+        mb_k = self.hit_test("mbar", p_mouse_loc)
+        if mb_k != '':
+            if self.open_mb_k not in ('', mb_k):
+                self.mbars[self.open_mb_k]["selected"] = False
+            self.mbars[mb_k]["selected"] = not self.mbars[mb_k]["selected"]
+            self.open_mb_k = mb_k if self.mbars[mb_k]["selected"] else ''
+        return self.open_mb_k
 
     def click_mitem(self,
                     p_mouse_loc: tuple,
@@ -847,13 +961,18 @@ class GameMenu(object):
         """
         selected_itm = ('', '')
         if mb_k not in (None, ''):  # if a menu bar was provided
-            for mi_k, m_itms in self.mitems[mb_k].items():
-                self.mitems[mb_k][mi_k]["selected"] = False
-                if m_itms['mitm_box'].collidepoint(p_mouse_loc):
-                    if self.mitems[mb_k][mi_k]["enabled"]:
-                        selected_itm = (mb_k, mi_k)
-                        self.mitems[mb_k][mi_k]["selected"] = True
-                    self.mbars[mb_k]["selected"] = False
+            if self.sel_mi_k[0] != '':
+                prev_mb_k, prev_mi_k = self.sel_mi_k
+                self.mitems[prev_mb_k][prev_mi_k]["selected"] = False
+                self.sel_mi_k = ('', '')
+            mi_k = self.hit_test(mb_k, p_mouse_loc)
+            if mi_k != '':
+                if self.mitems[mb_k][mi_k]["enabled"]:
+                    selected_itm = (mb_k, mi_k)
+                    self.mitems[mb_k][mi_k]["selected"] = True
+                    self.sel_mi_k = selected_itm
+                self.mbars[mb_k]["selected"] = False
+                self.open_mb_k = ''
         return selected_itm
 
     def set_menus_state(self,
@@ -869,6 +988,9 @@ class GameMenu(object):
         - mi_ky: str - menu item key
         - p_use_default: bool - use default enabled value if True
 
+        Item boxes may change with the item text, so the hit-test
+           index is rebuilt after any change here.
+
         @TODO:
         - Simplify this. May be able to get rid of it.
         """
@@ -906,6 +1028,120 @@ class GameMenu(object):
                         CDI.F_SANS_SM.render(self.mitems[mb_k][dep_ky]["name"],
                                              True, CCL.CP_BLUEPOWDER,
                                              CCL.CP_GRAY_DARK)
+        self.set_hit_index()
+
+
+class FrameScheduler(object):
+    """Pace frames and run slow work off the frame loop.
+    Instantiated as global object SCHED.
+
+    - submit() runs work (DB loads, calendar lookups, map scaling)
+      on a thread pool. Its result is passed to an apply function
+      on the main thread at the next frame boundary, so that PyGame
+      objects are only ever touched by the main loop.
+    - pace() ends a frame. While there is input, animation or
+      pending work, frames run at ACTIVE_FPS. Otherwise the loop
+      sleeps until the next event, waking at least IDLE_FPS times
+      per second.
+    - stats holds frame-budget numbers shown in the info bar.
+    """
+    ACTIVE_FPS: int = 30
+    IDLE_FPS: int = 4
+    IDLE_AFTER_MS: int = 1500
+    STATS_FRAMES: int = 60
+
+    def __init__(self):
+        """ Initialize the thread pool and frame statistics. """
+        self.pool = ThreadPoolExecutor(max_workers=2,
+                                       thread_name_prefix="saskan")
+        self.jobs: dict = dict()
+        self.budget_ms = 1000 / FrameScheduler.ACTIVE_FPS
+        self.work_ms: deque = deque(maxlen=FrameScheduler.STATS_FRAMES)
+        self.last_input_ms = pg.time.get_ticks()
+        self.frame_start = time.perf_counter()
+        self.stats = {"fps": 0.0,
+                      "work_ms": 0.0,
+                      "max_ms": 0.0,
+                      "over": 0,
+                      "jobs": 0,
+                      "idle": False}
+
+    def submit(self,
+               p_job_nm: str,
+               p_work,
+               p_apply=None,
+               *p_args) -> bool:
+        """Run a function on the thread pool.
+        Only one job of a given name runs at a time, so repeated
+        menu clicks do not pile up duplicate loads.
+        :args:
+        - p_job_nm (str): name of the job
+        - p_work (callable): function to run off the main thread
+        - p_apply (callable): called with the result on main thread
+        - p_args: positional args for p_work
+        :returns:
+        - (bool) False if a job of the same name is still running
+        """
+        if p_job_nm in self.jobs:
+            return False
+        self.jobs[p_job_nm] = (self.pool.submit(p_work, *p_args), p_apply)
+        return True
+
+    def apply_done(self):
+        """Hand results of finished jobs to their apply functions.
+        Errors raised by a job are re-raised here, on the main thread.
+        """
+        done = [k for k, (f, _) in self.jobs.items() if f.done()]
+        for job_nm in done:
+            future, apply = self.jobs.pop(job_nm)
+            result = future.result()
+            if apply is not None:
+                apply(result)
+
+    def note_input(self):
+        """Record that an input event arrived on this frame. """
+        self.last_input_ms = pg.time.get_ticks()
+
+    def is_idle(self,
+                p_animating: bool) -> bool:
+        """Return True if nothing needs frames at the active rate.
+        :args:
+        - p_animating (bool): True if game animation is running
+        """
+        return (not p_animating and
+                not self.jobs and
+                pg.time.get_ticks() - self.last_input_ms >
+                FrameScheduler.IDLE_AFTER_MS)
+
+    def pace(self,
+             p_animating: bool):
+        """End the frame: record work time, then wait for the next.
+        When idle, block on the event queue instead of polling;
+        an event wakes the loop at once and is put back on the queue.
+        :args:
+        - p_animating (bool): True if game animation is running
+        """
+        self.work_ms.append((time.perf_counter() - self.frame_start) * 1000)
+        idle = self.is_idle(p_animating)
+        if idle:
+            event = pg.event.wait(1000 // FrameScheduler.IDLE_FPS)
+            if event.type != pg.NOEVENT:
+                pg.event.post(event)
+            CDI.TIMER.tick()
+        else:
+            CDI.TIMER.tick(FrameScheduler.ACTIVE_FPS)
+        self.frame_start = time.perf_counter()
+        self.stats = {
+            "fps": round(CDI.TIMER.get_fps(), 1),
+            "work_ms": round(sum(self.work_ms) / len(self.work_ms), 1),
+            "max_ms": round(max(self.work_ms), 1),
+            "over": len([w for w in self.work_ms if w > self.budget_ms]),
+            "jobs": len(self.jobs),
+            "idle": idle}
+
+    def shutdown(self):
+        """Stop the pool without waiting on jobs still running. """
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
 
 class InfoBar(object):
@@ -926,7 +1162,13 @@ class InfoBar(object):
         self.status_text = (
             "Frame: " + str(self.info_status["frame_cnt"]) +
             "    | Mouse: " + str(self.info_status["mouse_loc"]) +
-            "    | Grid: " + str(self.info_status["grid_loc"]))
+            "    | Grid: " + str(self.info_status["grid_loc"]) +
+            "    | FPS: " + str(SCHED.stats["fps"]) +
+            ("  idle" if SCHED.stats["idle"] else "") +
+            "  ms: " + str(SCHED.stats["work_ms"]) +
+            "/" + str(SCHED.stats["max_ms"]) +
+            "  over: " + str(SCHED.stats["over"]) +
+            "  jobs: " + str(SCHED.stats["jobs"]))
 
     def draw(self):
         """ Draw Info Bar.
@@ -1029,6 +1271,32 @@ class GameMap(object):
         # Draw map box with thick border
         if GDAT.MAP_BOX is not None:
             pg.draw.rect(CDI.WIN, CCL.CP_PALEPINK, GDAT.MAP_BOX, 5)
+        self.draw_view()
+
+    def draw_view(self):
+        """Draw map and grid features that are inside the viewport.
+        Culling and level of detail are handled by GDAT.VIEW, so
+        the cost of a frame depends on what is on screen, not on
+        the size of the map data.
+        """
+        CDI.WIN.set_clip(CDI.GRID_BOX)
+        for fid, box in GDAT.VIEW.visible():
+            feature = GDAT.VIEW.features[fid]
+            rect = pg.Rect(box)
+            if feature['type'] == 'grid':
+                if (rect.w / max(feature['cols'], 1) >= GDAT.VIEW.MIN_PX and
+                        rect.h / max(feature['rows'], 1) >= GDAT.VIEW.MIN_PX):
+                    for c in range(1, feature['cols']):
+                        x = rect.x + rect.w * c / feature['cols']
+                        pg.draw.line(CDI.WIN, CCL.CP_SILVER,
+                                     (x, rect.top), (x, rect.bottom))
+                    for r in range(1, feature['rows']):
+                        y = rect.y + rect.h * r / feature['rows']
+                        pg.draw.line(CDI.WIN, CCL.CP_SILVER,
+                                     (rect.left, y), (rect.right, y))
+            else:
+                pg.draw.rect(CDI.WIN, CCL.CP_PALEPINK, rect, 1)
+        CDI.WIN.set_clip(None)
 
     def draw_hover_cell(self,
                         p_grid_loc: str):
@@ -1156,6 +1424,8 @@ class SaskanGame(object):
         """
         self.MOUSEDOWN = False
         self.MOUSECLICKED = False
+        self.PAN_KEYS = {pg.K_LEFT: (20, 0), pg.K_RIGHT: (-20, 0),
+                         pg.K_UP: (0, 20), pg.K_DOWN: (0, -20)}
 
         self.main_loop()
 
@@ -1164,6 +1434,7 @@ class SaskanGame(object):
     def exit_appl(self):
         """Exit the app cleanly.
         """
+        SCHED.shutdown()
         pg.quit()
         sys.exit()
 
@@ -1206,8 +1477,10 @@ class SaskanGame(object):
             GDAT.set_datasrc({"catg": 'geo',
                               "item": 'Saskan Lands',
                               "active": True})
-            GDAT.set_console_text()
-            GDAT.set_map_grid()
+            SCHED.submit("console_text", GDAT.set_console_text,
+                         GDAT.post_console_text)
+            SCHED.submit("map_grid", GDAT.set_map_grid,
+                         GDAT.post_map_grid)
         # elif mi_k == "status":
         #     IBAR.info_status["on"] = not IBAR.info_status["on"]
         elif mi_k == "pause_resume":
@@ -1263,7 +1536,8 @@ class SaskanGame(object):
 
     def refresh_screen(self):
         """Refresh the screen with the current state of the app.
-        30 milliseconds between each frame is the normal framerate.
+        30 frames per second is the normal framerate; SCHED drops
+        to a low idle rate when nothing is happening.
         To go into slow motion, add a wait here, but don't change
         the framerate.
 
@@ -1293,11 +1567,10 @@ class SaskanGame(object):
 
         # refresh the menus
         GMNU.draw_menu_bars()
-        for mb_k in GMNU.mitems.keys():
-            GMNU.draw_menu_items(mb_k)
+        GMNU.draw_menu_items(GMNU.open_mb_k)
 
         pg.display.update()
-        CDI.TIMER.tick(30)
+        SCHED.pace(not IBAR.info_status["frozen"])
 
     # Main Loop
     # ==============================================================
@@ -1308,15 +1581,29 @@ class SaskanGame(object):
         - Handle menu click events
         - Handle text input events
         - Handle other click events
+        - Apply results of background jobs
         - Refresh the screen
         """
         while True:
+            SCHED.apply_done()
             self.track_state()
 
             for event in pg.event.get():
 
+                SCHED.note_input()
                 self.check_exit_appl(event)
 
+                # Pan and zoom the map view
+                #  wheel zooms at the cursor, right-drag or arrows pan
+                if event.type == pg.MOUSEWHEEL:
+                    GDAT.VIEW.zoom_at(event.y, pg.mouse.get_pos())
+                if (event.type == pg.MOUSEMOTION and
+                        event.buttons[2]):
+                    GDAT.VIEW.pan(event.rel[0], event.rel[1])
+                if (event.type == pg.KEYDOWN and
+                        event.key in self.PAN_KEYS):
+                    GDAT.VIEW.pan(*self.PAN_KEYS[event.key])
+
                 # Avoid flicker due to mouse button down/up events
                 if event.type == pg.MOUSEBUTTONDOWN:  # pyright: ignore[reportUnboundVariable] # noqa: E501
                     self.MOUSEDOWN = True
@@ -1350,7 +1637,9 @@ class SaskanGame(object):
 if __name__ == '__main__':
     """Cache data and resources in memory and launch the app."""
 
+    SCHED = FrameScheduler()
     GDAT = GameData()
+    GDAT.set_map_view()
     GMNU = GameMenu()
     IBAR = InfoBar()
     CDI.WHTM = HtmlDisplay()  # for Help windows
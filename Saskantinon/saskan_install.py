@@ -15,6 +15,7 @@ e.g. (saskan) ~/../Saskantinon/saskan_install
 - Prototype/test using haproxy to load balance servers.
 - Simplify the proliferation of ports. I shouldn't need so many.
 """
+import asyncio
 import json
 
 # import os
@@ -29,6 +30,8 @@ from io_file import FileIO  # type: ignore
 from io_shell import ShellIO  # type: ignore
 from io_wiretap import WireTap  # type: ignore
 from saskan_report import SaskanReport  # type: ignore
+from sv_proxy import get_proxies  # type: ignore
+from sv_supervisor import SvcSupervisor  # type: ignore
 
 FI = FileIO()
 SI = ShellIO()
@@ -156,21 +159,23 @@ class SaskanInstall(object):
             FI.make_executable(tgt_file)
 
     def get_free_ports(self, p_next_port: int, p_req_port_cnt: int) -> tuple:
-        """Get a set of free ports
+        """Get a set of free ports.
+        Ports in use are read from /proc/net/tcp(6) once; if that is
+        not available, each candidate port is probed with a bind.
         :args:
         - next_port: next port to check
         - p_req_port_cnt: number of ports to allocate
         :return: (list: assigned ports,
                   int: next port number to check)
         """
-        # print(f"Selecting {p_req_port_cnt} ports starting at {p_next_port}")
-        _, net_stat_result = SI.run_cmd(["netstat -lant"])
+        used_ports = SI.get_used_ports()
         ports: list = list()
         while len(ports) < p_req_port_cnt:
-            if (
-                str(p_next_port) not in net_stat_result
-                and str(p_next_port) not in ports
-            ):
+            if used_ports is None:
+                is_free = SI.is_port_free(p_next_port)
+            else:
+                is_free = p_next_port not in used_ports
+            if is_free and p_next_port not in ports:
                 ports.append(p_next_port)
             p_next_port += 1
         return (ports, p_next_port)
@@ -232,10 +237,13 @@ class SaskanInstall(object):
                             all_ports += ports
         self.set_firewall(all_ports)
 
-    def save_svc_config(self):
-        """Save service config data to a file."""
+    def save_svc_config(self, p_svc: dict = None):
+        """Save service config data to a file.
+        :args:
+        - p_svc: service schema to save, default FI.S
+        """
         cdir = path.join(self.APP, FI.D["ADIRS"]["CFG"], "m_svc.json")
-        FI.write_file(cdir, json.dumps(FI.S))
+        FI.write_file(cdir, json.dumps(FI.S if p_svc is None else p_svc))
 
     def create_load_bals(self):
         """Create one or more NGINX load balancer config files.
@@ -248,6 +256,8 @@ class SaskanInstall(object):
         - Eventually want add SSL/letsencrypt support.
         - Include comments in the NGINX files.
         - Use HAProxy instead of NGINX.
+        - run_load_bals serves the same listen ports with sv_proxy,
+          no nginx or root needed.
         """
         host = FI.S["resource"]["host"]
         lb_confs: list = list()
@@ -382,7 +392,37 @@ www-data    5108    5106  0 18:45 ?        00:00:00 nginx: worker process
         #     FI.make_link(path.join(available, lbc_file_nm),
         #                 path.join(enabled, lbc_file_nm))
 
-    def start_servers(self, svc):
+    def run_load_bals(self, svc, p_strategy: str = "least_conn"):
+        """Run a ChannelProxy on each channel load_bal port, in the
+        foreground, in place of the nginx stream configs.
+        Each proxy spreads connections over the channel's twin servers
+        and stops sending to any that fail a health check.
+
+        :Args:
+        - svc: service schema as filled in by start_servers (or the
+            saved m_svc.json), so backends match the running servers
+        - p_strategy: 'least_conn', or 'hash' to keep all subscribers
+            of a channel on the same server
+        """
+        proxies = get_proxies(svc, p_strategy)
+
+        async def run():
+            for proxy in proxies:
+                await proxy.start()
+                print(f"{proxy.name}: {proxy.listen.port} -> " +
+                      ", ".join(str(b.port) for b in proxy.backends))
+            try:
+                await asyncio.Event().wait()
+            finally:
+                for proxy in proxies:
+                    await proxy.stop()
+
+        try:
+            asyncio.run(run())
+        except KeyboardInterrupt:
+            print("Load balancers stopped.")
+
+    def start_servers(self, svc, p_supervise: bool = False):
         """Start a saskan_server instance for each channel.
         The server module receives messages from clients, sends them
         to router , which sends them to a message gateway (backend processors),
@@ -406,8 +446,9 @@ www-data    5108    5106  0 18:45 ?        00:00:00 nginx: worker process
         launched multiple times, sending it parameters relevant to the
         channel (topics) it is handling.
 
-        'run nohup' means it will run in the background, and will not
-        write to the terminal. The output gets written to a log file.
+        Each server runs in the background, in its own session, and
+        does not write to the terminal. The output gets written to a
+        log file.
 
         So far, it looks to me like the servers I have expect a "subscriber"
         model, where a message is simply bounced to a specified list of
@@ -440,32 +481,45 @@ www-data    5108    5106  0 18:45 ?        00:00:00 nginx: worker process
         Also, I think HAProxy is probably a better choice than Nginx
         for pure TCP load balancing.
 
+        All servers are spawned at once by SvcSupervisor, which
+        waits for each one to pass a connect-and-ping handshake on its
+        port, then prints the cold-start time for the topology. With
+        p_supervise, it stays in the foreground and restarts any
+        server that exits, backing off on repeated failures.
+        Otherwise the servers keep running on their own, as with nohup.
+
         :Args:
-        - svc: service config dictionary
+        - svc: service schema (svc_schema.json contents); ports not
+            yet assigned are taken from free ports. They are written
+            into svc and saved to m_svc.json; pass the same schema to
+            run_load_bals.
+        - p_supervise: keep running to restart crashed servers
         """
         pgm_nm = "sv_server"
         SI.kill_jobs("/" + pgm_nm)
-        # Launch new sv_server instances
         pypath = path.join(self.APP, FI.D["ADIRS"]["PY"], f"{pgm_nm}.py")
         logpath = path.join(
             FI.D["MEM"], FI.D["APP"],
             FI.D["ADIRS"]["SAV"], FI.D["NSDIRS"]["LOG"]
         )
-        for c_nm, c_meta in svc.items():
-            for p_typ in [pt for pt in c_meta.keys()
-                          if pt not in ("host", "desc")]:
-                for port in c_meta[p_typ]["port"]:
-                    SI.run_nohup_py(
-                        pypath,
-                        logpath,
-                        f"/{c_nm}/{p_typ}:{port}",
-                        c_meta["host"],
-                        port,
-                        pgm_nm,
-                    )
-        result, _ = SR.rpt_running_jobs("/" + pgm_nm)
-        print("Servers (message brokers) started or restarted:")
-        print(result)
+        services = SvcSupervisor.get_topology(svc, pypath, logpath)
+        if isinstance(svc, dict):
+            self.save_svc_config(svc)
+
+        async def run():
+            sup = SvcSupervisor()
+            report = await sup.start_all(services, p_watch=p_supervise)
+            print("Servers (message brokers) started or restarted in " +
+                  f"{report['cold_start_secs']}s:")
+            pp(report)
+            if p_supervise:
+                await asyncio.gather(*sup.watchers.values())
+            return report
+
+        try:
+            return asyncio.run(run())
+        except KeyboardInterrupt:
+            print("Supervisor stopped; servers left running.")
 
     def start_clients(self, svc):
         """Start a 'saskan_client' instance for each plan + client-type.
@@ -9,8 +9,6 @@ Saskan Admin Report Generator
   reporting functions to this module.
 """
 
-import matplotlib.pyplot as plt         # type: ignore
-import networkx as nx                   # type: ignore
 import subprocess as shl
 # import sys
 
@@ -20,9 +18,12 @@ from dataclasses import dataclass
 from pprint import pprint as pp     # noqa: F401
 
 # from io_file import FileIO          # type: ignore
+from io_lazy import lazy_import         # type: ignore
 # from io_shell import ShellIO        # type: ignore
 # from io_wiretap import WireTap      # type: ignore
 
+nx = lazy_import("networkx")
+plt = lazy_import("matplotlib.pyplot")
 # FI = FileIO()
 # SI = ShellIO()
 # WT = WireTap()
@@ -111,12 +112,15 @@ class SaskanReport(object):
                   p_N: dict,
                   p_node_nm: str):
         """Return node type for a given node name.
+        Use the node-to-type index if GraphIO provided one.
 
         :args:
         - p_N (dict): additional nodes metadata for graph object
         - p_title (str): Name of a schema/ontology, e.g. "scenes"
         - p_node_nm (str): Node name.
         """
+        if "type" in p_N:
+            return p_N["type"].get(p_node_nm)
         node_type = None
         for nt, nodes in p_N["name"].items():
             if p_node_nm in nodes:
@@ -235,13 +239,12 @@ class SaskanReport(object):
         - p_N (dict): additional node metadata for graph object
         - p_E (dict): additional edge metadata for graph object
         """
+        ntype = {n: self.get_ntype(p_N, n) for n in p_G.nodes()}
         node_sizes = [p_G.degree(n) * 23 for n in p_G.nodes()]
-        node_labels = {n: f"\n{self.get_ntype(p_N, n)}\n{n}"
-                       for n in p_G.nodes()}
+        node_labels = {n: f"\n{ntype[n]}\n{n}" for n in p_G.nodes()}
         node_colors = [p_N["color"][n] for n in p_G.nodes()]
         edge_colors = [p_E["color"][
-                        (self.get_ntype(p_N, e[0]),
-                         self.get_ntype(p_N, e[1]))].replace("0", "5")
+                        (ntype[e[0]], ntype[e[1]])].replace("0", "5")
                        for e in p_G.edges()]
         # Folks online tend to recommend graphviz for drawing graphs, but
         # I could not get graphviz to work with my environment, networkx.
@@ -0,0 +1,350 @@
+#!python
+"""
+:module:    sv_proxy.py
+:class:     ChannelProxy
+
+Load-balance channel connections across twin sv_server instances.
+Stands in for the nginx `stream` configs that
+SaskanInstall.create_load_bals writes, without root or nginx.
+
+Main behaviors:
+
+- Read the same svc_schema.json port assignments: each channel's
+  load_bal ports listen, in order, for its send / recv / duplex /
+  polling server groups, like the generated upstream blocks.
+- Pick a backend per client connection by either:
+    - least_conn: fewest open connections, ties taken in turn.
+    - hash: consistent hash of the channel named in the client's
+      first (subscribe) frame. Every subscriber to a channel lands
+      on the same server, so sv_server's in-process fan-out still
+      reaches all of them. Losing a server only moves its channels.
+- Health-check backends with the sv_server handshake every
+  HEALTH_SECS and skip failed ones. A backend that refuses a
+  connection is marked down and the next candidate is tried.
+- Relay bytes between the two sockets with asyncio Protocols. Each
+  chunk read is written straight to the other socket, with no
+  StreamReader buffering. When one side's write buffer is full,
+  reading from the other side is paused.
+"""
+import asyncio
+import bisect
+import hashlib
+import time
+from collections import namedtuple
+
+from sv_supervisor import SvcSupervisor  # type: ignore
+
+Backend = namedtuple('Backend', ['host', 'port'])
+FIRST_FRAME_MAX = 4096     # bytes allowed in a subscribe frame
+
+
+class Relay(asyncio.Protocol):
+    """One side of a proxied connection; forwards to its peer."""
+
+    def __init__(self, p_proxy, p_backend: Backend = None):
+        self.proxy = p_proxy
+        self.backend = p_backend
+        self.peer = None
+        self.transport = None
+        self.pending: list = []     # client bytes read before peer is up
+        self.pending_len = 0
+        self.bytes_in = 0
+        self.eof = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self.backend is None:
+            self.proxy.stats['accepted'] += 1
+            self.task = asyncio.ensure_future(self.proxy.connect(self))
+
+    def data_received(self, data):
+        self.bytes_in += len(data)
+        if self.peer is not None:
+            self.peer.transport.write(data)
+            return
+        self.pending.append(data)
+        self.pending_len += len(data)
+        if self.pending_len > FIRST_FRAME_MAX:
+            # Backend not up yet and the client keeps sending.
+            self.transport.pause_reading()
+        self.proxy.first_frame_seen(self)
+
+    def get_first_frame(self):
+        """Return the subscribe channel if a whole first frame has
+        arrived, b'' if not yet, or None if it is not a valid frame.
+        """
+        head = b''.join(self.pending)
+        if len(head) < 4:
+            return b''
+        size = int.from_bytes(head[:4], byteorder='big')
+        if size > FIRST_FRAME_MAX:
+            return None
+        return head[4:4 + size] if len(head) >= 4 + size else b''
+
+    def set_peer(self, p_peer):
+        """Attach the other side and flush what was read so far."""
+        self.peer = p_peer
+        p_peer.peer = self
+        if self.pending:
+            p_peer.transport.writelines(self.pending)
+            self.pending.clear()
+        self.transport.resume_reading()
+
+    def pause_writing(self):
+        if self.peer is not None:
+            self.peer.transport.pause_reading()
+
+    def resume_writing(self):
+        if self.peer is not None:
+            self.peer.transport.resume_reading()
+
+    def eof_received(self):
+        """Pass a half-close on; close once both sides are done."""
+        self.eof = True
+        if self.peer is None or self.peer.eof:
+            return False
+        if self.peer.transport.can_write_eof():
+            self.peer.transport.write_eof()
+            return True
+        return False
+
+    def connection_lost(self, exc):
+        if self.peer is not None:
+            self.peer.transport.close()
+        if self.backend is not None:
+            self.proxy.release(self.backend, self.bytes_in)
+        else:
+            self.proxy.stats['bytes_up'] += self.bytes_in
+
+
+class ChannelProxy(object):
+    """Listen on one load_bal port and spread connections over a
+    group of sv_server backends.
+    """
+
+    HEALTH_SECS = 2.0
+    VNODES = 64     # points per backend on the hash ring
+
+    def __init__(self,
+                 p_name: str,
+                 p_listen: Backend,
+                 p_backends: list,
+                 p_strategy: str = 'least_conn'):
+        """
+        :args:
+        - p_name (str): label, e.g. "avatar_motion_send"
+        - p_listen (Backend): host, port to listen on
+        - p_backends (list of Backend): servers to balance across
+        - p_strategy (str): 'least_conn' or 'hash'
+        """
+        if p_strategy not in ('least_conn', 'hash'):
+            raise ValueError(f"Unknown strategy {p_strategy}")
+        self.name = p_name
+        self.listen = p_listen
+        self.backends = [Backend(*b) for b in p_backends]
+        self.strategy = p_strategy
+        self.active = {b: 0 for b in self.backends}
+        self.healthy = {b: True for b in self.backends}
+        self.turn = 0
+        self.ring = sorted(
+            (self.get_hash(f"{b.host}:{b.port}#{v}".encode()), i)
+            for i, b in enumerate(self.backends) for v in range(self.VNODES))
+        self.ring_keys = [h for h, _ in self.ring]
+        self.stats = {'accepted': 0, 'refused': 0, 'failovers': 0,
+                      'bytes_up': 0, 'bytes_down': 0,
+                      'by_backend': {f"{b.host}:{b.port}": 0
+                                     for b in self.backends}}
+        self.server = None
+        self.health_task = None
+
+    @classmethod
+    def get_hash(cls, p_key: bytes) -> int:
+        """Stable 64-bit hash for the ring."""
+        return int.from_bytes(
+            hashlib.blake2b(p_key, digest_size=8).digest(), 'big')
+
+    def get_candidates(self, p_key: bytes = None) -> list:
+        """Return healthy backends in the order to try them.
+        If none are healthy, try them all anyway.
+        """
+        up = [b for b in self.backends if self.healthy[b]] or\
+            list(self.backends)
+        if self.strategy == 'hash':
+            order, seen = [], set()
+            i = bisect.bisect(self.ring_keys, self.get_hash(p_key))
+            for n in range(len(self.ring)):
+                b = self.backends[self.ring[(i + n) % len(self.ring)][1]]
+                if b not in seen:
+                    seen.add(b)
+                    order.append(b)
+            return [b for b in order if b in up]
+        self.turn += 1
+        n = len(up)
+        up = [up[(self.turn + k) % n] for k in range(n)]
+        return sorted(up, key=self.active.__getitem__)
+
+    def first_frame_seen(self, p_client: Relay):
+        """For hash balancing, connect once the channel is known."""
+        if self.strategy != 'hash' or p_client.peer is not None or\
+                getattr(p_client, 'key_fut', None) is None or\
+                p_client.key_fut.done():
+            return
+        key = p_client.get_first_frame()
+        if key is None:
+            p_client.key_fut.set_result(None)
+        elif key:
+            p_client.key_fut.set_result(key)
+
+    async def connect(self, p_client: Relay):
+        """Open a connection to a backend for a new client."""
+        key = None
+        if self.strategy == 'hash':
+            p_client.key_fut = asyncio.get_running_loop().create_future()
+            self.first_frame_seen(p_client)
+            try:
+                key = await asyncio.wait_for(p_client.key_fut, 10)
+            except asyncio.TimeoutError:
+                key = None
+            if key is None:
+                self.stats['refused'] += 1
+                p_client.transport.close()
+                return
+        loop = asyncio.get_running_loop()
+        for n, backend in enumerate(self.get_candidates(key)):
+            self.active[backend] += 1
+            try:
+                _, server_side = await loop.create_connection(
+                    lambda: Relay(self, backend), backend.host, backend.port)
+            except OSError:
+                self.active[backend] -= 1
+                self.healthy[backend] = False
+                self.stats['failovers'] += 1
+                continue
+            if p_client.transport.is_closing():
+                server_side.transport.close()
+                return
+            self.stats['by_backend'][f"{backend.host}:{backend.port}"] += 1
+            p_client.set_peer(server_side)
+            return
+        self.stats['refused'] += 1
+        p_client.transport.close()
+
+    def release(self, p_backend: Backend, p_bytes: int):
+        """Count a backend connection as closed."""
+        self.active[p_backend] -= 1
+        self.stats['bytes_down'] += p_bytes
+
+    async def check_health(self):
+        """Probe every backend, forever, every HEALTH_SECS."""
+        while True:
+            results = await asyncio.gather(
+                *[SvcSupervisor.probe(b.host, b.port) for b in self.backends])
+            for b, ok in zip(self.backends, results):
+                self.healthy[b] = ok
+            await asyncio.sleep(self.HEALTH_SECS)
+
+    async def start(self):
+        """Start listening and health-checking."""
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            lambda: Relay(self), self.listen.host, self.listen.port)
+        self.health_task = asyncio.create_task(self.check_health())
+
+    async def stop(self):
+        """Stop listening and health-checking."""
+        if self.health_task:
+            self.health_task.cancel()
+            await asyncio.gather(self.health_task, return_exceptions=True)
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+def get_proxies(p_svc,
+                p_strategy: str = 'least_conn',
+                p_host: str = None) -> list:
+    """Build a ChannelProxy per load_bal port in the service schema.
+    Load_bal ports are used in order for the send, recv, duplex and
+    polling groups present, as in SaskanInstall.create_load_bals.
+    :args:
+    - p_svc (dict | str): svc_schema contents or path, as passed to
+        SvcSupervisor.get_topology; unassigned ports are filled in
+        (and kept) by SvcSupervisor.assign_ports, so the backends are
+        the ports the supervisor's servers use
+    - p_strategy (str): 'least_conn' or 'hash'
+    - p_host (str): host, default resource/host
+    :returns:
+    - (list) ChannelProxy objects, not yet started
+    """
+    p_svc = SvcSupervisor.assign_ports(p_svc, p_host)
+    host = p_host or p_svc["resource"]["host"]
+    proxies: list = list()
+    for c_nm, c_meta in p_svc["channels"]["channel"].items():
+        ports = c_meta.get("port", {})
+        if "load_bal" not in ports:
+            continue
+        lb_ports = iter(ports["load_bal"]["num"])
+        for p_typ in ("send", "recv", "duplex", "polling"):
+            if p_typ in ports:
+                listen = next(lb_ports, None)
+                if listen is None:
+                    break
+                proxies.append(ChannelProxy(
+                    f"{c_nm}_{p_typ}", Backend(host, listen),
+                    [Backend(host, p) for p in ports[p_typ]["num"]],
+                    p_strategy))
+    return proxies
+
+
+def benchmark_proxy(p_count: int = 5000,
+                    p_window: int = 64,
+                    p_size: int = 256) -> dict:
+    """Compare direct connections to sv_server with going through a
+    ChannelProxy in front of it, on loopback.
+    Runs an echo responder behind the server and times sequential
+    round trips (latency) and pipelined requests (throughput).
+    Everything runs in this one process.
+    :returns:
+    - (dict) p50/p99 round trip and req/s, direct and proxied
+    """
+    from sv_sequencer import MsgRequester, start_bench_service,\
+        stop_bench_service
+
+    async def run():
+        service = await start_bench_service()
+        proxy = ChannelProxy('bench', Backend('127.0.0.1', 0),
+                             [Backend('127.0.0.1', service[1])])
+        await proxy.start()
+        proxy_port = proxy.server.sockets[0].getsockname()[1]
+        payload = b'X' * p_size
+        result = {}
+        for nm, port in (('direct', service[1]), ('proxied', proxy_port)):
+            req = MsgRequester(max_in_flight=p_window, timeout=30)
+            await req.connect('127.0.0.1', port)
+            await asyncio.sleep(0.05)
+            for _ in range(100):
+                await req.request(b'/bench', payload)
+            times = []
+            for _ in range(p_count):
+                t0 = time.perf_counter()
+                await req.request(b'/bench', payload)
+                times.append(time.perf_counter() - t0)
+            times.sort()
+            t0 = time.perf_counter()
+            await req.request_many(b'/bench', [payload] * p_count)
+            result[nm] = {
+                'p50_us': round(times[len(times) // 2] * 1e6, 1),
+                'p99_us': round(times[int(len(times) * .99)] * 1e6, 1),
+                f'req_per_sec_window_{p_window}':
+                    int(p_count / (time.perf_counter() - t0))}
+            await req.close()
+        await proxy.stop()
+        await stop_bench_service(service)
+        return result
+
+    return asyncio.run(run())
+
+
+if __name__ == '__main__':
+    from pprint import pprint
+    pprint(benchmark_proxy())
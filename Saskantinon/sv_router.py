@@ -0,0 +1,375 @@
+#!python
+"""
+:module:    sv_router.py
+:class:     PlanRouter
+
+Route service messages by plan, compiled once at startup.
+
+Main behaviors:
+
+- Compile the plan JSON (lab/services_lab/s20_plans.json) into:
+    - a dispatch table keyed by channel bytes:
+        /<plan>/<pattern>/<action>/<msg>
+      e.g. /marketplace/req_chain/mkt_ask/request
+    - a trigger graph: a {"trigger": "<action>/<msg>"} entry on an
+      action means that message also starts the action, so it is
+      delivered to the action's request channel too.
+- Check the plans against the topics JSON (s10_topics.json) and
+  reject unknown triggers and trigger cycles when compiling.
+- Route each message with one dict lookup: run any handlers
+  registered for the channel and return the channels to deliver
+  it to, with whether each one fans out to all subscribers.
+"""
+import json
+import random
+import time
+from collections import namedtuple
+from pathlib import Path
+
+PLANS_PATH = Path(__file__).resolve().parents[1] /\
+    'lab' / 'services_lab' / 's20_plans.json'
+TOPICS_PATH = PLANS_PATH.with_name('s10_topics.json')
+FAN_OUT = ('b_cast', 'pub_sub')
+
+Route = namedtuple('Route', ['plan', 'pattern', 'action', 'msg',
+                             'types', 'handlers', 'deliver'])
+
+
+class PlanRouter(object):
+    """Dispatch tables and trigger graph compiled from service plans."""
+
+    def __init__(self,
+                 p_plans=PLANS_PATH,
+                 p_topics=TOPICS_PATH):
+        """
+        :args:
+        - p_plans (str | Path | dict): plans JSON file, or its
+            already-loaded contents
+        - p_topics (str | Path | dict | None): topics JSON file or
+            contents. If None, patterns are not checked.
+        """
+        self.routes: dict = {}
+        self.triggers: dict = {}
+        self.stats = {'routed': 0, 'missed': 0, 'triggered': 0}
+        self.compile_plans(self.load_json(p_plans)['plan'],
+                           self.load_json(p_topics)['topic']
+                           if p_topics is not None else None)
+
+    @classmethod
+    def load_json(cls, p_src) -> dict:
+        """Return JSON contents from a path, or a dict as is."""
+        if isinstance(p_src, dict):
+            return p_src
+        with open(p_src, 'r') as f:
+            return json.load(f)
+
+    @classmethod
+    def get_channel(cls,
+                    p_plan: str,
+                    p_pattern: str,
+                    p_action: str,
+                    p_msg: str) -> bytes:
+        """Return the channel name for one plan message."""
+        return f'/{p_plan}/{p_pattern}/{p_action}/{p_msg}'.encode()
+
+    def compile_plans(self,
+                      p_plans: dict,
+                      p_topics: dict = None):
+        """
+        Build the dispatch table and trigger graph.
+        Trigger names are looked up in the action's own plan first,
+        then in the other plans, where they must be unique.
+        :args:
+        - p_plans (dict): {plan: {pattern: {type:, action:}}}
+        - p_topics (dict): {plan: {pattern: {desc:}}}, or None
+        :raises:
+        - ValueError on unknown topics or triggers, or a cycle
+        """
+        actions: dict = {}      # (plan, action) -> (pattern, types)
+        msgs: dict = {}         # (plan, action) -> [msg, ...]
+        trigger_of: list = []   # (plan, action, 'action/msg')
+        for plan, patterns in p_plans.items():
+            for pattern, spec in patterns.items():
+                if p_topics is not None and\
+                        pattern not in p_topics.get(plan, {}):
+                    raise ValueError(
+                        f'No topic for plan {plan}/{pattern}')
+                for action, items in spec['action'].items():
+                    actions[(plan, action)] = (pattern,
+                                               tuple(spec['type']))
+                    msgs[(plan, action)] = []
+                    for item in items:
+                        if isinstance(item, dict):
+                            trigger_of.append(
+                                (plan, action, item['trigger']))
+                        else:
+                            msgs[(plan, action)].append(item)
+        for (plan, action), (pattern, types) in actions.items():
+            for msg in msgs[(plan, action)]:
+                chan = self.get_channel(plan, pattern, action, msg)
+                self.routes[chan] = Route(plan, pattern, action, msg,
+                                          types, [], ())
+        for plan, action, trigger in trigger_of:
+            src_action, src_msg = trigger.split('/')
+            src = self.find_route(plan, src_action, src_msg, actions)
+            pattern = actions[(plan, action)][0]
+            self.triggers.setdefault(src, []).append(
+                self.get_channel(plan, pattern, action, 'request'))
+        self.check_cycles()
+        for chan, route in self.routes.items():
+            deliver = [(chan, route.pattern in FAN_OUT)] +\
+                [(tgt, self.routes[tgt].pattern in FAN_OUT)
+                 for tgt in self.triggers.get(chan, [])]
+            self.routes[chan] = route._replace(deliver=tuple(deliver))
+
+    def find_route(self,
+                   p_plan: str,
+                   p_action: str,
+                   p_msg: str,
+                   p_actions: dict) -> bytes:
+        """
+        Resolve a trigger's action/msg to a channel, preferring the
+        triggered action's own plan.
+        """
+        if (p_plan, p_action) in p_actions:
+            found = [p_plan]
+        else:
+            found = [plan for plan, action in p_actions
+                     if action == p_action]
+        if len(found) != 1:
+            raise ValueError(
+                f'Trigger {p_action}/{p_msg} in plan {p_plan} matches '
+                f'{len(found)} actions')
+        pattern = p_actions[(found[0], p_action)][0]
+        chan = self.get_channel(found[0], pattern, p_action, p_msg)
+        if chan not in self.routes:
+            raise ValueError(f'Trigger {p_action}/{p_msg} in plan '
+                             f'{p_plan} names an undefined message')
+        return chan
+
+    def check_cycles(self):
+        """
+        Raise ValueError if triggers can loop back on themselves.
+        A triggered action's request leads on to its response, so
+        the graph is followed from request to response channels.
+        """
+        def next_chans(p_chan):
+            route = self.routes[p_chan]
+            out = list(self.triggers.get(p_chan, []))
+            if route.msg == 'request':
+                out.extend(c for c, r in self.routes.items()
+                           if r.plan == route.plan and
+                           r.action == route.action and c != p_chan)
+            return out
+
+        state: dict = {}
+        for start in self.triggers:
+            if start in state:
+                continue
+            stack = [(start, iter(next_chans(start)))]
+            state[start] = 1
+            while stack:
+                chan, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    state[chan] = 2
+                    stack.pop()
+                elif state.get(child) == 1:
+                    raise ValueError(
+                        f'Trigger cycle through {child.decode()}')
+                elif child not in state:
+                    state[child] = 1
+                    stack.append((child, iter(next_chans(child))))
+
+    def get_chain(self,
+                  p_plan: str,
+                  p_action: str) -> list:
+        """
+        Return the actions that follow from p_action through
+        response triggers, in order, starting with p_action.
+        """
+        chain = [p_action]
+        seen = {p_action}
+        while True:
+            nxt = [self.routes[tgt].action
+                   for chan, tgts in self.triggers.items()
+                   for tgt in tgts
+                   if self.routes[chan].plan == p_plan and
+                   self.routes[chan].action == chain[-1] and
+                   self.routes[chan].msg == 'response' and
+                   self.routes[tgt].plan == p_plan]
+            if not nxt or nxt[0] in seen:
+                return chain
+            chain.append(nxt[0])
+            seen.add(nxt[0])
+
+    def register(self,
+                 p_channel: bytes,
+                 p_handler):
+        """
+        Call p_handler(route, data) for every message on p_channel.
+        :raises:
+        - KeyError if the channel is not in any plan
+        """
+        self.routes[p_channel].handlers.append(p_handler)
+
+    def dispatch(self,
+                 p_channel: bytes,
+                 p_data: bytes) -> tuple:
+        """
+        Route one message.
+        :args:
+        - p_channel (bytes): channel the message was sent to
+        - p_data (bytes): message payload
+        :returns:
+        - (tuple) ((channel, fan_out), ...) to deliver to. For a
+            channel not in any plan, ((p_channel, None),), so the
+            caller applies its own rule.
+        """
+        route = self.routes.get(p_channel)
+        if route is None:
+            self.stats['missed'] += 1
+            return ((p_channel, None),)
+        self.stats['routed'] += 1
+        self.stats['triggered'] += len(route.deliver) - 1
+        for handler in route.handlers:
+            handler(route, p_data)
+        return route.deliver
+
+
+def make_market_traffic(p_router: PlanRouter,
+                        p_sessions: int = 10000,
+                        p_seed: int = 42) -> list:
+    """Synthesize marketplace sessions as a list of channel names.
+    Each session starts with mkt_list, then walks the trigger chain
+    from mkt_avail. At each step it sends the request and response,
+    sometimes a log message, and may cancel and stop early.
+    """
+    rand = random.Random(p_seed)
+    chain = p_router.get_chain('marketplace', 'mkt_avail')
+    get = p_router.get_channel
+    traffic = []
+    for _ in range(p_sessions):
+        traffic += [get('marketplace', 'req_chain', 'mkt_list', 'request'),
+                    get('marketplace', 'req_chain', 'mkt_list', 'response')]
+        for action in chain:
+            traffic.append(get('marketplace', 'req_chain', action,
+                               'request'))
+            if rand.random() < 0.05 and action in ('mkt_agree', 'mkt_buy'):
+                traffic.append(get('marketplace', 'req_chain', action,
+                                   'request_cancel'))
+                break
+            traffic.append(get('marketplace', 'req_chain', action,
+                               'response'))
+            if rand.random() < 0.3 and action != 'mkt_list':
+                traffic.append(get('marketplace', 'req_chain', action,
+                                   'response_log'))
+    return traffic
+
+
+def load_test_router(p_sessions: int = 10000,
+                     p_live: bool = True) -> dict:
+    """Replay synthetic marketplace traffic through the router.
+    Compares PlanRouter.dispatch to resolving each message from the
+    plan JSON at send time, then, if p_live, sends the same traffic
+    through sv_server to subscribers on every marketplace channel.
+    :args:
+    - p_sessions (int): marketplace sessions to synthesize
+    - p_live (bool): also run the traffic over loopback sockets
+    :returns:
+    - (dict) messages per second and delivery counts
+    """
+    t0 = time.perf_counter()
+    router = PlanRouter()
+    result = {'compile_ms': round((time.perf_counter() - t0) * 1000, 2)}
+    traffic = make_market_traffic(router, p_sessions)
+    plans = PlanRouter.load_json(PLANS_PATH)['plan']
+    payload = b'X' * 128
+
+    def scan_plans(p_channel):
+        """Resolve a channel by walking the plan JSON."""
+        _, plan, pattern, action, msg = p_channel.decode().split('/')
+        items = plans[plan][pattern]['action'][action]
+        deliver = [(p_channel, pattern in FAN_OUT)]
+        for pln, patterns in plans.items():
+            for pat, spec in patterns.items():
+                for act, act_items in spec['action'].items():
+                    if {'trigger': f'{action}/{msg}'} in act_items:
+                        deliver.append((PlanRouter.get_channel(
+                            pln, pat, act, 'request'), pat in FAN_OUT))
+        return deliver if msg in items else None
+
+    for nm, route in (('scan', scan_plans),
+                      ('compiled', lambda c: router.dispatch(c, payload))):
+        t0 = time.perf_counter()
+        delivered = sum(len(route(c)) for c in traffic)
+        secs = time.perf_counter() - t0
+        result[nm] = {'msgs_per_sec': int(len(traffic) / secs),
+                      'delivered': delivered}
+    result['msgs'] = len(traffic)
+    if p_live:
+        result['live'] = load_test_live(router, traffic, payload)
+    return result
+
+
+def load_test_live(p_router: PlanRouter,
+                   p_traffic: list,
+                   p_payload: bytes) -> dict:
+    """Send traffic through sv_server, routed by p_router, to one
+    counting subscriber per marketplace channel.
+    """
+    import asyncio
+    import sv_server
+    from sv_sequencer import MsgSequencer
+    MS = MsgSequencer()
+    expect = sum(len(p_router.routes[c].deliver) for c in p_traffic)
+    chans = {c for c in p_router.routes if c.startswith(b'/marketplace/')}
+
+    async def count(p_port, p_chan, p_counts, p_done):
+        reader, writer = await asyncio.open_connection('127.0.0.1', p_port)
+        await MS.send_msg(writer, p_chan)
+        try:
+            while await MS.read_msg(reader):
+                p_counts[0] += 1
+                if p_counts[0] == expect:
+                    p_done.set()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError):
+            writer.close()
+
+    async def run():
+        sv_server.TRACE = False
+        sv_server.ROUTER = p_router
+        server = await asyncio.start_server(sv_server.server,
+                                            '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        counts, done = [0], asyncio.Event()
+        subs = [asyncio.create_task(count(port, c, counts, done))
+                for c in chans]
+        _, writer = await asyncio.open_connection('127.0.0.1', port)
+        await MS.send_msg(writer, b'/null')
+        await asyncio.sleep(0.2)
+        t0 = time.perf_counter()
+        for n, chan in enumerate(p_traffic):
+            MS.write_msg(writer, chan)
+            MS.write_msg(writer, p_payload)
+            if n % 256 == 0:
+                await writer.drain()
+        await writer.drain()
+        await asyncio.wait_for(done.wait(), 60)
+        secs = time.perf_counter() - t0
+        writer.close()
+        for task in subs:
+            task.cancel()
+        await asyncio.gather(*subs, return_exceptions=True)
+        server.close()
+        await server.wait_closed()
+        sv_server.ROUTER = None
+        return {'msgs_per_sec': int(len(p_traffic) / secs),
+                'delivered': counts[0]}
+
+    return asyncio.run(run())
+
+
+if __name__ == '__main__':
+    from pprint import pprint
+    pprint(load_test_router())
@@ -11,24 +11,54 @@ Main behaviors:
 - Read a generic message package:
     - {size: bytes(4) --> int,
        data: bytes(size) --> bytes}
+    - Refuse sizes over MAX_FRAME instead of buffering them.
 
 - Write a generic message package:
     - {size: bytes(4) --> int,
        data: bytes(size) --> bytes}
+
+- Correlate requests and responses sent through a channel server:
+    - {corr_id: bytes(16),
+       status: bytes(1),
+       reply_len: bytes(1) --> int, so reply_to is at most 255,
+       reply_to: bytes(reply_len),
+       payload: bytes}
+    - Requesters subscribe to their own reply channel and await a
+      future per correlation ID, with a timeout.
+    - Responders subscribe to a request channel and answer each
+      request as soon as it is read, instead of sending on a timer.
+    - Requests are pipelined: many may be outstanding on one
+      connection, and responses may come back out of order.
+      Both sides cap how many are in flight at once.
 """
+import asyncio
+import time
+import uuid
 from asyncio import StreamReader, StreamWriter
+from typing import Awaitable, Callable
+
+MAX_FRAME = 16 * 1024 * 1024
+MSG_OK = b'\x00'
+MSG_ERR = b'\x01'
 
 
 class MsgSequencer(object):
     """Generic message handling."""
 
-    async def read_msg(self, stream: StreamReader) -> bytes:
+    async def read_msg(self,
+                       stream: StreamReader,
+                       max_size: int = None) -> bytes:
         """
         First 4 bytes are the size of the message.
         Convert them to an integer and read the rest of the message.
+        The size is checked before anything is buffered for it.
+        :raises:
+        - ValueError if the size is over max_size (default MAX_FRAME)
         """
         size_bytes = await stream.readexactly(4)
         size = int.from_bytes(size_bytes, byteorder='big')
+        if size > (MAX_FRAME if max_size is None else max_size):
+            raise ValueError(f'Frame of {size} bytes is over the limit')
         data = await stream.readexactly(size)
         return data
 
@@ -40,3 +70,419 @@ class MsgSequencer(object):
         size_bytes = len(data).to_bytes(4, byteorder='big')
         stream.writelines([size_bytes, data])
         await stream.drain()
+
+    def write_msg(self, stream: StreamWriter, data: bytes):
+        """
+        Queue a sized message on the stream without draining it.
+        Lets a caller write to several streams, then drain.
+        """
+        stream.writelines([len(data).to_bytes(4, byteorder='big'), data])
+
+    async def send_to(self,
+                      stream: StreamWriter,
+                      channel: bytes,
+                      data: bytes):
+        """
+        Send a channel name and its data as one write, so that
+        tasks sharing a stream cannot interleave their frames.
+        """
+        stream.writelines([len(channel).to_bytes(4, byteorder='big'),
+                           channel,
+                           len(data).to_bytes(4, byteorder='big'),
+                           data])
+        await stream.drain()
+
+    @classmethod
+    def pack_msg(cls,
+                 corr_id: bytes,
+                 payload: bytes,
+                 reply_to: bytes = b'',
+                 status: bytes = MSG_OK) -> bytes:
+        """
+        Prefix a payload with its correlation ID, status and the
+        channel that the response should be sent to.
+        :raises:
+        - ValueError if corr_id is not 16 bytes, status is not 1
+            byte, or reply_to is over 255 bytes
+        """
+        if len(corr_id) != 16:
+            raise ValueError(f"corr_id is {len(corr_id)} bytes, not 16.")
+        if len(status) != 1:
+            raise ValueError(f"status is {len(status)} bytes, not 1.")
+        if len(reply_to) > 255:
+            raise ValueError(
+                f"reply_to is {len(reply_to)} bytes; at most 255 fit.")
+        return b''.join([corr_id, status,
+                         len(reply_to).to_bytes(1, byteorder='big'),
+                         reply_to, payload])
+
+    @classmethod
+    def unpack_msg(cls, data: bytes) -> tuple:
+        """
+        Split a packed message.
+        Returns (corr_id, status, reply_to, payload).
+        :raises:
+        - ValueError if data is too short to hold its envelope
+        """
+        if len(data) < 18 or len(data) < 18 + data[17]:
+            raise ValueError(f'Message of {len(data)} bytes is too short')
+        reply_end = 18 + data[17]
+        return (data[:16], data[16:17], data[18:reply_end],
+                data[reply_end:])
+
+
+class MsgRequester(MsgSequencer):
+    """Send requests and await their correlated responses.
+
+    One connection carries up to max_in_flight outstanding
+    requests. A single reader task resolves each request's future
+    when the response with the same correlation ID arrives, in
+    whatever order responses come back.
+    """
+
+    def __init__(self,
+                 reply_chan: bytes = b'',
+                 timeout: float = 5.0,
+                 max_in_flight: int = 64):
+        """
+        :args:
+        - reply_chan (bytes): channel to subscribe to for responses,
+            unique per requester. Defaults to /reply/<uuid>.
+        - timeout (float): default seconds to wait for a response
+        - max_in_flight (int): outstanding requests allowed before
+            further requests wait for a slot. 1 = lockstep.
+        :raises:
+        - ValueError if reply_chan is over 255 bytes
+        """
+        self.reply_chan = reply_chan or\
+            f'/reply/{uuid.uuid4().hex[:8]}'.encode()
+        if len(self.reply_chan) > 255:
+            raise ValueError(
+                f"reply_chan is {len(self.reply_chan)} bytes; at most 255.")
+        self.timeout = timeout
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.pending: dict = {}
+        self.stats = {'sent': 0, 'received': 0, 'timeout': 0, 'late': 0,
+                      'bad': 0}
+        self.reader = None
+        self.writer = None
+        self.read_task = None
+
+    async def connect(self, host: str, port: int):
+        """
+        Open the connection, subscribe to the reply channel and
+        start the response reader.
+        """
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        await self.send_msg(self.writer, self.reply_chan)
+        self.read_task = asyncio.create_task(self.read_responses())
+
+    async def read_responses(self):
+        """
+        Resolve pending futures as responses arrive.
+        Responses for requests that already timed out are dropped,
+        as are responses too short to unpack.
+        When the connection ends, fail anything still pending.
+        """
+        err = ConnectionError('Connection ended.')
+        try:
+            while data := await self.read_msg(self.reader):
+                try:
+                    corr_id, status, _, payload = self.unpack_msg(data)
+                except ValueError:
+                    self.stats['bad'] += 1
+                    continue
+                fut = self.pending.pop(corr_id, None)
+                if fut is None or fut.done():
+                    self.stats['late'] += 1
+                    continue
+                self.stats['received'] += 1
+                if status == MSG_OK:
+                    fut.set_result(payload)
+                else:
+                    fut.set_exception(RuntimeError(payload.decode()))
+        except (asyncio.IncompleteReadError, ConnectionError,
+                ValueError) as e:
+            err = ConnectionError(f'Connection ended: {e}')
+        finally:
+            for fut in self.pending.values():
+                if not fut.done():
+                    fut.set_exception(err)
+            self.pending.clear()
+
+    async def request(self,
+                      channel: bytes,
+                      payload: bytes,
+                      timeout: float = None) -> bytes:
+        """
+        Send a request and wait for its response.
+        Waits first for an in-flight slot if max_in_flight
+        requests are already outstanding.
+        :args:
+        - channel (bytes): channel the responders subscribe to
+        - payload (bytes): request data
+        - timeout (float): seconds to wait, defaults to self.timeout
+        :returns:
+        - (bytes) response payload
+        :raises:
+        - asyncio.TimeoutError if no response arrives in time
+        - RuntimeError if the responder's handler failed
+        """
+        async with self.in_flight:
+            corr_id = uuid.uuid4().bytes
+            fut = asyncio.get_running_loop().create_future()
+            self.pending[corr_id] = fut
+            try:
+                await self.send_to(self.writer, channel,
+                                   self.pack_msg(corr_id, payload,
+                                                 self.reply_chan))
+                self.stats['sent'] += 1
+                return await asyncio.wait_for(
+                    fut, self.timeout if timeout is None else timeout)
+            except asyncio.TimeoutError as err:
+                self.stats['timeout'] += 1
+                raise (err)
+            finally:
+                self.pending.pop(corr_id, None)
+
+    async def request_many(self,
+                           channel: bytes,
+                           payloads: list,
+                           timeout: float = None,
+                           return_exceptions: bool = False) -> list:
+        """
+        Pipeline a batch of requests on this connection.
+        Up to max_in_flight are outstanding at a time; results are
+        returned in the order of the payloads.
+        :args:
+        - channel (bytes): channel the responders subscribe to
+        - payloads (list of bytes): request data
+        - timeout (float): seconds to wait for each response
+        - return_exceptions (bool): if True, failed requests return
+            their exception instead of raising the first one
+        :returns:
+        - (list) response payloads
+        """
+        return await asyncio.gather(
+            *[self.request(channel, p, timeout) for p in payloads],
+            return_exceptions=return_exceptions)
+
+    async def close(self):
+        """Stop the reader and close the connection."""
+        if self.read_task:
+            self.read_task.cancel()
+            await asyncio.gather(self.read_task, return_exceptions=True)
+        if self.writer:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+class MsgResponder(MsgSequencer):
+    """Answer requests on a channel as soon as they arrive.
+
+    Each request is handled in its own task, so a slow request
+    does not hold up the ones read after it. The response goes to
+    the request's reply channel with the same correlation ID.
+    Once max_in_flight requests are being handled, the responder
+    stops reading until one finishes, which pushes back on the
+    connection instead of queueing without limit.
+    """
+
+    def __init__(self,
+                 channel: bytes,
+                 handler: Callable[[bytes], Awaitable[bytes]],
+                 max_in_flight: int = 64):
+        """
+        :args:
+        - channel (bytes): request channel to subscribe to
+        - handler (coroutine function): takes the request payload,
+            returns the response payload
+        - max_in_flight (int): requests handled at the same time
+        """
+        self.channel = channel
+        self.handler = handler
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.tasks: set = set()
+        self.stats = {'handled': 0, 'failed': 0, 'bad': 0}
+        self.writer = None
+
+    async def serve(self, host: str, port: int):
+        """
+        Subscribe to the request channel and respond until the
+        connection ends, or a frame over MAX_FRAME arrives.
+        """
+        reader, self.writer = await asyncio.open_connection(host, port)
+        await self.send_msg(self.writer, self.channel)
+        try:
+            while data := await self.read_msg(reader):
+                await self.in_flight.acquire()
+                task = asyncio.create_task(self.respond(data))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        except asyncio.IncompleteReadError:
+            pass
+        except ValueError as err:
+            self.stats['bad'] += 1
+            print(f'Responder on {self.channel!r} stopped: {err}')
+        finally:
+            for task in list(self.tasks):
+                task.cancel()
+            self.writer.close()
+            await self.writer.wait_closed()
+
+    async def respond(self, data: bytes):
+        """Run the handler for one request and send its response.
+        A request too short to unpack is counted as bad and dropped.
+        """
+        try:
+            try:
+                corr_id, _, reply_to, payload = self.unpack_msg(data)
+            except ValueError:
+                self.stats['bad'] += 1
+                return
+            try:
+                result, status = await self.handler(payload), MSG_OK
+                self.stats['handled'] += 1
+            except Exception as err:
+                result, status = repr(err).encode(), MSG_ERR
+                self.stats['failed'] += 1
+            if reply_to:
+                await self.send_to(self.writer, reply_to,
+                                   self.pack_msg(corr_id, result,
+                                                 status=status))
+        finally:
+            self.in_flight.release()
+
+
+async def start_bench_service(p_channel: bytes = b'/bench',
+                              p_work_ms: float = 0.0,
+                              p_max_in_flight: int = 256) -> tuple:
+    """Start sv_server and an echo responder in-process, on loopback.
+    :args:
+    - p_channel (bytes): channel the responder subscribes to
+    - p_work_ms (float): simulated handler time per request
+    - p_max_in_flight (int): responder in-flight limit
+    :returns:
+    - (tuple) (server, port, responder task)
+    """
+    import sv_server
+    sv_server.TRACE = False
+
+    async def echo(p_payload):
+        if p_work_ms:
+            await asyncio.sleep(p_work_ms / 1000)
+        return p_payload
+
+    server = await asyncio.start_server(sv_server.server, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    resp = MsgResponder(p_channel, echo, p_max_in_flight)
+    resp_task = asyncio.create_task(resp.serve('127.0.0.1', port))
+    await asyncio.sleep(0.1)
+    return (server, port, resp_task)
+
+
+async def stop_bench_service(p_service: tuple):
+    """Stop what start_bench_service started."""
+    server, _, resp_task = p_service
+    resp_task.cancel()
+    await asyncio.gather(resp_task, return_exceptions=True)
+    server.close()
+    await server.wait_closed()
+
+
+def benchmark_round_trip(p_count: int = 5000,
+                         p_burst: int = 64,
+                         p_size: int = 256):
+    """Measure request/response latency through sv_server on loopback.
+    Starts the channel server and an echo responder in-process, then
+    times p_count sequential round trips and p_count more sent
+    p_burst at a time on one connection. The old responders sent on
+    a timer, so they added up to one full interval (1 s by default)
+    to every round trip.
+    :args:
+    - p_count (int): requests per run
+    - p_burst (int): outstanding requests in the burst run
+    - p_size (int): payload bytes
+    :returns:
+    - (dict) p50, p99 and mean round trip in microseconds, and
+        requests per second, for each run
+    """
+    def summary(p_times, p_secs):
+        p_times.sort()
+        return {'p50_us': round(p_times[len(p_times) // 2] * 1e6, 1),
+                'p99_us': round(p_times[int(len(p_times) * .99)] * 1e6, 1),
+                'mean_us': round(sum(p_times) / len(p_times) * 1e6, 1),
+                'req_per_sec': int(len(p_times) / p_secs)}
+
+    async def timed(p_req, p_payload, p_times):
+        t0 = time.perf_counter()
+        await p_req.request(b'/bench', p_payload)
+        p_times.append(time.perf_counter() - t0)
+
+    async def run():
+        service = await start_bench_service()
+        req = MsgRequester()
+        await req.connect('127.0.0.1', service[1])
+        payload = b'X' * p_size
+        for _ in range(100):
+            await req.request(b'/bench', payload)
+        result = {}
+        times: list = []
+        t0 = time.perf_counter()
+        for _ in range(p_count):
+            await timed(req, payload, times)
+        result['sequential'] = summary(times, time.perf_counter() - t0)
+        times = []
+        t0 = time.perf_counter()
+        for _ in range(0, p_count, p_burst):
+            await asyncio.gather(*[timed(req, payload, times)
+                                   for _ in range(p_burst)])
+        result[f'burst_{p_burst}'] = summary(times, time.perf_counter() - t0)
+        await req.close()
+        await stop_bench_service(service)
+        return result
+
+    return asyncio.run(run())
+
+
+def benchmark_pipeline(p_count: int = 20000,
+                       p_windows: tuple = (1, 8, 64, 256),
+                       p_work_ms: float = 0.0,
+                       p_size: int = 256):
+    """Compare pipelined throughput to the lockstep pattern.
+    A window of 1 is the old requesters' pattern: send one request,
+    wait for its answer, send the next. Larger windows keep that
+    many requests outstanding on the one connection.
+    :args:
+    - p_count (int): requests per window size
+    - p_windows (tuple): max_in_flight values to try
+    - p_work_ms (float): simulated responder time per request
+    - p_size (int): payload bytes
+    :returns:
+    - (dict) requests per second, keyed by window size
+    """
+    async def run():
+        service = await start_bench_service(p_work_ms=p_work_ms,
+                                            p_max_in_flight=max(p_windows))
+        payloads = [b'X' * p_size] * p_count
+        result = {}
+        for window in p_windows:
+            req = MsgRequester(max_in_flight=window, timeout=30)
+            await req.connect('127.0.0.1', service[1])
+            await req.request_many(b'/bench', payloads[:100])
+            t0 = time.perf_counter()
+            await req.request_many(b'/bench', payloads)
+            result[window] = int(p_count / (time.perf_counter() - t0))
+            await req.close()
+        await stop_bench_service(service)
+        return result
+
+    return asyncio.run(run())
+
+
+if __name__ == '__main__':
+    from pprint import pprint
+    pprint(benchmark_round_trip())
+    pprint({'req_per_sec': benchmark_pipeline(),
+            'req_per_sec_1ms_work': benchmark_pipeline(p_count=5000,
+                                                       p_work_ms=1.0)})
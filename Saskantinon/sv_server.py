@@ -9,47 +9,196 @@ on specified host/port.
 Main behaviors:
 
 - Handle traffic for channels on specified host/port.
+- If a PlanRouter is set, route plan channels by its dispatch
+  table: triggered channels also get the message, and b_cast and
+  pub_sub plan channels go to all subscribers, not just one.
+- Bound memory per connection:
+    - Refuse frames over MAX_FRAME and close that connection.
+    - Stop reading a connection once READ_LIMIT*2 bytes are
+      buffered from it; resume at READ_LIMIT.
+    - When a subscriber has more than WRITE_HIGH bytes queued,
+      wait for it to drain to WRITE_LOW before reading the next
+      message from the sender. That pushes back on the sender.
+      A subscriber that does not drain in SLOW_SECS is
+      disconnected.
+- Count traffic per channel and write the counts to the WireTap
+  monitor namespace (mon_dir_nm) every EXPORT_SECS. Only channels
+  with subscribers, or in the plans, get their own counters; the
+  rest share the OTHER counters, so METRICS stays bounded.
 """
 
 import asyncio
 import sys
-from asyncio import StreamReader, StreamWriter, gather
+import time
+from asyncio import StreamReader, StreamWriter
 from collections import defaultdict, deque
-from typing import DefaultDict, Deque
+from typing import DefaultDict, Deque, Dict
 
 from sv_sequencer import MsgSequencer
 MS = MsgSequencer()
 
 SUBSCRIBERS: DefaultDict[bytes, Deque] = defaultdict(deque)
+TRACE = True    # print each routed message
+ROUTER = None   # sv_router.PlanRouter, if routing by plan
+
+MAX_FRAME = 1024 * 1024     # bytes in one frame
+READ_LIMIT = 256 * 1024     # StreamReader limit: pause at 2x, resume at 1x
+WRITE_HIGH = 1024 * 1024    # subscriber write buffer: wait above this...
+WRITE_LOW = 256 * 1024      # ...until it is down to this
+SLOW_SECS = 5.0             # drop a subscriber that cannot drain in time
+EXPORT_SECS = 10.0          # how often to write metrics; 0 = never
+OTHER = b"<other>"          # metrics for unsubscribed, unplanned channels
+
+
+def new_metrics() -> dict:
+    """Return zeroed counters for one channel."""
+    return {'msgs_in': 0, 'bytes_in': 0, 'msgs_out': 0, 'bytes_out': 0,
+            'queue_depth': 0, 'queue_peak': 0, 'drops': 0, 'refused': 0,
+            'paused': 0, 'paused_secs': 0.0, 'slow_disconnects': 0}
+
+
+METRICS: Dict[bytes, dict] = dict()
+
+
+def get_chan_metrics(p_chan: bytes) -> dict:
+    """Return the counters for a channel. A channel with no
+    subscribers that is not in the plans is counted under OTHER,
+    so senders cannot add channels to METRICS at will.
+    """
+    metrics = METRICS.get(p_chan)
+    if metrics is None:
+        if p_chan not in SUBSCRIBERS and\
+                (ROUTER is None or p_chan not in ROUTER.routes):
+            p_chan = OTHER
+        metrics = METRICS.setdefault(p_chan, new_metrics())
+    return metrics
+
+
+def fold_metrics(p_chan: bytes):
+    """Merge a channel's counters into OTHER once its last subscriber
+    has gone, unless it is in the plans."""
+    if p_chan == OTHER or (ROUTER is not None and p_chan in ROUTER.routes):
+        return
+    metrics = METRICS.pop(p_chan, None)
+    if metrics is None:
+        return
+    other = METRICS.setdefault(OTHER, new_metrics())
+    for k, v in metrics.items():
+        if k == 'queue_peak':
+            other[k] = max(other[k], v)
+        elif k != 'queue_depth':
+            other[k] += v
+
+
+def get_metrics() -> dict:
+    """Return per-channel counters, plus subscriber counts."""
+    return {'channels': {chan.decode(errors='replace'): dict(m)
+                         for chan, m in METRICS.items()},
+            'subscribers': {chan.decode(errors='replace'): len(conns)
+                            for chan, conns in SUBSCRIBERS.items()}}
+
+
+async def export_metrics(p_name: str,
+                         p_secs: float = EXPORT_SECS):
+    """Write get_metrics() to the monitor namespace every p_secs."""
+    from io_wiretap import WireTap
+    WT = WireTap()
+    while True:
+        await asyncio.sleep(p_secs)
+        WT.monitor(p_name, get_metrics())
+
+
+async def relieve(p_conn: StreamWriter,
+                  p_metrics: dict):
+    """Wait for a lagging subscriber to drain, or disconnect it.
+    Meanwhile the sender's connection is not read, so its own
+    buffers fill and its transport is paused.
+    """
+    t0 = time.perf_counter()
+    p_metrics['paused'] += 1
+    try:
+        await asyncio.wait_for(p_conn.drain(), SLOW_SECS)
+    except asyncio.TimeoutError:
+        p_metrics['slow_disconnects'] += 1
+        print(f"Remote {p_conn.get_extra_info('peername')} too slow;"
+              " disconnecting")
+        p_conn.transport.abort()
+    except ConnectionError:
+        pass
+    p_metrics['paused_secs'] += time.perf_counter() - t0
 
 
 async def server(reader: StreamReader, writer: StreamWriter):
     """Handle traffic for a single channel = unique combo of host:port.
     """
     peername = writer.get_extra_info('peername')
-    subscribe_chan = await MS.read_msg(reader)
+    writer.transport.set_write_buffer_limits(high=WRITE_HIGH, low=WRITE_LOW)
+    try:
+        subscribe_chan = await MS.read_msg(reader, MAX_FRAME)
+    except (ValueError, asyncio.IncompleteReadError) as err:
+        print(f'Remote {peername!r} refused: {err}')
+        writer.close()
+        return
     SUBSCRIBERS[subscribe_chan].append(writer)
     print(f'Remote {peername!r} subscribed to {subscribe_chan!r}')
     try:
-        while channel_name := await MS.read_msg(reader):
-            data = await MS.read_msg(reader)
-            print(f'Sending to {channel_name!r}: {data[:19]!r}...')
-            conns = SUBSCRIBERS[channel_name]
-            if (conns and
-                    ("/b_cast" in channel_name or
-                     "/pub_sub" in channel_name)):
-                conns.rotate()
-                conns = deque([conns[0]])
-            await gather(*[MS.send_msg(c, data) for c in conns])
+        while channel_name := await MS.read_msg(reader, MAX_FRAME):
+            data = await MS.read_msg(reader, MAX_FRAME)
+            if TRACE:
+                print(f'Sending to {channel_name!r}: {data[:19]!r}...')
+            if ROUTER is None:
+                targets = ((channel_name, None),)
+            else:
+                targets = ROUTER.dispatch(channel_name, data)
+            metrics = get_chan_metrics(channel_name)
+            metrics['msgs_in'] += 1
+            metrics['bytes_in'] += len(data)
+            # Queue the frame on every subscriber before draining any,
+            # rather than a task per subscriber per message. Only
+            # subscribers over their high watermark are waited on.
+            lagging = []
+            for chan, fan_out in targets:
+                conns = SUBSCRIBERS.get(chan)
+                if not conns:
+                    get_chan_metrics(chan)['drops'] += 1
+                    continue
+                if fan_out is None:
+                    fan_out = b"/b_cast" in chan or b"/pub_sub" in chan
+                if not fan_out:
+                    conns.rotate()
+                    conns = (conns[0],)
+                metrics = get_chan_metrics(chan)
+                depth = 0
+                for c in conns:
+                    if c.transport.is_closing():
+                        metrics['drops'] += 1
+                        continue
+                    MS.write_msg(c, data)
+                    metrics['msgs_out'] += 1
+                    metrics['bytes_out'] += len(data)
+                    queued = c.transport.get_write_buffer_size()
+                    depth += queued
+                    if queued > WRITE_HIGH:
+                        lagging.append((c, metrics))
+                metrics['queue_depth'] = depth
+                if depth > metrics['queue_peak']:
+                    metrics['queue_peak'] = depth
+            for c, metrics in lagging:
+                await relieve(c, metrics)
+    except ValueError as err:
+        get_chan_metrics(subscribe_chan)['refused'] += 1
+        print(f'Remote {peername} refused: {err}')
     except asyncio.CancelledError:
         print(f'Remote {peername} closing connection.')
-        writer.close()
-        await writer.wait_closed()
-    except asyncio.IncompleteReadError:
+    except (asyncio.IncompleteReadError, ConnectionError):
         print(f'Remote {peername} disconnected')
     finally:
         print(f'Remote {peername} closed')
         SUBSCRIBERS[subscribe_chan].remove(writer)
+        if not SUBSCRIBERS[subscribe_chan]:
+            del SUBSCRIBERS[subscribe_chan]
+            fold_metrics(subscribe_chan)
+        writer.close()
 
 
 async def main(*args, **kwargs):
@@ -60,23 +209,33 @@ async def main(*args, **kwargs):
     - port: port number(s)
 
     Responder and requesters must use same channel.
-
+    Metrics are exported as mon~sv_server_<port>~... records.
     """
+    kwargs.setdefault('limit', READ_LIMIT)
     server = await asyncio.start_server(*args, **kwargs)
+    if EXPORT_SECS:
+        asyncio.create_task(
+            export_metrics(f"sv_server_{kwargs.get('port', '')}"))
     async with server:
         await server.serve_forever()
 
-try:
-    """Run the server in asynchronous/non-blocking mode
-    main = name of main routine to run
-    server = name of callback when a new client connects
 
-    Command line arguments:
-    1 = channel name
-    2 = host = host name(s) or IP address(es)
-    3 = port = port number(s)
-    """
-    print(f"Starting {sys.argv[1]} server on {sys.argv[2]}:{sys.argv[3]}")
-    asyncio.run(main(server, host=sys.argv[2], port=sys.argv[3]))
-except KeyboardInterrupt:
-    print('Bye!')
+if __name__ == '__main__':
+    try:
+        """Run the server in asynchronous/non-blocking mode
+        main = name of main routine to run
+        server = name of callback when a new client connects
+
+        Command line arguments:
+        1 = channel name
+        2 = host = host name(s) or IP address(es)
+        3 = port = port number(s)
+        4 = optional plans JSON file to route by
+        """
+        if len(sys.argv) > 4:
+            from sv_router import PlanRouter
+            ROUTER = PlanRouter(sys.argv[4])
+        print(f"Starting {sys.argv[1]} server on {sys.argv[2]}:{sys.argv[3]}")
+        asyncio.run(main(server, host=sys.argv[2], port=sys.argv[3]))
+    except KeyboardInterrupt:
+        print('Bye!')
@@ -0,0 +1,363 @@
+#!python
+"""
+:module:    sv_supervisor.py
+:class:     SvcSupervisor
+
+Launch, health-check and restart service processes.
+
+Main behaviors:
+
+- Derive the process topology from svc_schema.json: one sv_server
+  per port of each channel, skipping load balancer ports.
+- Spawn all processes at once, each in its own session, rather
+  than one `nohup python ...` after another. They are plain Popen
+  children, not asyncio subprocesses, so they keep running after
+  the supervisor's event loop ends.
+- Wait until each is ready: a TCP connect, then a handshake that
+  subscribes to a private channel and reads back a ping sent to it,
+  so the server's message loop is known to be running.
+- Watch each process and restart it with exponential backoff when
+  it exits. The backoff resets once a process has stayed up for
+  STABLE_SECS; after MAX_RESTARTS quick failures it is given up.
+- Report the cold-start time of the whole topology.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from collections import namedtuple
+from pathlib import Path
+
+from io_shell import ShellIO  # type: ignore
+from sv_sequencer import MsgSequencer  # type: ignore
+
+SI = ShellIO()
+MS = MsgSequencer()
+
+Service = namedtuple('Service', ['name', 'argv', 'host', 'port', 'log_path'])
+
+
+class SvcSupervisor(object):
+    """Run a set of services as child processes and keep them up."""
+
+    READY_SECS = 10.0       # give up waiting for readiness after this
+    BACKOFF_BASE = 0.1      # first restart delay, doubled each time
+    BACKOFF_MAX = 10.0
+    STABLE_SECS = 30.0      # uptime that resets the backoff
+    MAX_RESTARTS = 8        # quick failures in a row before giving up
+
+    def __init__(self):
+        """Keep per-service process, state and timing."""
+        self.procs: dict = {}
+        self.state: dict = {}
+        self.stats: dict = {}
+        self.watchers: dict = {}
+        self.stopping = False
+
+    # Topology
+    # ==============================================================
+    @classmethod
+    def assign_ports(cls,
+                     p_svc,
+                     p_host: str = None) -> dict:
+        """Fill in channel port numbers not yet assigned.
+        Ports with an empty "num" list get free ports, counting up
+        from resource/port_low, in schema order.
+        Assigned ports are kept: a dict is filled in place, and a file
+        is written back, so later calls (e.g. sv_proxy.get_proxies
+        after start_servers) see the same ports.
+        :args:
+        - p_svc (dict | str): svc_schema contents, or path to it
+        - p_host (str): host to probe, default resource/host
+        :returns:
+        - (dict) the schema with every channel port's "num" filled in
+        """
+        svc_path = None
+        if not isinstance(p_svc, dict):
+            svc_path = p_svc
+            with open(svc_path, 'r') as f:
+                p_svc = json.load(f)
+        assigned = False
+        host = p_host or p_svc["resource"]["host"]
+        next_port = p_svc["resource"]["port_low"]
+        used = SI.get_used_ports()
+        taken = {n for c_meta in p_svc["channels"]["channel"].values()
+                 for p_meta in c_meta.get("port", {}).values()
+                 for n in p_meta["num"]}
+        for c_meta in p_svc["channels"]["channel"].values():
+            for p_meta in c_meta.get("port", {}).values():
+                while len(p_meta["num"]) < p_meta["count"]:
+                    if next_port not in taken and\
+                            (SI.is_port_free(next_port, host) if used is None
+                             else next_port not in used):
+                        p_meta["num"].append(next_port)
+                        assigned = True
+                    next_port += 1
+        if assigned and svc_path is not None:
+            with open(svc_path, 'w') as f:
+                json.dump(p_svc, f, indent=4)
+        return p_svc
+
+    @classmethod
+    def get_topology(cls,
+                     p_svc,
+                     p_py_path: str,
+                     p_log_dir: str,
+                     p_host: str = None) -> list:
+        """List the sv_server processes the service schema calls for.
+        Ports not yet assigned are filled in (and kept) by
+        assign_ports.
+        :args:
+        - p_svc (dict | str): svc_schema contents, or path to it
+        - p_py_path (str): path to sv_server.py
+        - p_log_dir (str): directory for the processes' logs
+        - p_host (str): host to serve on, default resource/host
+        :returns:
+        - (list) Service tuples
+        """
+        p_svc = cls.assign_ports(p_svc, p_host)
+        host = p_host or p_svc["resource"]["host"]
+        services: list = list()
+        for c_nm, c_meta in p_svc["channels"]["channel"].items():
+            for p_typ, p_meta in c_meta.get("port", {}).items():
+                if p_typ == "load_bal":
+                    continue
+                for port in p_meta["num"]:
+                    name = f"/{c_nm}/{p_typ}:{port}"
+                    log_nm = name.replace('/', '_').replace('__', '_')
+                    services.append(Service(
+                        name,
+                        [sys.executable, "-u", p_py_path, name, host,
+                         str(port)],
+                        host, port,
+                        os.path.join(p_log_dir, f"sv_server_{log_nm}.log")))
+        return services
+
+    # Process control
+    # ==============================================================
+    async def spawn(self, p_svc: Service):
+        """Start one service process, logging to its log file."""
+        Path(p_svc.log_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(p_svc.log_path, 'ab') as log_f:
+            self.procs[p_svc.name] = subprocess.Popen(
+                p_svc.argv, stdout=log_f, stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL, start_new_session=True)
+        self.state[p_svc.name] = 'starting'
+
+    @classmethod
+    async def probe(cls,
+                    p_host: str,
+                    p_port: int,
+                    p_handshake: bool = True) -> bool:
+        """Return True if the server accepts a connection and, with
+        p_handshake, routes a ping back to a private channel.
+        """
+        try:
+            reader, writer = await asyncio.open_connection(p_host, p_port)
+        except OSError:
+            return False
+        try:
+            if not p_handshake:
+                return True
+            chan = f'/health/{uuid.uuid4().hex[:8]}'.encode()
+            await MS.send_msg(writer, chan)
+            await MS.send_to(writer, chan, b'ping')
+            return await asyncio.wait_for(MS.read_msg(reader), 1.0) ==\
+                b'ping'
+        except (OSError, asyncio.TimeoutError,
+                asyncio.IncompleteReadError):
+            return False
+        finally:
+            writer.close()
+
+    async def wait_ready(self,
+                         p_svc: Service,
+                         p_handshake: bool = True) -> float:
+        """Poll the service until it is ready.
+        The poll interval starts at 5 ms and grows to 200 ms.
+        :returns:
+        - (float) seconds from start of wait until ready
+        :raises:
+        - TimeoutError if not ready within READY_SECS, or if the
+            process exits first
+        """
+        t0 = time.perf_counter()
+        delay = 0.005
+        while time.perf_counter() - t0 < self.READY_SECS:
+            proc = self.procs[p_svc.name]
+            if proc.poll() is not None:
+                raise TimeoutError(
+                    f"{p_svc.name} exited with {proc.returncode}; "
+                    f"see {p_svc.log_path}")
+            if await self.probe(p_svc.host, p_svc.port, p_handshake):
+                self.state[p_svc.name] = 'ready'
+                return time.perf_counter() - t0
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.2)
+        raise TimeoutError(f"{p_svc.name} not ready in {self.READY_SECS}s")
+
+    async def launch(self,
+                     p_svc: Service,
+                     p_handshake: bool = True) -> float:
+        """Spawn a service and wait for it to be ready.
+        :returns:
+        - (float) seconds from spawn to ready
+        """
+        t0 = time.perf_counter()
+        await self.spawn(p_svc)
+        await self.wait_ready(p_svc, p_handshake)
+        return time.perf_counter() - t0
+
+    @classmethod
+    async def wait_exit(cls,
+                        p_proc: subprocess.Popen) -> int:
+        """Wait for a child to exit without tying up a thread.
+        Uses a pidfd where the OS has them (Linux 5.3+), otherwise
+        polls.
+        :returns:
+        - (int) the child's return code
+        """
+        try:
+            pid_fd = os.pidfd_open(p_proc.pid)
+        except (AttributeError, OSError):
+            while p_proc.poll() is None:
+                await asyncio.sleep(0.1)
+            return p_proc.returncode
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        loop.add_reader(pid_fd, lambda: exited.done() or
+                        exited.set_result(None))
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pid_fd)
+            os.close(pid_fd)
+        return p_proc.wait()
+
+    async def watch(self, p_svc: Service):
+        """Restart a service whenever it exits, with backoff."""
+        failures = 0
+        while not self.stopping:
+            up_t0 = time.perf_counter()
+            rc = await self.wait_exit(self.procs[p_svc.name])
+            if self.stopping:
+                return
+            failures = 0 if time.perf_counter() - up_t0 >= self.STABLE_SECS\
+                else failures + 1
+            self.stats[p_svc.name]['exits'] += 1
+            if failures > self.MAX_RESTARTS:
+                self.state[p_svc.name] = 'failed'
+                print(f"{p_svc.name} exited {rc}; giving up after "
+                      f"{failures - 1} restarts")
+                return
+            delay = min(self.BACKOFF_MAX,
+                        self.BACKOFF_BASE * 2 ** (failures - 1))
+            self.state[p_svc.name] = 'backoff'
+            print(f"{p_svc.name} exited {rc}; restarting in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            if self.stopping:
+                return
+            try:
+                await self.launch(p_svc)
+                self.stats[p_svc.name]['restarts'] += 1
+            except TimeoutError as err:
+                print(err)
+
+    async def start_all(self,
+                        p_services: list,
+                        p_handshake: bool = True,
+                        p_watch: bool = True) -> dict:
+        """Launch all services concurrently and wait until all are
+        ready. Then, if p_watch, keep restarting any that exit.
+        :returns:
+        - (dict) cold_start_secs for the whole topology, and
+            seconds to ready per service
+        """
+        t0 = time.perf_counter()
+        results = await asyncio.gather(
+            *[self.launch(svc, p_handshake) for svc in p_services],
+            return_exceptions=True)
+        report = {'cold_start_secs': round(time.perf_counter() - t0, 3),
+                  'services': {}, 'failed': {}}
+        for svc, result in zip(p_services, results):
+            self.stats[svc.name] = {'exits': 0, 'restarts': 0}
+            if isinstance(result, BaseException):
+                report['failed'][svc.name] = str(result)
+            else:
+                report['services'][svc.name] = round(result, 3)
+            if p_watch:
+                self.watchers[svc.name] = asyncio.create_task(
+                    self.watch(svc))
+        return report
+
+    async def start_serial(self,
+                           p_services: list,
+                           p_handshake: bool = True) -> dict:
+        """Launch services one at a time, each ready before the next.
+        Mirrors the old one-after-another start, for comparison.
+        """
+        t0 = time.perf_counter()
+        for svc in p_services:
+            await self.launch(svc, p_handshake)
+        return {'cold_start_secs': round(time.perf_counter() - t0, 3)}
+
+    async def stop_all(self,
+                       p_grace: float = 3.0):
+        """Stop watching, terminate every process, kill stragglers."""
+        self.stopping = True
+        for task in self.watchers.values():
+            task.cancel()
+        await asyncio.gather(*self.watchers.values(), return_exceptions=True)
+        procs = [p for p in self.procs.values() if p.poll() is None]
+        for proc in procs:
+            proc.terminate()
+        t0 = time.perf_counter()
+        while any(p.poll() is None for p in procs) and\
+                time.perf_counter() - t0 < p_grace:
+            await asyncio.sleep(0.02)
+        for proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        self.watchers.clear()
+        self.stopping = False
+
+
+def benchmark_cold_start(p_svc_path: str = None,
+                         p_log_dir: str = "/tmp/saskan_sv_bench") -> dict:
+    """Time a cold start of the svc_schema.json topology on loopback,
+    serially (each server ready before the next is spawned) and all
+    at once.
+    :returns:
+    - (dict) service count and cold_start_secs for each way
+    """
+    here = Path(__file__).resolve().parent
+    svc_path = p_svc_path or str(here / "schema" / "svc_schema.json")
+    with open(svc_path, 'r') as f:
+        svc_text = f.read()     # assign ports on copies, not the file
+
+    async def run():
+        result = {}
+        for nm in ('serial', 'parallel'):
+            services = SvcSupervisor.get_topology(
+                json.loads(svc_text), str(here / "sv_server.py"), p_log_dir,
+                "127.0.0.1")
+            sup = SvcSupervisor()
+            if nm == 'serial':
+                result[nm] = await sup.start_serial(services)
+            else:
+                result[nm] = await sup.start_all(services, p_watch=False)
+                result[nm].pop('services')
+            result['services'] = len(services)
+            await sup.stop_all()
+        return result
+
+    return asyncio.run(run())
+
+
+if __name__ == '__main__':
+    from pprint import pprint
+    pprint(benchmark_cold_start())
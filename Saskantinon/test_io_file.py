@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from io_file import FileIO
+from odf.opendocument import OpenDocumentSpreadsheet
+from odf.table import Table, TableCell, TableRow
+from odf.text import P
+
+PLACES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "schema", "places_data.ods")
+
+
+class TestOdsRows(unittest.TestCase):
+
+    def setUp(self):
+        self.FI = FileIO()
+
+    def check_same(self, p_path, p_sheet):
+        expect = pd.read_excel(p_path, sheet_name=p_sheet, engine='odf')
+        got = self.FI.get_spreadsheet_data(p_path, p_sheet,
+                                           p_use_cache=False)
+        # Empty cells are None here, NaN in pandas.
+        pd.testing.assert_frame_equal(
+            got.astype(object).where(got.notna(), None),
+            expect.astype(object).where(expect.notna(), None),
+            check_dtype=False)
+
+    def make_ods(self, p_path):
+        """Header, data, a blank row, a row repeated 3 times, 2 blank
+        rows, a last row, then a long run of blank rows."""
+        doc = OpenDocumentSpreadsheet()
+        table = Table(name="rows")
+
+        def add_row(p_vals, p_repeat=1):
+            row = TableRow(numberrowsrepeated=p_repeat) if p_repeat > 1\
+                else TableRow()
+            for val in p_vals:
+                if val is None:
+                    row.addElement(TableCell())
+                elif isinstance(val, float):
+                    row.addElement(TableCell(valuetype="float", value=val))
+                else:
+                    cell = TableCell(valuetype="string")
+                    cell.addElement(P(text=val))
+                    row.addElement(cell)
+            row.addElement(TableCell(numbercolumnsrepeated=1000))
+            table.addElement(row)
+
+        add_row(["name", "size", "note"])
+        add_row(["a", 1.0, "x"])
+        add_row([])
+        add_row(["b", 2.0, None], 3)
+        add_row([], 2)
+        add_row([None, 3.0, "z"])
+        add_row([], 1000)
+        doc.spreadsheet.addElement(table)
+        doc.save(p_path)
+
+    def test_repeated_rows_match_pandas(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ods_path = os.path.join(tmp, "rows.ods")
+            self.make_ods(ods_path)
+            self.check_same(ods_path, "rows")
+            self.assertEqual(
+                len(list(FileIO.iter_ods_rows(ods_path, "rows"))), 9)
+
+    def test_places_data_matches_pandas(self):
+        for sheet in pd.ExcelFile(PLACES_PATH, engine='odf').sheet_names:
+            with self.subTest(sheet=sheet):
+                self.check_same(PLACES_PATH, sheet)
+
+
+if __name__ == '__main__':
+    unittest.main()
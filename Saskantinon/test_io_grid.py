@@ -0,0 +1,83 @@
+import unittest
+import pygame as pg
+from io_data import GameGridCells
+
+pg.init()     # Initialize PyGame for use in this module
+
+
+class TestGameGridCells(unittest.TestCase):
+
+    def setUp(self):
+        self.cells = GameGridCells(3, 4, 1, 2)
+
+    def test_cells_do_not_alias(self):
+        self.cells.set_cell(1, 2, 0, fill=True, text='Ferrum')
+        self.assertTrue(self.cells.get_cell(1, 2, 0)['fill'])
+        self.assertFalse(self.cells.get_cell(1, 3, 0)['fill'])
+        self.assertEqual(self.cells.get_cell(1, 3, 0)['text'], '')
+
+    def test_copy_on_write(self):
+        self.cells.set_cell(0, 0, -2, text='down')
+        other = self.cells.copy()
+        self.assertIs(other.fill, self.cells.fill)
+        other.set_cell(0, 0, -2, text='changed')
+        self.assertEqual(self.cells.get_cell(0, 0, -2)['text'], 'down')
+        self.assertEqual(other.get_cell(0, 0, -2)['text'], 'changed')
+
+    def test_layer_slice(self):
+        self.cells.set_cell(2, 1, 1, fill=True)
+        layer = self.cells.get_layer('fill', 1)
+        self.assertEqual(layer.shape, (3, 4))
+        self.assertEqual(int(layer.sum()), 1)
+        with self.assertRaises(IndexError):
+            self.cells.get_layer('fill', 2)
+
+    def test_intern_reuses_ids(self):
+        self.cells.set_cell(0, 0, 0, text='a', state_data={'x': 1, 'y': 2})
+        self.cells.set_cell(0, 1, 0, text='a', state_data={'y': 2, 'x': 1})
+        self.cells.set_cell(0, 2, 0, text='b', state_data={'x': 1})
+        self.assertEqual(self.cells.texts, ['', 'a', 'b'])
+        self.assertEqual(len(self.cells.states), 3)
+        self.assertEqual(self.cells.text_id[0, 0, 2],
+                         self.cells.text_id[0, 1, 2])
+        other = self.cells.copy()
+        other.set_cell(1, 0, 0, text='c')
+        self.assertEqual(self.cells.texts, ['', 'a', 'b'])
+        self.assertNotIn('"c"', self.cells.text_ids)
+
+    def test_state_not_shared(self):
+        state = {'hp': 1}
+        self.cells.set_cell(0, 0, 0, state_data=state)
+        self.cells.set_cell(1, 1, 0, state_data={'hp': 1})
+        other = self.cells.copy()
+        state['hp'] = 7
+        self.cells.get_cell(0, 0, 0)['state_data']['hp'] = 99
+        self.assertEqual(self.cells.get_cell(0, 0, 0)['state_data'],
+                         {'hp': 1})
+        self.assertEqual(self.cells.get_cell(1, 1, 0)['state_data'],
+                         {'hp': 1})
+        self.assertEqual(other.get_cell(1, 1, 0)['state_data'], {'hp': 1})
+        self.cells.set_cell(2, 2, 0, state_data={'hp': 1})
+        self.assertEqual(len(self.cells.states), 2)
+
+    def test_records_round_trip(self):
+        self.cells.set_cell(1, 1, -1, fill=True,
+                            fill_color=pg.Color(10, 20, 30),
+                            state_data={'visited': True})
+        recs = self.cells.to_records('test_grid')
+        self.assertEqual(len(recs), 1)
+        cols = ['grid_nm_fk', 'cell_r', 'cell_c', 'cell_z', 'is_filled',
+                'fill_rgba', 'line_rgba', 'cell_text', 'state_json']
+        data = {c: [r[i] for r in recs] for i, c in enumerate(cols)}
+        loaded = GameGridCells(3, 4, 1, 2)
+        loaded.from_records('test_grid', data)
+        cell = loaded.get_cell(1, 1, -1)
+        self.assertTrue(cell['fill'])
+        self.assertEqual(cell['fill_color'], pg.Color(10, 20, 30))
+        self.assertEqual(cell['state_data'], {'visited': True})
+        self.assertFalse(loaded.touched.any())
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+import sv_server
+from sv_proxy import get_proxies
+from sv_router import PlanRouter
+from sv_sequencer import MsgRequester, MsgSequencer
+from sv_sequencer import start_bench_service, stop_bench_service
+from sv_supervisor import SvcSupervisor
+
+SVC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "schema", "svc_schema.json")
+
+
+class TestSvcPorts(unittest.TestCase):
+
+    def setUp(self):
+        with open(SVC_PATH, 'r') as f:
+            self.svc_text = f.read()
+
+    def check_backends(self, p_proxies, p_services):
+        by_name: dict = dict()
+        for s in p_services:
+            by_name.setdefault(s.name.split(':')[0], []).append(s.port)
+        self.assertTrue(p_proxies)
+        for px in p_proxies:
+            c_nm, p_typ = px.name.rsplit('_', 1)
+            self.assertEqual([b.port for b in px.backends],
+                             by_name[f"/{c_nm}/{p_typ}"])
+
+    def test_proxy_backends_match_topology_dict(self):
+        svc = json.loads(self.svc_text)
+        services = SvcSupervisor.get_topology(
+            svc, "sv_server.py", "/tmp", "127.0.0.1")
+        self.check_backends(get_proxies(svc, p_host="127.0.0.1"), services)
+
+    def test_proxy_backends_match_topology_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            svc_path = os.path.join(tmp, "svc_schema.json")
+            with open(svc_path, 'w') as f:
+                f.write(self.svc_text)
+            services = SvcSupervisor.get_topology(
+                svc_path, "sv_server.py", tmp, "127.0.0.1")
+            # A started server holds its port; it must not be reassigned.
+            held = socket.socket()
+            held.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                held.bind(("127.0.0.1", services[0].port))
+                held.listen()
+                self.check_backends(
+                    get_proxies(svc_path, p_host="127.0.0.1"), services)
+            finally:
+                held.close()
+
+
+class TestServerRouting(unittest.TestCase):
+
+    PLANS = {"plan": {"world": {
+        "b_cast": {"type": ["event"], "action": {"tick": ["request"]}},
+        "req_resp": {"type": ["request"], "action": {"move": ["request"]}}}}}
+
+    def tearDown(self):
+        sv_server.ROUTER = None
+
+    async def route(self, p_chans: tuple) -> dict:
+        """Subscribe two clients to each channel, send one message to
+        each channel, and return how many clients got it."""
+        MS = MsgSequencer()
+        sv_server.TRACE = False
+        srv = await asyncio.start_server(sv_server.server, "127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        subs: dict = dict()
+        for chan in p_chans:
+            subs[chan] = []
+            for _ in range(2):
+                r, w = await asyncio.open_connection("127.0.0.1", port)
+                MS.write_msg(w, chan)
+                subs[chan].append((r, w))
+        r0, w0 = await asyncio.open_connection("127.0.0.1", port)
+        MS.write_msg(w0, b"/sender")
+        while sum(len(sv_server.SUBSCRIBERS.get(c, ())) for c in p_chans)\
+                < 2 * len(p_chans):
+            await asyncio.sleep(0.01)
+        for chan in p_chans:
+            MS.write_msg(w0, chan)
+            MS.write_msg(w0, b"hello")
+        got: dict = dict()
+        for chan, conns in subs.items():
+            got[chan] = 0
+            for r, _ in conns:
+                try:
+                    msg = await asyncio.wait_for(MS.read_msg(r), 0.3)
+                    got[chan] += msg == b"hello"
+                except asyncio.TimeoutError:
+                    pass
+        for _, w in [c for conns in subs.values() for c in conns] +\
+                [(r0, w0)]:
+            w.close()
+        srv.close()
+        await srv.wait_closed()
+        return got
+
+    def test_fan_out_without_router(self):
+        got = asyncio.run(self.route((b"/world/b_cast/tick/request",
+                                      b"/world/req_resp/move/request")))
+        self.assertEqual(got, {b"/world/b_cast/tick/request": 2,
+                               b"/world/req_resp/move/request": 1})
+
+    def test_fan_out_with_router(self):
+        sv_server.ROUTER = PlanRouter(self.PLANS, None)
+        got = asyncio.run(self.route((b"/world/b_cast/tick/request",
+                                      b"/world/req_resp/move/request")))
+        self.assertEqual(got, {b"/world/b_cast/tick/request": 2,
+                               b"/world/req_resp/move/request": 1})
+
+    def test_metrics_bounded(self):
+        sv_server.METRICS.clear()
+        sv_server.SUBSCRIBERS[b"/world/sub"].append(None)
+        try:
+            for i in range(1000):
+                chan = f"/junk/{i}".encode()
+                sv_server.get_chan_metrics(chan)['drops'] += 1
+            sv_server.get_chan_metrics(b"/world/sub")['msgs_out'] += 1
+            self.assertEqual(set(sv_server.METRICS),
+                             {sv_server.OTHER, b"/world/sub"})
+            self.assertEqual(
+                sv_server.METRICS[sv_server.OTHER]['drops'], 1000)
+        finally:
+            del sv_server.SUBSCRIBERS[b"/world/sub"]
+        sv_server.fold_metrics(b"/world/sub")
+        self.assertEqual(set(sv_server.METRICS), {sv_server.OTHER})
+        self.assertEqual(sv_server.METRICS[sv_server.OTHER]['msgs_out'], 1)
+        sv_server.ROUTER = PlanRouter(self.PLANS, None)
+        chan = b"/world/b_cast/tick/request"
+        sv_server.get_chan_metrics(chan)['drops'] += 1
+        sv_server.fold_metrics(chan)
+        self.assertIn(chan, sv_server.METRICS)
+
+
+class TestMsgEnvelope(unittest.TestCase):
+
+    def test_round_trip(self):
+        corr_id = bytes(range(16))
+        reply_to = b"/reply/" + b"r" * 248
+        data = MsgSequencer.pack_msg(corr_id, b"payload", reply_to)
+        self.assertEqual(MsgSequencer.unpack_msg(data),
+                         (corr_id, b"\x00", reply_to, b"payload"))
+
+    def test_bad_envelope(self):
+        with self.assertRaises(ValueError):
+            MsgSequencer.pack_msg(bytes(16), b"", b"r" * 256)
+        with self.assertRaises(ValueError):
+            MsgSequencer.pack_msg(bytes(15), b"")
+        with self.assertRaises(ValueError):
+            MsgSequencer.pack_msg(bytes(16), b"", status=b"")
+
+    def test_short_message(self):
+        with self.assertRaises(ValueError):
+            MsgSequencer.unpack_msg(b"\x00\x01")
+        data = MsgSequencer.pack_msg(bytes(16), b"", b"/reply/x")
+        with self.assertRaises(ValueError):
+            MsgSequencer.unpack_msg(data[:20])
+
+    def test_bad_frames_release_slots(self):
+        async def run():
+            service = await start_bench_service(p_max_in_flight=2)
+            MS = MsgSequencer()
+            _, w = await asyncio.open_connection("127.0.0.1", service[1])
+            MS.write_msg(w, b"/junk")
+            for _ in range(4):
+                MS.write_msg(w, b"/bench")
+                MS.write_msg(w, b"\x00\x01")
+            await w.drain()
+            req = MsgRequester(timeout=2.0)
+            await req.connect("127.0.0.1", service[1])
+            try:
+                return await req.request(b"/bench", b"ping")
+            finally:
+                w.close()
+                req.writer.close()
+                await stop_bench_service(service)
+        self.assertEqual(asyncio.run(run()), b"ping")
+
+
+if __name__ == '__main__':
+    unittest.main()
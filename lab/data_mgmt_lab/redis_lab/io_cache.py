@@ -0,0 +1,560 @@
+#!python
+"""
+:module:    io_cache.py
+:classes:   MemoryBackend, CachedBackend, Pipeline, SortedSet
+
+Storage backends for RedisIO namespaces.
+
+A backend is anything with the subset of the redis-py client API that
+RedisIO uses: get, set, mget, mset, exists, delete, keys, expire, ttl,
+flushdb, client_setname and pipeline, plus scan and the sorted-set
+commands (zadd, zrem, zrangebylex, zlexcount, zcard) used for key
+indexes. A redis.Redis connection is one;
+the classes here are the others.
+
+Main behaviors:
+
+- MemoryBackend: an in-process store for tests and single-node use.
+  Keys and values are kept as bytes, as Redis returns them, and keys
+  can expire. Sorted sets support lexical range queries. SCAN pages
+  through keys with a cursor. An optional per-request delay stands in for the network
+  round trip of a remote server.
+- CachedBackend: a read-through LRU cache in front of another backend.
+  Reads are served locally when possible and writes go through to the
+  remote store. Local entries also expire after p_max_age seconds, so
+  writes from other clients are seen eventually.
+- Pipeline: queues commands and sends them as one batch (one round
+  trip), like redis-py's pipeline().
+"""
+import bisect
+import fnmatch
+import time
+from itertools import islice
+from collections import OrderedDict
+
+
+class ResponseError(Exception):
+    """Raised for a command the backend cannot carry out."""
+    pass
+
+
+def encode(p_val) -> bytes:
+    """Encode a key or value the way redis-py does."""
+    if isinstance(p_val, bytes):
+        return p_val
+    if isinstance(p_val, str):
+        return p_val.encode('utf-8')
+    if isinstance(p_val, (int, float)) and not isinstance(p_val, bool):
+        return repr(p_val).encode('utf-8')
+    raise ResponseError(f"Cannot store {type(p_val).__name__} value")
+
+
+def lex_bound(p_bound, p_low: bool) -> tuple:
+    """Parse a ZRANGEBYLEX bound ("-", "+", "[x" or "(x").
+    :returns:
+    - (tuple) member bytes (None = unbounded), inclusive flag
+    """
+    bound = encode(p_bound)
+    if bound in (b'-', b'+'):
+        if (bound == b'-') != p_low:
+            raise ResponseError("min or max not valid string range item")
+        return None, True
+    if bound[:1] not in (b'[', b'('):
+        raise ResponseError("min or max not valid string range item")
+    return bound[1:], bound[:1] == b'['
+
+
+class SortedSet(object):
+    """Members with scores, kept in (score, member) order."""
+
+    def __init__(self):
+        self.scores: dict = dict()
+        self.order: list = list()
+
+    def add(self, p_member: bytes, p_score: float) -> int:
+        old = self.scores.get(p_member)
+        if old == p_score:
+            return 0
+        if old is not None:
+            del self.order[bisect.bisect_left(self.order, (old, p_member))]
+        self.scores[p_member] = p_score
+        bisect.insort(self.order, (p_score, p_member))
+        return 1 if old is None else 0
+
+    def remove(self, p_member: bytes) -> int:
+        old = self.scores.pop(p_member, None)
+        if old is None:
+            return 0
+        del self.order[bisect.bisect_left(self.order, (old, p_member))]
+        return 1
+
+    def lex_slice(self, p_min, p_max) -> tuple:
+        """Return the order-list index range between two lex bounds.
+        As in Redis, this assumes all members have the same score.
+        """
+        score = self.order[0][0] if self.order else 0
+        low, low_incl = lex_bound(p_min, True)
+        high, high_incl = lex_bound(p_max, False)
+        i = 0 if low is None else (
+            bisect.bisect_left if low_incl else bisect.bisect_right)(
+                self.order, (score, low))
+        j = len(self.order) if high is None else (
+            bisect.bisect_right if high_incl else bisect.bisect_left)(
+                self.order, (score, high))
+        return i, max(i, j)
+
+
+class Pipeline(object):
+    """Queue commands for a backend and run them as one batch."""
+
+    COMMANDS = ('get', 'set', 'mget', 'mset', 'exists', 'delete',
+                'expire', 'ttl', 'zadd', 'zrem', 'zrangebylex')
+
+    def __init__(self, p_backend):
+        self.backend = p_backend
+        self.cmds: list = list()
+
+    def __getattr__(self, p_name):
+        if p_name not in self.COMMANDS:
+            raise AttributeError(p_name)
+
+        def queue(*args, **kwargs):
+            self.cmds.append((p_name, args, kwargs))
+            return self
+        return queue
+
+    def __len__(self):
+        return len(self.cmds)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cmds.clear()
+
+    def execute(self) -> list:
+        """Send the queued commands and return their results."""
+        cmds, self.cmds = self.cmds, list()
+        return self.backend.execute_batch(cmds) if cmds else []
+
+
+class MemoryBackend(object):
+    """In-process stand-in for one Redis namespace (DB)."""
+
+    def __init__(self, p_latency: float = 0.0):
+        """
+        :args:
+        - p_latency (float): seconds to wait per request, to mimic the
+            round trip to a remote server. A pipeline waits once.
+        """
+        self.data: dict = dict()
+        self.expires: dict = dict()
+        self.name = None
+        self.latency = p_latency
+        self.in_batch = False
+        self.stats = {'round_trips': 0}
+
+    def round_trip(self):
+        """Count (and, if set, wait for) one request."""
+        if not self.in_batch:
+            self.stats['round_trips'] += 1
+            if self.latency:
+                time.sleep(self.latency)
+
+    def is_live(self, p_key: bytes) -> bool:
+        """Drop the key if it has expired; return True if it exists."""
+        deadline = self.expires.get(p_key)
+        if deadline is not None and deadline <= time.monotonic():
+            del self.data[p_key]
+            del self.expires[p_key]
+        return p_key in self.data
+
+    # Admin
+    # =========================================================================
+    def ping(self) -> bool:
+        self.round_trip()
+        return True
+
+    def client_setname(self, p_name: str) -> bool:
+        self.round_trip()
+        self.name = p_name
+        return True
+
+    def flushdb(self) -> bool:
+        self.round_trip()
+        self.data.clear()
+        self.expires.clear()
+        return True
+
+    # Commands
+    # =========================================================================
+    def get(self, p_key):
+        self.round_trip()
+        key = encode(p_key)
+        if not self.is_live(key):
+            return None
+        if isinstance(self.data[key], SortedSet):
+            raise ResponseError("WRONGTYPE Operation against a key " +
+                                "holding the wrong kind of value")
+        return self.data[key]
+
+    def mget(self, p_keys, *args) -> list:
+        self.round_trip()
+        keys = [encode(k) for k in
+                ([p_keys] if isinstance(p_keys, (str, bytes)) else p_keys)]
+        keys += [encode(k) for k in args]
+        return [self.data[k] if self.is_live(k) and
+                isinstance(self.data[k], bytes) else None for k in keys]
+
+    def set(self, p_key, p_value,
+            ex: int = None, px: int = None,
+            nx: bool = False, xx: bool = False):
+        """Store a value. Returns True, or None if nx/xx was not met."""
+        self.round_trip()
+        key = encode(p_key)
+        live = self.is_live(key)
+        if (nx and live) or (xx and not live):
+            return None
+        self.data[key] = encode(p_value)
+        self.expires.pop(key, None)
+        if ex:
+            self.expires[key] = time.monotonic() + ex
+        elif px:
+            self.expires[key] = time.monotonic() + px / 1000
+        return True
+
+    def mset(self, p_mapping: dict) -> bool:
+        self.round_trip()
+        for k, v in p_mapping.items():
+            key = encode(k)
+            self.data[key] = encode(v)
+            self.expires.pop(key, None)
+        return True
+
+    def exists(self, *p_keys) -> int:
+        self.round_trip()
+        return sum(1 for k in p_keys if self.is_live(encode(k)))
+
+    def delete(self, *p_keys) -> int:
+        self.round_trip()
+        count = 0
+        for k in p_keys:
+            key = encode(k)
+            if self.is_live(key):
+                del self.data[key]
+                self.expires.pop(key, None)
+                count += 1
+        return count
+
+    def keys(self, p_pattern='*') -> list:
+        self.round_trip()
+        pattern = encode(p_pattern)
+        return [k for k in list(self.data)
+                if self.is_live(k) and fnmatch.fnmatchcase(k, pattern)]
+
+    def expire(self, p_key, p_secs: int) -> bool:
+        self.round_trip()
+        key = encode(p_key)
+        if not self.is_live(key):
+            return False
+        self.expires[key] = time.monotonic() + p_secs
+        return True
+
+    def ttl(self, p_key) -> int:
+        """Seconds to live; -1 if no expiry, -2 if no such key."""
+        self.round_trip()
+        key = encode(p_key)
+        if not self.is_live(key):
+            return -2
+        if key not in self.expires:
+            return -1
+        return round(self.expires[key] - time.monotonic())
+
+    def scan(self, cursor: int = 0, match=None, count: int = None) -> tuple:
+        """Return (next cursor, keys) for about `count` keys from
+        `cursor` on; the next cursor is 0 when done. Keys added during
+        a scan may or may not be returned, as with Redis.
+        """
+        self.round_trip()
+        count = count or 10
+        batch = list(islice(self.data, cursor, cursor + count))
+        keys = [k for k in batch if self.is_live(k) and
+                (match is None or fnmatch.fnmatchcase(k, encode(match)))]
+        return (0 if len(batch) < count else cursor + count), keys
+
+    def scan_iter(self, match=None, count: int = None):
+        cursor = None
+        while cursor != 0:
+            cursor, keys = self.scan(cursor or 0, match, count)
+            yield from keys
+
+    # Sorted sets
+    # =========================================================================
+    def get_zset(self, p_key, p_create: bool = False):
+        key = encode(p_key)
+        if not self.is_live(key):
+            if not p_create:
+                return None
+            self.data[key] = SortedSet()
+        zset = self.data[key]
+        if not isinstance(zset, SortedSet):
+            raise ResponseError("WRONGTYPE Operation against a key " +
+                                "holding the wrong kind of value")
+        return zset
+
+    def zadd(self, p_key, p_mapping: dict) -> int:
+        self.round_trip()
+        zset = self.get_zset(p_key, True)
+        return sum(zset.add(encode(m), float(s)) for m, s in p_mapping.items())
+
+    def zrem(self, p_key, *p_members) -> int:
+        self.round_trip()
+        zset = self.get_zset(p_key)
+        if zset is None:
+            return 0
+        count = sum(zset.remove(encode(m)) for m in p_members)
+        if not zset.scores:
+            del self.data[encode(p_key)]
+        return count
+
+    def zcard(self, p_key) -> int:
+        self.round_trip()
+        zset = self.get_zset(p_key)
+        return 0 if zset is None else len(zset.scores)
+
+    def zrangebylex(self, p_key, p_min, p_max,
+                    start: int = None, num: int = None) -> list:
+        self.round_trip()
+        zset = self.get_zset(p_key)
+        if zset is None:
+            return []
+        i, j = zset.lex_slice(p_min, p_max)
+        if start is not None:
+            i = min(j, i + start)
+            if num is not None and num >= 0:
+                j = min(j, i + num)
+        return [m for _, m in zset.order[i:j]]
+
+    def zlexcount(self, p_key, p_min, p_max) -> int:
+        self.round_trip()
+        zset = self.get_zset(p_key)
+        if zset is None:
+            return 0
+        i, j = zset.lex_slice(p_min, p_max)
+        return j - i
+
+    # Batches
+    # =========================================================================
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        return Pipeline(self)
+
+    def execute_batch(self, p_cmds: list) -> list:
+        """Run queued commands in one request. Nothing else runs in
+        between, so a batch is also a transaction.
+        """
+        self.round_trip()
+        self.in_batch = True
+        try:
+            return [getattr(self, nm)(*args, **kwargs)
+                    for nm, args, kwargs in p_cmds]
+        finally:
+            self.in_batch = False
+
+
+class CachedBackend(object):
+    """Read-through LRU cache in front of another backend."""
+
+    MISSING = object()
+
+    def __init__(self,
+                 p_remote,
+                 p_size: int = 1024,
+                 p_max_age: float = 5.0):
+        """
+        :args:
+        - p_remote: backend to cache, e.g. redis.Redis or MemoryBackend
+        - p_size (int): most keys to keep locally
+        - p_max_age (float): seconds a local entry is trusted for
+        """
+        self.remote = p_remote
+        self.size = p_size
+        self.max_age = p_max_age
+        self.lru: OrderedDict = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def __getattr__(self, p_name):
+        """Pass other commands (keys, ttl, ping, ...) to the remote."""
+        return getattr(self.remote, p_name)
+
+    def lookup(self, p_key: bytes):
+        """Return the cached value (None for a known miss) or MISSING."""
+        entry = self.lru.get(p_key)
+        if entry is None or entry[1] <= time.monotonic():
+            self.lru.pop(p_key, None)
+            self.stats['misses'] += 1
+            return self.MISSING
+        self.lru.move_to_end(p_key)
+        self.stats['hits'] += 1
+        return entry[0]
+
+    def store(self, p_key: bytes, p_value, p_ttl: float = None):
+        """Cache a value (None records that the key does not exist)."""
+        age = self.max_age if p_ttl is None else min(p_ttl, self.max_age)
+        self.lru[p_key] = (p_value, time.monotonic() + age)
+        self.lru.move_to_end(p_key)
+        while len(self.lru) > self.size:
+            self.lru.popitem(last=False)
+
+    def forget(self, *p_keys):
+        for k in p_keys:
+            self.lru.pop(encode(k), None)
+
+    # Reads
+    # =========================================================================
+    def get(self, p_key):
+        key = encode(p_key)
+        value = self.lookup(key)
+        if value is self.MISSING:
+            value = self.remote.get(key)
+            self.store(key, value)
+        return value
+
+    def mget(self, p_keys, *args) -> list:
+        """Serve what is cached; fetch the rest with one MGET."""
+        keys = [encode(k) for k in
+                ([p_keys] if isinstance(p_keys, (str, bytes)) else p_keys)]
+        keys += [encode(k) for k in args]
+        values = [self.lookup(k) for k in keys]
+        missed = [k for k, v in zip(keys, values) if v is self.MISSING]
+        if missed:
+            fetched = dict(zip(missed, self.remote.mget(missed)))
+            for k, v in fetched.items():
+                self.store(k, v)
+            values = [fetched[k] if v is self.MISSING else v
+                      for k, v in zip(keys, values)]
+        return values
+
+    # Writes go through
+    # =========================================================================
+    def set(self, p_key, p_value, ex: int = None, px: int = None,
+            nx: bool = False, xx: bool = False):
+        result = self.remote.set(p_key, p_value, ex=ex, px=px, nx=nx, xx=xx)
+        self.after('set', (p_key, p_value),
+                   {'ex': ex, 'px': px, 'nx': nx, 'xx': xx}, result)
+        return result
+
+    def mset(self, p_mapping: dict) -> bool:
+        result = self.remote.mset(p_mapping)
+        self.after('mset', (p_mapping,), {}, result)
+        return result
+
+    def delete(self, *p_keys) -> int:
+        self.forget(*p_keys)
+        return self.remote.delete(*p_keys)
+
+    def expire(self, p_key, p_secs: int) -> bool:
+        self.forget(p_key)
+        return self.remote.expire(p_key, p_secs)
+
+    def flushdb(self):
+        self.lru.clear()
+        return self.remote.flushdb()
+
+    def after(self, p_cmd: str, p_args: tuple, p_kwargs: dict, p_result):
+        """Update the local cache for a command the remote ran."""
+        if p_cmd == 'set':
+            key = encode(p_args[0])
+            if p_result:
+                ex, px = p_kwargs.get('ex'), p_kwargs.get('px')
+                self.store(key, encode(p_args[1]),
+                           ex or (px / 1000 if px else None))
+            else:
+                self.lru.pop(key, None)
+        elif p_cmd == 'mset':
+            for k, v in p_args[0].items():
+                self.store(encode(k), encode(v))
+        elif p_cmd == 'get':
+            self.store(encode(p_args[0]), p_result)
+        elif p_cmd == 'expire':
+            self.forget(p_args[0])
+        elif p_cmd == 'delete':
+            self.forget(*p_args)
+
+    # Batches
+    # =========================================================================
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        return Pipeline(self)
+
+    def execute_batch(self, p_cmds: list) -> list:
+        """Send queued commands to the remote in one pipeline."""
+        pipe = self.remote.pipeline()
+        for nm, args, kwargs in p_cmds:
+            getattr(pipe, nm)(*args, **kwargs)
+        results = pipe.execute()
+        for (nm, args, kwargs), result in zip(p_cmds, results):
+            self.after(nm, args, kwargs, result)
+        return results
+
+
+def benchmark_backends(p_count: int = 2000,
+                       p_batch: int = 100,
+                       p_latency: float = 0.0002,
+                       p_size: int = 512) -> dict:
+    """Measure ops/sec for each backend: single GET and SET, batched
+    MGET and MSET, and repeated reads of a hot key set.
+    The "remote" backends are a MemoryBackend waiting p_latency per
+    request, plus a real Redis on localhost:6379 if the redis module
+    is installed and a server answers.
+    :returns:
+    - (dict) ops/sec by backend and operation
+    """
+    backends = {'memory': lambda: MemoryBackend(),
+                'remote_stand_in': lambda: MemoryBackend(p_latency),
+                'cached_stand_in': lambda: CachedBackend(
+                    MemoryBackend(p_latency), p_size=p_count)}
+    try:
+        import redis
+        redis.Redis(db=15).ping()
+        backends['redis'] = lambda: redis.Redis(db=15)
+        backends['cached_redis'] = lambda: CachedBackend(
+            redis.Redis(db=15), p_size=p_count)
+    except Exception:
+        pass
+    value = b'x' * p_size
+    keys = [f"bench:{i}" for i in range(p_count)]
+    hot = keys[:max(1, p_count // 20)]
+    result = {}
+    for nm, make in backends.items():
+        store = make()
+        store.flushdb()
+        ops = {}
+        t0 = time.perf_counter()
+        for k in keys:
+            store.set(k, value)
+        ops['set'] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for k in keys:
+            store.get(k)
+        ops['get'] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for i in range(0, p_count, p_batch):
+            store.mset({k: value for k in keys[i:i + p_batch]})
+        ops['mset'] = time.perf_counter() - t0
+        if isinstance(store, CachedBackend):
+            store.lru.clear()
+        t0 = time.perf_counter()
+        for i in range(0, p_count, p_batch):
+            store.mget(keys[i:i + p_batch])
+        ops['mget'] = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for i in range(p_count):
+            store.get(hot[i % len(hot)])
+        ops['get_hot'] = time.perf_counter() - t0
+        result[nm] = {op: int(p_count / secs) for op, secs in ops.items()}
+        store.flushdb()
+    return result
+
+
+if __name__ == '__main__':
+    from pprint import pprint
+    pprint(benchmark_backends())
@@ -75,19 +75,51 @@ Main behaviors:
         - In seconds from now (TTL k) <-- works
         - In milliseconds from now (PTTL k) <-- works
         - As a Unix timestamp (EXPIRETIME k) <-- does not seem to work
+
+- Storage backend per namespace (see io_cache):
+    - "redis" - a redis.Redis connection (default)
+    - "memory" - in-process MemoryBackend, for tests and single node
+    - Either can sit behind a read-through LRU (CachedBackend).
+    - Batches use MGET and pipelines, one round trip each.
+
+- Key index: each namespace keeps a sorted set (IDX_KEY) of its
+  record keys, updated in the same pipeline as every insert, update
+  and archive. Key searches read it page by page with ZRANGEBYLEX
+  from the pattern's literal prefix, instead of KEYS. A namespace
+  without an index is searched with SCAN until build_index is run.
+  Entries for expired keys are pruned as pages are read; writes with
+  an expiry set EXP_KEY, so count_keys knows it cannot trust the
+  index count alone.
+
+- Version history: every version written (outside `log`) is kept in
+  the `log` namespace by a VersionStore (io_versions). Records are
+  stored as deduplicated field chunks plus a delta per version,
+  rather than a full archive copy per update. Any version can be
+  rebuilt with get_record_version.
 """
 import datetime
+import fnmatch
 import hashlib
 import json
-import redis
 import secrets
 import uuid
+import time
 import zlib
 
 from copy import copy
+from pathlib import Path
 from pprint import pprint as pp  # noqa: F401
 
+from sandbox.io_cache import CachedBackend, MemoryBackend
 from sandbox.io_config import ConfigIO
+from sandbox.io_versions import VersionStore
+
+try:
+    import redis
+    from redis.exceptions import ResponseError
+except ImportError:
+    redis = None
+    from sandbox.io_cache import ResponseError
 
 CI = ConfigIO()
 
@@ -95,16 +127,39 @@ CI = ConfigIO()
 class RedisIO(object):
     """Generic Redis handling."""
 
-    def __init__(self):
-        """Initialize Redis connections."""
+    IDX_KEY = "_idx:keys"   # cannot clash: record keys never start "_"
+    EXP_KEY = "_idx:expires"    # set once a namespace has expiring keys
+    PAGE_SIZE = 100
+    HASH_SKIP = ("audit", "hash", "token", "update_ts", "version")
+
+    def __init__(self,
+                 p_backend: str = "redis",
+                 p_cache_size: int = 0):
+        """Initialize Redis connections.
+
+        :args:
+        - p_backend (str): "redis" or "memory"
+        - p_cache_size (int): if > 0, keep up to this many records
+            per namespace in a local read-through LRU cache
+        """
         self.HOST = '127.0.0.1'
         self.PORT = 6379
         self.RNS = dict()  # associate DB names to Namespaces, connections
+        if p_backend == "redis" and redis is None:
+            raise ImportError("redis module is not installed; " +
+                              "use p_backend='memory'")
         for db_no, db_nm in enumerate(
                 ["basement", "schema", "harvest", "log", "monitor"]):
-            self.RNS[db_nm] = redis.Redis(
-                host=self.HOST, port=self.PORT, db=db_no)
-            self.RNS[db_nm].client_setname(db_nm)
+            if p_backend == "memory":
+                store = MemoryBackend()
+            else:
+                store = redis.Redis(host=self.HOST, port=self.PORT, db=db_no)
+            store.client_setname(db_nm)
+            if p_cache_size > 0:
+                store = CachedBackend(store, p_cache_size)
+            self.RNS[db_nm] = store
+        self.VS = VersionStore(self.RNS["log"], self.IDX_KEY)
+        self.set_constants()
 
     # Helper functions
     # =========================================================================
@@ -219,22 +274,143 @@ class RedisIO(object):
     def list_all_keys(self,
                       p_db_nm: str) -> list:
         """List all keys available in specified DB."""
-        return self.RNS[p_db_nm].get('KEYS *')
+        return self.find_keys(p_db_nm, '*')
 
     # Generic DDL functions
     # =========================================================================
+    @classmethod
+    def get_key_prefix(cls,
+                       p_key_pattern) -> tuple:
+        """Split a glob pattern into its literal prefix, up to the
+        first wildcard, and the pattern itself, both as bytes.
+        e.g. "meta:win*" -> (b"meta:win", b"meta:win*")
+        """
+        pattern = p_key_pattern.encode('utf-8') \
+            if isinstance(p_key_pattern, str) else p_key_pattern
+        for ix, char in enumerate(pattern):
+            if char in b"*?[\\":
+                return pattern[:ix], pattern
+        return pattern, pattern
+
+    def has_index(self,
+                  p_db: str) -> bool:
+        """Return True if the namespace has a key index."""
+        return self.RNS[p_db].exists(self.IDX_KEY) > 0
+
+    def build_index(self,
+                    p_db: str,
+                    p_batch: int = 1000) -> int:
+        """(Re-)build the key index of a namespace with SCAN.
+        Does not block the server: each SCAN and ZADD covers one batch.
+        :returns:
+        - (int) number of keys indexed
+        """
+        store = self.RNS[p_db]
+        count = 0
+        cursor = None
+        while cursor != 0:
+            cursor, keys = store.scan(cursor or 0, count=p_batch)
+            keys = [k for k in keys if not k.startswith(b"_idx:")]
+            if keys:
+                store.zadd(self.IDX_KEY, {k: 0 for k in keys})
+                count += len(keys)
+        return count
+
+    def page_keys(self,
+                  p_db: str,
+                  p_key_pattern: str,
+                  p_cursor: tuple = None,
+                  p_count: int = None) -> tuple:
+        """Return one page of keys matching a glob pattern.
+
+        With an index, keys come back in order, read by ZRANGEBYLEX
+        from the pattern's literal prefix, so "meta:win*" only reads
+        keys starting "meta:win". Without one, SCAN is used and each
+        page is sorted on its own.
+
+        :args:
+        - p_db (str) name of the Redis namespace
+        - p_key_pattern (str) Redis glob pattern
+        - p_cursor (tuple) None for the first page, else the cursor
+            returned with the previous page
+        - p_count (int) keys to read per page, default PAGE_SIZE
+        :returns:
+        - (tuple) list of keys (bytes), cursor for the next page or
+            None if there are no more
+        """
+        store = self.RNS[p_db]
+        count = p_count or self.PAGE_SIZE
+        if p_cursor is None:
+            p_cursor = ("idx", b"") if self.has_index(p_db) else ("scan", 0)
+        mode, pos = p_cursor
+        keys: list = list()
+        if mode == "scan":
+            while len(keys) < count:
+                pos, batch = store.scan(pos, match=p_key_pattern, count=count)
+                keys += [k for k in batch if not k.startswith(b"_idx:")]
+                if pos == 0:
+                    break
+            return sorted(keys), (None if pos == 0 else ("scan", pos))
+        prefix, pattern = self.get_key_prefix(p_key_pattern)
+        high = b"[" + prefix + b"\xff" if prefix else b"+"
+        done = False
+        while len(keys) < count and not done:
+            low = b"(" + pos if pos else (b"[" + prefix if prefix else b"-")
+            batch = store.zrangebylex(self.IDX_KEY, low, high, 0, count)
+            done = len(batch) < count
+            if batch:
+                pos = batch[-1]
+                keys += [k for k in batch if fnmatch.fnmatchcase(k, pattern)]
+        return self.drop_stale_keys(p_db, keys), \
+            (None if done else ("idx", pos))
+
+    def drop_stale_keys(self,
+                        p_db: str,
+                        p_keys: list) -> list:
+        """Remove index entries whose records have expired or been
+        deleted; return the keys that still exist. One round trip."""
+        if not p_keys:
+            return p_keys
+        pipe = self.RNS[p_db].pipeline()
+        for k in p_keys:
+            pipe.exists(k)
+        found = pipe.execute()
+        stale = [k for k, n in zip(p_keys, found) if not n]
+        if stale:
+            self.RNS[p_db].zrem(self.IDX_KEY, *stale)
+        return [k for k, n in zip(p_keys, found) if n]
+
     def find_keys(self,
                   p_db: str,
                   p_key_pattern: str):
-        """Return keys of records that match search pattern."""
-        return self.RNS[p_db].keys(p_key_pattern)
+        """Return keys of records that match search pattern.
+        Reads the key index a page at a time (or SCANs); never KEYS.
+        """
+        keys: list = list()
+        cursor = None
+        while True:
+            page, cursor = self.page_keys(p_db, p_key_pattern, cursor)
+            keys += page
+            if cursor is None:
+                return keys
 
     def count_keys(self,
                    p_db: str,
                    p_key_pattern: str):
-        """Return number of keys that match search pattern."""
-        keys = self.find_keys(p_db, p_key_pattern)
-        return len(keys)
+        """Return number of keys that match search pattern.
+        A plain prefix pattern ("meta:*") is counted with ZLEXCOUNT,
+        unless the namespace has expiring keys (EXP_KEY); then keys
+        are counted page by page, which prunes expired entries.
+        Keys deleted other than through RedisIO are still counted
+        until they are paged over or build_index is run.
+        """
+        prefix, pattern = self.get_key_prefix(p_key_pattern)
+        if pattern == prefix + b"*" and self.has_index(p_db) and\
+                not self.RNS[p_db].exists(self.EXP_KEY):
+            return self.RNS[p_db].zlexcount(
+                self.IDX_KEY, b"[" + prefix if prefix else b"-",
+                b"[" + prefix + b"\xff" if prefix else b"+")
+        return len(self.find_keys(p_db, p_key_pattern))
 
     def get_record(self,
                    p_db: str,
@@ -251,11 +427,23 @@ class RedisIO(object):
         - Q: Can this function return more than one record? In other
              words, can I pass in a Redis "wildcard" key?
         """
-        rec = None
-        if self.RNS[p_db].exists(p_key_val):               # type: ignore
-            redis_result = self.RNS[p_db].get(p_key_val)
-            rec = self.convert_bytes_to_dict(redis_result)
-        return rec
+        redis_result = self.RNS[p_db].get(p_key_val)
+        if redis_result is None:
+            return None
+        return self.convert_bytes_to_dict(redis_result)
+
+    def get_records(self,
+                    p_db: str,
+                    p_keys: list) -> list:
+        """Return records for a list of keys with one MGET.
+
+        :Returns:
+        - (list) record dicts, None where a key does not exist
+        """
+        if not p_keys:
+            return []
+        return [None if r is None else self.convert_bytes_to_dict(r)
+                for r in self.RNS[p_db].mget(list(p_keys))]
 
     def get_values(self, record):
         """Return only the values of a record."""
@@ -281,11 +469,22 @@ class RedisIO(object):
             dict - record with audit values set or modified,
             bool - indicates whether to do update (True) or insert (False))
         """
+        exists = self.get_record(p_db, p_data_rec["name"])
+        return self.set_audit(p_data_rec, exists, p_include_hash)
+
+    def set_audit(self,
+                  p_data_rec: dict,
+                  p_old_rec: dict = None,
+                  p_include_hash: bool = True) -> tuple:
+        """Set audit values for a record, given the stored version
+        of it (None if new), without reading from Redis.
+        :returns: as for set_audit_values
+        """
         data_rec = p_data_rec
         r_update = False
-        exists = self.get_record(p_db, data_rec["name"])
+        exists = p_old_rec
         if exists is not None and 'audit' in exists:
-            audit = exists["audit"]
+            audit = dict(exists["audit"])
             audit["version"] = self.set_version(audit["version"], "minor")
             data_rec["audit"] = audit
             r_update = True
@@ -310,8 +509,14 @@ class RedisIO(object):
         """
         try:
             values = self.convert_dict_to_bytes(p_rec)
-            self.RNS[p_db].set(p_rec["name"], values, nx=True)
-        except redis.exceptions.ResponseError as e:
+            pipe = self.RNS[p_db].pipeline()
+            pipe.set(p_rec["name"], values, nx=True,
+                     ex=self.get_expire_secs(p_expire))
+            pipe.zadd(self.IDX_KEY, {p_rec["name"]: 0})
+            if p_expire > 0:
+                pipe.set(self.EXP_KEY, 1)
+            pipe.execute()
+        except ResponseError as e:
             # Write to log instead of raise exception?
             # But.. have to watch out for catch-22 if log is on Redis! :-)
             print(f"\nRedis error: {e}")
@@ -319,15 +524,32 @@ class RedisIO(object):
             print(f"\nRecord name: {p_rec['name']}")
             print(f"\nRecord namespace/db: {p_db}")
             raise e
-        self.do_expire(p_db, p_rec["name"], p_expire)
+        self.do_archive(p_db, p_rec)
 
     def do_archive(self,
+                   p_db: str,
                    p_rec: dict):
-        """Copy/archive record to `log` namespace."""
-        log_rec = p_rec
-        log_rec["name"] = "archive:" + p_rec["name"] + \
-            ":" + self.get_timestamp()
-        self.do_insert("log", log_rec)
+        """Add record to its version history in `log` namespace.
+        Only chunks and fields not already stored are written; a
+        record equal to the latest version is not stored again.
+        """
+        if p_rec is not None and p_db != "log":
+            self.VS.put(f"{p_db}:{p_rec['name']}", p_rec)
+
+    def get_record_version(self,
+                           p_db: str,
+                           p_key_val: str,
+                           p_version: int = None):
+        """Return a version of a record from its version history.
+
+        :Args:
+        - p_db (str) name of the Redis namespace
+        - p_key_val (str) key value of the record
+        - p_version (int) 1 = first version; default = latest
+        :Returns:
+        - rec (dict) - record data, or None
+        """
+        return self.VS.get(f"{p_db}:{p_key_val}", p_version)
 
     def do_update(self,
                   p_db: str,
@@ -335,18 +557,110 @@ class RedisIO(object):
                   p_expire: int = 0):
         """Update a record on Redis"""
         old_rec = self.get_record(p_db, p_rec["name"])
-        self.do_archive(old_rec)
+        self.do_archive(p_db, old_rec)
         try:
             values = self.convert_dict_to_bytes(p_rec)
-            self.RNS[p_db].set(p_rec["name"], values, xx=True)
-        except redis.exceptions.ResponseError as e:
+            pipe = self.RNS[p_db].pipeline()
+            pipe.set(p_rec["name"], values, xx=True,
+                     ex=self.get_expire_secs(p_expire))
+            pipe.zadd(self.IDX_KEY, {p_rec["name"]: 0})
+            if p_expire > 0:
+                pipe.set(self.EXP_KEY, 1)
+            pipe.execute()
+        except ResponseError as e:
             # Write to log instead of raise exception
             print(f"\nRedis error: {e}")
             print(f"\nRecord: {p_rec}")
             print(f"\nRecord name: {p_rec['name']}")
             print(f"\nRecord namespace/db: {p_db}")
             raise e
-        self.do_expire(p_db, p_rec["name"], p_expire)
+        self.do_archive(p_db, p_rec)
+
+    @classmethod
+    def get_expire_secs(cls,
+                        p_expire: int = 0):
+        """Convert an expiry in hours to seconds, None if not > 0."""
+        return int(p_expire * 3600) if p_expire > 0 else None
+
+    def upsert_records(self,
+                       p_db: str,
+                       p_recs: list,
+                       p_expire: int = 0,
+                       p_include_hash: bool = True) -> list:
+        """Insert or update a batch of records.
+        Reads the stored versions with one MGET (none at all if they
+        are in the local cache), then writes every record in one
+        pipeline. The new versions are added to the version history
+        in `log` with one more read and pipeline, since that is a
+        different namespace.
+
+        :args:
+        - p_db (str) name of the Redis namespace
+        - p_recs (list) record dicts, each with a "name" key
+        - p_expire (int) hours to keep the records; 0 = no expiry
+        - p_include_hash (bool) include hash of record in audit values
+        :returns:
+        - (list) of (record, was_update) tuples
+        :raises:
+        - ResponseError if a record was created or deleted by another
+            client between the read and the write
+        """
+        if not p_recs:
+            return []
+        old_recs = self.get_records(p_db, [r["name"] for r in p_recs])
+        result = [self.set_audit(rec, old, p_include_hash)
+                  for rec, old in zip(p_recs, old_recs)]
+        return self.write_records(p_db, result, old_recs, p_expire)
+
+    def write_records(self,
+                      p_db: str,
+                      p_result: list,
+                      p_old_recs: list,
+                      p_expire: int = 0) -> list:
+        """Write records whose audit values are set, in one pipeline,
+        then add them to the version history. See upsert_records.
+        :args:
+        - p_result (list) of (record, was_update) tuples
+        - p_old_recs (list) stored versions, None where new
+        """
+        result, old_recs = p_result, p_old_recs
+        if not result:
+            return []
+        ex = self.get_expire_secs(p_expire)
+        pipe = self.RNS[p_db].pipeline()
+        for rec, do_update in result:
+            pipe.set(rec["name"], self.convert_dict_to_bytes(rec), ex=ex,
+                     nx=not do_update, xx=do_update)
+        pipe.zadd(self.IDX_KEY, {rec["name"]: 0 for rec, _ in result})
+        if ex is not None:
+            pipe.set(self.EXP_KEY, 1)
+        written = pipe.execute()[:len(result)]
+        if p_db != "log":
+            # The replaced version goes first; it is skipped if it is
+            # already the latest in the history, as it normally is.
+            self.VS.put_many(
+                [(f"{p_db}:{r['name']}", r)
+                 for (rec, _), old, ok in zip(result, old_recs, written)
+                 if ok for r in (old, rec) if r is not None])
+        failed = [rec["name"] for (rec, _), ok in zip(result, written)
+                  if not ok]
+        if failed:
+            raise ResponseError(f"Records changed during upsert: {failed}")
+        return result
+
+    def upsert_record(self,
+                      p_db: str,
+                      p_rec: dict,
+                      p_expire: int = 0,
+                      p_include_hash: bool = True) -> tuple:
+        """Insert or update one record. See upsert_records.
+        With the record cached, this is a single write round trip
+        (plus the version history read and write).
+        :returns:
+        - (tuple) record with audit values, was_update
+        """
+        return self.upsert_records(
+            p_db, [p_rec], p_expire, p_include_hash)[0]
 
     # Bespoke DML-type functions
     # =======================================
@@ -366,12 +680,8 @@ class RedisIO(object):
         - p_write_msg (bool) - Write message to console
         """
         db = CI.txt.ns_db_basement
-        db_rec, do_update = self.set_audit_values(
+        db_rec, _ = self.upsert_record(
             db, {"name": "config:" + p_name, p_name: p_value})
-        if do_update:
-            self.do_update(db, db_rec)
-        else:
-            self.do_insert(db, db_rec)
         if p_write_msg:
             print(f"{CI.txt.val_ok} " +
                   f"{CI.txt.ns_db_basement}.{db_rec['name']} " +
@@ -386,6 +696,7 @@ class RedisIO(object):
                           Example: {"window" : {"hint": "some text", ...}}
         """
         db = "basement"
+        recs: list = list()
         for k, values in p_data.items():
             key = self.clean_redis_key(f"meta:{k}")
             # Unfortunately, the bar ('|') to merge dictionaries,
@@ -396,12 +707,8 @@ class RedisIO(object):
             data_rec = {**key_dict, **values}
             # python3.9 or greater:
             # data_rec = {"name": key} | values
-            db_rec, update = \
-                self.set_audit_values(db, data_rec, p_include_hash=True)
-            if update:
-                self.do_update(db, db_rec)
-            else:
-                self.do_insert(db, db_rec)
+            recs.append(data_rec)
+        self.upsert_records(db, recs, p_include_hash=True)
 
     def get_app_path(self):
         """Return full path of the application as a string."""
@@ -423,10 +730,9 @@ class RedisIO(object):
         db = "basement"
         keys: list = self.find_keys(db, "config:*")
         data: dict = {}
-        for k in keys:
+        for k, rec in zip(keys, self.get_records(db, keys)):
             key = k.decode('utf-8').replace("config:", "")
-            record = self.get_values(self.get_record(db, k))
-            data[key] = record
+            data[key] = self.get_values(rec)
         return(data)
 
     def get_all_gui_meta(self):
@@ -434,10 +740,9 @@ class RedisIO(object):
         db = "basement"
         keys: list = self.find_keys(db, "meta:*")
         data: dict = {}
-        for k in keys:
+        for k, rec in zip(keys, self.get_records(db, keys)):
             key = k.decode('utf-8').replace("meta:", "")
-            record = self.get_values(self.get_record(db, k))
-            data[key] = record
+            data[key] = self.get_values(rec)
         return(data)
 
     # Other possibly bespoke DML-type functions
@@ -638,32 +943,157 @@ class RedisIO(object):
             tuple: ("name/key token")
 
         Assign type, name, namespace, alias based on verified arguments.
-        Compute version, token and hash.
         Assemble and verify the Avro object.
+        Write it as a batch of one (upsert_schema_records), which skips
+        the write if the content hash is unchanged and sets version
+        and hash in the audit values.
         Write to Redis as compressed (zlib) string. Redis key = Avro name.
+        :returns: None if the arguments do not verify
         """
-        if self.verify_verbs_types(                          # type: ignore
+        if not self.verify_verbs_types(                      # type: ignore
                 p_ty, p_verb, p_act, p_fields):
-            new_rec = self.init_record_values(               # type: ignore
-                "schema", p_ty, p_topic, p_verb, p_act, p_doc, p_fields)
-            old_rec = self.get_record(new_rec["name"])  # type: ignore
-            nt_hash = self.hash_record(new_rec)              # type: ignore
-            ot_hash = self.hash_record(old_rec)              # type: ignore
-            up_rec = self.set_record_values(                 # type: ignore
-                    new_rec, nt_hash, old_rec)
-            if nt_hash == ot_hash:
-                print("\nNo change: ")
-                up_rec = old_rec
-            else:
-                # xx = update, nx = write
-                upsert = "xx" if len(old_rec) > 0 else "nx"
-                self.do_upsert(                      # type: ignore
-                    "schema", upsert, up_rec, old_rec)
-            # For debugging:
-            rec = self.get_record(up_rec["name"])     # type: ignore
-            pp(("rec", rec))
+            return None
+        new_rec = self.init_record_values(                   # type: ignore
+            "schema", p_ty, p_topic, p_verb, p_act, p_doc, p_fields)
+        new_rec["token"] = self.get_token()
+        new_rec["update_ts"] = self.get_timestamp()
+        result = self.upsert_schema_records("schema", [new_rec])
+        if result["unchanged"]:
+            print("\nNo change: ")
+        up_rec = result["records"][new_rec["name"]]
         return (up_rec["name"], up_rec["token"])               # type: ignore
 
+    @classmethod
+    def hash_record(cls,
+                    p_rec: dict) -> str:
+        """Return a hash of a record's content.
+        Audit and other values that change on every write (HASH_SKIP)
+        are left out, and keys are sorted, so the same content always
+        gives the same hash.
+        """
+        if not p_rec:
+            return ""
+        content = {k: v for k, v in p_rec.items() if k not in cls.HASH_SKIP}
+        return cls.get_hash(json.dumps(content, sort_keys=True))
+
+    def upsert_schema_records(self,
+                              p_db: str,
+                              p_recs: list) -> dict:
+        """Write a batch of (already verified) schema records.
+        Each record is hashed once and compared with the hash in the
+        stored version's audit values, read for the whole batch with
+        one MGET. Unchanged records are skipped; the rest are written
+        in one pipeline.
+
+        :args:
+        - p_db (str) name of the Redis namespace
+        - p_recs (list) record dicts, each with a "name" key
+        :returns:
+        - (dict) names "written" and "unchanged", and "records":
+            the stored version of every record, by name
+        """
+        report: dict = {"written": [], "unchanged": [], "records": {}}
+        if not p_recs:
+            return report
+        old_recs = self.get_records(p_db, [r["name"] for r in p_recs])
+        result, changed_old = list(), list()
+        for rec, old in zip(p_recs, old_recs):
+            new_hash = self.hash_record(rec)
+            if old is not None and \
+                    old.get("audit", {}).get("hash") == new_hash:
+                report["unchanged"].append(rec["name"])
+                report["records"][rec["name"]] = old
+                continue
+            up_rec, do_update = self.set_audit(rec, old, False)
+            up_rec["audit"]["hash"] = new_hash
+            result.append((up_rec, do_update))
+            changed_old.append(old)
+            report["written"].append(rec["name"])
+            report["records"][rec["name"]] = up_rec
+        self.write_records(p_db, result, changed_old)
+        return report
+
+    def verify_schema_file(self,
+                           p_kind: str,
+                           p_body: dict) -> tuple:
+        """Check every entry of a service schema file in one pass.
+
+        :args:
+        - p_kind (str) file's top-level key, e.g. "topic"
+        - p_body (dict) entries under that key
+        :returns:
+        - (tuple) list of records for valid entries,
+            dict of error messages by entry name
+        """
+        rules = self.schema_rules.get(p_kind)
+        if rules is None:
+            return [], {p_kind: f"Kind must be in {list(self.schema_rules)}"}
+        recs: list = list()
+        errors: dict = dict()
+        for nm, entry in p_body.items():
+            msg: list = list()
+            if not isinstance(entry, dict):
+                msg.append("entry must be a dict")
+            else:
+                items = [(nm, entry)] if rules[0] == 0 else \
+                    list(entry.items())
+                for item_nm, item in items:
+                    need = next(keys for prefix, keys in rules[1]
+                                if item_nm.startswith(prefix))
+                    if not isinstance(item, dict):
+                        msg.append(f"<{item_nm}> must be a dict")
+                        continue
+                    missing = [k for k in need if k not in item]
+                    if missing:
+                        msg.append(f"<{item_nm}> needs {missing}")
+            if msg:
+                errors[nm] = "; ".join(msg)
+            else:
+                recs.append({
+                    "name": self.clean_redis_key(f"{p_kind}:{nm}"),
+                    p_kind: {nm: entry}})
+        return recs, errors
+
+    def load_schema_files(self,
+                          p_paths: list,
+                          p_db: str = "schema") -> list:
+        """Bulk-load service schema files, e.g. s00_channels.json
+        ... s60_services.json. Each file is verified in one pass, then
+        its changed records are written in one batch.
+        Prints and returns the load time of each file.
+
+        :args:
+        - p_paths (list) paths of the JSON files, loaded in order
+        - p_db (str) name of the Redis namespace
+        :returns:
+        - (list) of dicts: file, kind, records, invalid, unchanged,
+            written, errors, secs
+        """
+        reports: list = list()
+        for f_path in p_paths:
+            t0 = time.perf_counter()
+            with open(f_path, 'r') as f:
+                data = json.load(f)
+            kind = list(data.keys())[0]
+            recs, errors = self.verify_schema_file(kind, data[kind])
+            result = self.upsert_schema_records(p_db, recs)
+            report = {"file": Path(f_path).name,
+                      "kind": kind,
+                      "records": len(data[kind]),
+                      "invalid": len(errors),
+                      "unchanged": len(result["unchanged"]),
+                      "written": len(result["written"]),
+                      "errors": errors,
+                      "secs": round(time.perf_counter() - t0, 4)}
+            reports.append(report)
+            print(f"{report['file']}: {report['written']} written, " +
+                  f"{report['unchanged']} unchanged, " +
+                  f"{report['invalid']} invalid " +
+                  f"in {report['secs'] * 1000:.1f} ms")
+            for nm, msg in errors.items():
+                print(f"  <{nm}> {msg}")
+        return reports
+
     def set_constants(self):
         """Set class constants.
 
@@ -672,6 +1102,18 @@ class RedisIO(object):
         @DEV:
         - Get this info from templates stored in Basement or Schema DBs.
         """
+        # Service schema files: (depth of items checked,
+        #   [(item-name prefix, required keys), ...]) -- first prefix
+        #   that matches wins; depth 0 = the entry, 1 = its children.
+        self.schema_rules: dict = {
+            "channel": (0, [("", ())]),
+            "topic": (1, [("", ("desc",))]),
+            "plan": (1, [("", ("type", "action"))]),
+            "client": (0, [("", ("desc", "ports"))]),
+            "router": (0, [("", ("desc", "ports", "gateway"))]),
+            "service": (1, [("request", ("client",)),
+                            ("response", ("router", "gate", "key")),
+                            ("", ("router", "gate", "key"))])}
         self.field_ty: set = ("array", "hash", "set", "string")
         self.msg_cat: set = ("owl", "redis", "sqlite", "topic")
         self.msg_plan: set = ("get", "put", "remove", "update", "meta")
@@ -692,6 +1134,7 @@ class RedisIO(object):
     def verify_verbs_types(self, p_ty: str, p_verb: str,
                            p_act: str, p_fields: list) -> bool:
         """Verify verb and fields types against Schema DB templates.
+        Prints what is wrong and returns False if any are not valid.
         @DEV:
         - Get this info from templates."""
         msg = ""
@@ -706,10 +1149,7 @@ class RedisIO(object):
                 if v not in self.field_ty:
                     msg += "\nField type must be in " +\
                                     f"{str(self.field_ty)}"
-        try:
-            if msg != "":
-                raise Exception(KeyError, msg)
-                return False
-        except KeyError as err:
-            print(err)
+        if msg != "":
+            print(msg)
+            return False
         return True
@@ -0,0 +1,248 @@
+#!python
+"""
+:module:    io_versions.py
+:class:     VersionStore
+
+Content-addressed version history for records, on any RedisIO backend
+(see io_cache).
+
+Main behaviors:
+
+- Chunk: each top-level field of a record is serialized (JSON, sorted
+  keys) and hashed. Values larger than CHUNK_SIZE bytes are split into
+  CHUNK_SIZE pieces. Each distinct chunk is stored once, compressed,
+  under vchunk:<hash>, however many versions or records use it.
+- Delta: version n of a record is a manifest, vman:<name>:<n>. It is
+  either a full manifest (field -> chunk hashes) or a delta from
+  version n-1 (fields set, fields dropped). The head, vhead:<name>,
+  holds the latest version's full field map, so a new version is
+  diffed without reading history.
+- Bounded reconstruction: a delta chain is at most MAX_CHAIN long, and
+  a full manifest is written sooner if a delta would be as large as
+  one. Each manifest names its full manifest, so any version is
+  rebuilt with three reads: its manifest, the chain (one MGET) and
+  its chunks (one MGET).
+- Writes are one read of the heads and one pipeline, for any number
+  of records. A version whose content equals the head is not stored
+  again.
+"""
+import hashlib
+import json
+import random
+import time
+import zlib
+
+
+class VersionStore(object):
+    """Store and rebuild versions of records as chunks and deltas."""
+
+    CHUNK_SIZE = 4096
+    MAX_CHAIN = 8
+
+    def __init__(self,
+                 p_store,
+                 p_index_key: str = None):
+        """
+        :args:
+        - p_store: backend for one namespace, e.g. RedisIO.RNS["log"]
+        - p_index_key (str): if set, sorted set to add vhead keys to
+        """
+        self.store = p_store
+        self.index_key = p_index_key
+        self.stats = {'chunks_new': 0, 'chunks_reused': 0,
+                      'full': 0, 'delta': 0, 'same': 0}
+
+    # Helpers
+    # =========================================================================
+    @classmethod
+    def to_bytes(cls, p_obj) -> bytes:
+        return zlib.compress(json.dumps(p_obj).encode('utf-8'))
+
+    @classmethod
+    def from_bytes(cls, p_bytes: bytes):
+        return json.loads(zlib.decompress(p_bytes))
+
+    @classmethod
+    def get_chunks(cls, p_value) -> list:
+        """Split a field value into (hash, bytes) chunks."""
+        data = json.dumps(p_value, sort_keys=True).encode('utf-8')
+        pieces = [data[i:i + cls.CHUNK_SIZE]
+                  for i in range(0, len(data), cls.CHUNK_SIZE)] or [b'']
+        return [(hashlib.blake2b(p, digest_size=16).hexdigest(), p)
+                for p in pieces]
+
+    # Write
+    # =========================================================================
+    def put_many(self,
+                 p_recs: list) -> list:
+        """Store a new version of each record.
+
+        :args:
+        - p_recs (list): (name, record dict) tuples
+        :returns:
+        - (list) version number of each record; the head's number if
+            the content did not change
+        """
+        if not p_recs:
+            return []
+        heads = [None if h is None else self.from_bytes(h) for h in
+                 self.store.mget([f"vhead:{nm}" for nm, _ in p_recs])]
+        pipe = self.store.pipeline()
+        sent: set = set()
+        result: list = list()
+        new_heads: dict = dict()
+        for (nm, rec), head in zip(p_recs, heads):
+            head = new_heads.get(nm, head)
+            fields: dict = dict()
+            known = set() if head is None else\
+                {h for hs in head["fields"].values() for h in hs}
+            for f_nm, value in rec.items():
+                chunks = self.get_chunks(value)
+                fields[f_nm] = [h for h, _ in chunks]
+                for h, piece in chunks:
+                    if h in known or h in sent:
+                        self.stats['chunks_reused'] += 1
+                    else:
+                        pipe.set(f"vchunk:{h}", zlib.compress(piece), nx=True)
+                        sent.add(h)
+                        self.stats['chunks_new'] += 1
+            if head is not None and head["fields"] == fields:
+                self.stats['same'] += 1
+                result.append(head["n"])
+                continue
+            man = self.make_manifest(head, fields)
+            n = man["n"]
+            pipe.set(f"vman:{nm}:{n}", self.to_bytes(man))
+            new_heads[nm] = {"n": n, "full": man["full"], "fields": fields}
+            pipe.set(f"vhead:{nm}", self.to_bytes(new_heads[nm]))
+            result.append(n)
+        if self.index_key and new_heads:
+            pipe.zadd(self.index_key, {f"vhead:{nm}": 0 for nm in new_heads})
+        pipe.execute()
+        return result
+
+    def put(self,
+            p_name: str,
+            p_rec: dict) -> int:
+        """Store a new version of one record. See put_many."""
+        return self.put_many([(p_name, p_rec)])[0]
+
+    def make_manifest(self,
+                      p_head: dict,
+                      p_fields: dict) -> dict:
+        """Return a delta manifest from the head, or a full one if the
+        chain is at MAX_CHAIN or the delta would not be smaller.
+        """
+        if p_head is not None:
+            n = p_head["n"] + 1
+            changed = {f: hs for f, hs in p_fields.items()
+                       if p_head["fields"].get(f) != hs}
+            dropped = [f for f in p_head["fields"] if f not in p_fields]
+            if n - p_head["full"] <= self.MAX_CHAIN and\
+                    len(changed) + len(dropped) < len(p_fields):
+                self.stats['delta'] += 1
+                return {"n": n, "full": p_head["full"],
+                        "set": changed, "drop": dropped}
+        else:
+            n = 1
+        self.stats['full'] += 1
+        return {"n": n, "full": n, "fields": p_fields}
+
+    # Read
+    # =========================================================================
+    def get_version(self,
+                    p_name: str) -> int:
+        """Return the latest version number, 0 if none."""
+        head = self.store.get(f"vhead:{p_name}")
+        return 0 if head is None else self.from_bytes(head)["n"]
+
+    def get(self,
+            p_name: str,
+            p_version: int = None) -> dict:
+        """Rebuild a version of a record.
+
+        :args:
+        - p_name (str): record name
+        - p_version (int): version number, default the latest
+        :returns:
+        - (dict) the record, or None if there is no such version
+        """
+        if p_version is None:
+            head = self.store.get(f"vhead:{p_name}")
+            if head is None:
+                return None
+            head = self.from_bytes(head)
+            fields = head["fields"]
+        else:
+            man = self.store.get(f"vman:{p_name}:{p_version}")
+            if man is None:
+                return None
+            man = self.from_bytes(man)
+            chain = [man]
+            if man["full"] != p_version:
+                chain = [self.from_bytes(m) for m in self.store.mget(
+                    [f"vman:{p_name}:{n}"
+                     for n in range(man["full"], p_version)])] + chain
+            fields = dict(chain[0]["fields"])
+            for delta in chain[1:]:
+                for f in delta["drop"]:
+                    fields.pop(f, None)
+                fields.update(delta["set"])
+        return self.get_record(fields)
+
+    def get_record(self,
+                   p_fields: dict) -> dict:
+        """Fetch the chunks of a field map (one MGET) and decode."""
+        hashes = list({h for hs in p_fields.values() for h in hs})
+        pieces = dict(zip(hashes, [zlib.decompress(c) for c in
+                                   self.store.mget(
+                                       [f"vchunk:{h}" for h in hashes])]))
+        return {f: json.loads(b''.join(pieces[h] for h in hs))
+                for f, hs in p_fields.items()}
+
+
+def benchmark_versions(p_fields: int = 200,
+                       p_versions: int = 50,
+                       p_changed: int = 3) -> dict:
+    """Store p_versions versions of a generated world record, each
+    changing p_changed fields, as full snapshots and in a VersionStore,
+    and compare bytes stored and time to rebuild versions.
+    :returns:
+    - (dict) bytes stored each way, ratio, rebuild ms and round trips
+    """
+    from io_cache import MemoryBackend
+    rnd = random.Random(7)
+    rec = {f"region_{i}": {"terrain": rnd.choice(["hill", "marsh", "plain"]),
+                           "pop": rnd.randint(0, 9999),
+                           "tiles": [rnd.randint(0, 255) for _ in range(
+                               2000 if i % 20 == 0 else 60)]}
+           for i in range(p_fields)}
+    snaps = MemoryBackend()
+    store = MemoryBackend()
+    vs = VersionStore(store)
+    for v in range(p_versions):
+        for f in rnd.sample(list(rec), p_changed):
+            rec[f] = dict(rec[f], pop=rnd.randint(0, 9999))
+        snaps.set(f"archive:world:{v}", VersionStore.to_bytes(rec))
+        vs.put("world", rec)
+    last = json.loads(json.dumps(rec))
+    size = {nm: sum(len(v) for v in b.data.values())
+            for nm, b in (("snapshots", snaps), ("versioned", store))}
+    store.stats['round_trips'] = 0
+    t0 = time.perf_counter()
+    for v in range(1, p_versions + 1):
+        vs.get("world", v)
+    rebuild = (time.perf_counter() - t0) / p_versions
+    assert vs.get("world", p_versions) == last
+    return {"bytes_snapshots": size["snapshots"],
+            "bytes_versioned": size["versioned"],
+            "ratio": round(size["snapshots"] / size["versioned"], 1),
+            "rebuild_ms": round(rebuild * 1000, 2),
+            "round_trips_per_rebuild":
+                round(store.stats['round_trips'] / p_versions, 2),
+            "stats": vs.stats}
+
+
+if __name__ == '__main__':
+    from pprint import pprint
+    pprint(benchmark_versions())
@@ -148,6 +148,8 @@ class RecordMgmt(QWidget):
         WT.log_function(self.set_edits_cache, self)
         self.KEYS = []
         self.ACTIVE_KEY_IX = 0
+        self.KEYS_FIND = None      # (namespace, search) for more pages
+        self.KEYS_CURSOR = None    # cursor for next page, None if done
 
     # Record Type Selector Widgets make functions
     # ============================================================
@@ -666,6 +668,9 @@ class RecordMgmt(QWidget):
         """Return value of search-key text input widget...
 
         ..adjusted to work as a wildcard on keys in the active domain.
+        Keys of a domain all start with "<domain>:", so the pattern is
+        anchored there rather than given a leading "*". That lets the
+        key index read only the domain's keys.
 
         :args:
             dm (str) name of active domain
@@ -678,7 +683,7 @@ class RecordMgmt(QWidget):
         sval = self.edit["dbkey"](wdg.text())
         if f"{dm.lower()}:" not in sval:
             sval = f"{dm.lower()}:{sval}"
-        if sval[:1] != "*":
+        if not sval.startswith(f"{dm.lower()}:") and sval[:1] != "*":
             sval = "*" + sval
         if sval[-1:] != "*":
             sval += "*"
@@ -867,6 +872,8 @@ class RecordMgmt(QWidget):
                        we don't want to actually display the
                        linked record.
         :returns: list of keys that match the pattern, or []
+            Only the first page (RI.PAGE_SIZE keys) is fetched; Next
+            loads more as it reaches the end of the list.
         @DEV:
         - If any changes are pending, enable the Save button, else disable.
           Diagram the process of state management for pending db events.
@@ -888,23 +895,28 @@ class RecordMgmt(QWidget):
         """
         WT.log_function(self.find_redis_keys, self)
         nsid = p_db.replace(".db", "")
-        keys_b = RI.find_keys(nsid, p_search)
-        keys: list = []
-        if keys_b in (None, [], {}):
+        keys_b, cursor = RI.page_keys(nsid, p_search)
+        self.KEYS = [k.decode("utf-8") for k in keys_b]
+        self.KEYS_FIND = (nsid, p_search)
+        self.KEYS_CURSOR = cursor
+        if not self.KEYS:
+            # A page can come back empty once stale keys are pruned.
+            self.load_more_keys()
+        keys: list = list(self.KEYS)
+        if not keys:
             txt = self.recs["msg"]["rec_not_exist"]
             self.editor.set_dbe_status(   # type: ignore
                 f"{txt['a']} {txt['b']} {txt['c']} <{p_search}>")
             self.push_clear_button()
         else:
-            for res in keys_b:
-                keys.append(res.decode("utf-8"))
-            self.KEYS = sorted(keys)
+            more = "" if self.KEYS_CURSOR is None else "+"
             txt = self.recs["msg"]["recs_found"]
             self.editor.set_dbe_status(   # type: ignore
-                f"{txt['a']} {txt['b']} <{len(keys)}> {txt['c']} <{p_search}>")
+                f"{txt['a']} {txt['b']} <{len(keys)}{more}> " +
+                f"{txt['c']} <{p_search}>")
             if p_load_1st_rec:
                 self.ACTIVE_KEY_IX = 0
-                if len(self.KEYS) > 1:
+                if len(self.KEYS) > 1 or self.KEYS_CURSOR is not None:
                     self.editor.enable_buttons(   # type: ignore
                         "get.box", ["next.btn"])
                 self.set_form_values()
@@ -965,13 +977,27 @@ class RecordMgmt(QWidget):
         _ = self.find_redis_keys(
             db.lower(), dm, search, p_load_1st_rec=True)
 
+    def load_more_keys(self):
+        """Append the next page of keys from the last search."""
+        WT.log_function(self.load_more_keys, self)
+        keys_b: list = []
+        while self.KEYS_CURSOR is not None and not keys_b:
+            nsid, search = self.KEYS_FIND
+            keys_b, self.KEYS_CURSOR = \
+                RI.page_keys(nsid, search, self.KEYS_CURSOR)
+        self.KEYS += [k.decode("utf-8") for k in keys_b]
+
     def push_next_button(self):
         """Slot for DB Editor Next push button click action."""
         WT.log_function(self.push_next_button, self)
         self.ACTIVE_KEY_IX += 1
         self.editor.enable_buttons(   # type: ignore
             "get.box", ["prev.btn"])
-        if len(self.KEYS) == (self.ACTIVE_KEY_IX + 1):
+        if len(self.KEYS) <= (self.ACTIVE_KEY_IX + 1):
+            self.load_more_keys()
+        self.ACTIVE_KEY_IX = min(self.ACTIVE_KEY_IX, len(self.KEYS) - 1)
+        if len(self.KEYS) == (self.ACTIVE_KEY_IX + 1) and \
+                self.KEYS_CURSOR is None:
             self.editor.disable_buttons(  # type: ignore
                 "get.box", ["next.btn"])
         self.set_form_values()
@@ -20,17 +20,33 @@ Main behaviors:
 - Write a generic message
     - {size: bytes(4) --> int,
        data: bytes(size) --> bytes}
+
+- Request/response with correlation IDs:
+    - MsgRequester and MsgResponder come from Saskantinon's
+      sv_sequencer, which is put on the path here.
+    - BowMessages is its MsgSequencer, for callers that want the
+      two functions below as methods.
 """
+import sys
 from asyncio import StreamReader, StreamWriter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / 'Saskantinon'))
+from sv_sequencer import MsgRequester, MsgResponder  # noqa: E402,F401
+from sv_sequencer import MsgSequencer as BowMessages  # noqa: E402,F401
+from sv_sequencer import MAX_FRAME  # noqa: E402
 
 
 async def read_msg(stream: StreamReader) -> bytes:
     """
     First 4 bytes are the size of the message.
     Convert them to an integer and read the rest of the message.
+    Refuse sizes over MAX_FRAME rather than trying to buffer them.
     """
     size_bytes = await stream.readexactly(4)
     size = int.from_bytes(size_bytes, byteorder='big')
+    if size > MAX_FRAME:
+        raise ValueError(f'Frame of {size} bytes is over the limit')
     data = await stream.readexactly(size)
     return data
 
@@ -29,47 +29,55 @@ Main behaviors:
 
 import argparse
 import asyncio
+import time
 import uuid
+from itertools import count
 
 import bow_msgs
 
 
 async def main(args):
     """
-    Create a "listener" identiy using uuid.
-    Open server connection.
-    Provide channel name as an input argument.
-    Send the channel name.
-    Wait for data to appear on the socket.
+    Create a requester identity using uuid.
+    Open server connection, subscribed to a reply channel.
+    Send a request to the channel named in the input arguments
+        every `interval` seconds.
+    Wait for the response with the same correlation ID.
     """
     me = uuid.uuid4().hex[:8]
     print(f'Starting up {me}')
-    reader, writer = await asyncio.open_connection(
-        args.host, args.port)
-    print(f'I am {writer.get_extra_info("sockname")}')
-    channel = args.listen.encode()
-    await bow_msgs.send_msg(writer, channel)
+    requester = bow_msgs.MsgRequester(f'/reply/{me}'.encode(),
+                                      args.timeout)
+    await requester.connect(args.host, args.port)
+    channel = args.channel.encode()
     try:
-        while data := await bow_msgs.read_msg(reader):
-            print(f'Received by {me}: {data[:20]}')
-        print('Connection ended.')
-    except asyncio.IncompleteReadError:
+        for i in count():
+            t0 = time.perf_counter()
+            try:
+                data = await requester.request(
+                    channel, f'GetSaskanDataObject {i} from {me}'.encode())
+            except asyncio.TimeoutError:
+                print(f'No response to request {i} by {me}')
+                continue
+            ms = (time.perf_counter() - t0) * 1000
+            print(f'Received by {me} in {ms:.2f} ms: {data[:20]}')
+            await asyncio.sleep(args.interval)
+    except ConnectionError:
         print('Server closed.')
     finally:
-        writer.close()
-        await writer.wait_closed()
+        await requester.close()
 
 
 if __name__ == '__main__':
     """
-    Provide host, port, topic as command line arguments with defaults.
-    ???: Why not close the connection?
-    Answer: because closing the server is all we need to do.
+    Provide host, port, channel as command line arguments with defaults.
     """
     parser = argparse.ArgumentParser()
     parser.add_argument('--host', default='localhost')
-    parser.add_argument('--port', default=52000)
-    parser.add_argument('--listen', default='/topic/saskan_concept')
+    parser.add_argument('--port', default=52000, type=int)
+    parser.add_argument('--channel', default='/queue/saskan_concept')
+    parser.add_argument('--interval', default=1, type=float)
+    parser.add_argument('--timeout', default=5, type=float)
     try:
         asyncio.run(main(parser.parse_args()))
     except KeyboardInterrupt:
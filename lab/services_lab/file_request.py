@@ -69,40 +69,55 @@ At a certain point:
 
 import argparse
 import asyncio
+import time
 import uuid
+from itertools import count
 
-from bow_msgs import BowMessages  # type: ignore
-ms = BowMessages()
+import bow_msgs
 
 
 async def main(args):
     """
     Work on abstracting all texts, as in bow-data component.
+    Send a request every `interval` seconds and wait for its
+    response, matched by correlation ID, instead of blocking on
+    whatever the responder pushes next.
+    With `--in-flight` above 1, send that many requests at a time,
+    pipelined on the one connection.
     """
     me = uuid.uuid4().hex[:8]
     print(f'Starting up {me}')
-    reader, writer = await asyncio.open_connection(
-        args.host, args.port)
-    # Get the address of me, of this socket.
-    print(f'I am {writer.get_extra_info("sockname")}')
-    channel = args.listen.encode()
-    await ms.send_msg(writer, channel)
+    requester = bow_msgs.MsgRequester(f'/reply/{me}'.encode(),
+                                      args.timeout, args.in_flight)
+    await requester.connect(args.host, args.port)
+    channel = args.channel.encode()
     try:
-        while data := await ms.read_msg(reader):
+        for i in count():
+            t0 = time.perf_counter()
+            requests = [f'GetOntologyFile {i}.{n} from {me}'.encode()
+                        for n in range(args.in_flight)]
+            responses = await requester.request_many(
+                channel, requests, return_exceptions=True)
             # Look carefully at what is being printed here.
             # If it could be sensitive, the restrict it from printing
-            print(f'Received by {me}: {data[:20]}')
-        print('Connection ended.')
-    except asyncio.IncompleteReadError:
+            ms = (time.perf_counter() - t0) * 1000
+            for n, data in enumerate(responses):
+                if isinstance(data, asyncio.TimeoutError):
+                    print(f'No response to request {i}.{n} by {me}')
+                elif isinstance(data, Exception):
+                    raise (data)
+                else:
+                    print(f'Received by {me} in {ms:.2f} ms: {data[:20]}')
+            await asyncio.sleep(args.interval)
+    except ConnectionError:
         print('Server closed.')
     finally:
-        writer.close()
-        await writer.wait_closed()
+        await requester.close()
 
 
 if __name__ == '__main__':
     """
-    Not entirely sure what value is needed for --listen.
+    Not entirely sure what value is needed for --channel.
     Don't know that we would want that to be available via an arg.
     Eventually these will move to genuinemerit.net.
     Consider what kind of set-up we want to use for ports.
@@ -110,8 +125,11 @@ if __name__ == '__main__':
     """
     parser = argparse.ArgumentParser()
     parser.add_argument('--host', default='localhost')
-    parser.add_argument('--port', default=52010)
-    parser.add_argument('--listen', default='/queue/ontology_file')
+    parser.add_argument('--port', default=52010, type=int)
+    parser.add_argument('--channel', default='/queue/ontology_file')
+    parser.add_argument('--interval', default=1, type=float)
+    parser.add_argument('--timeout', default=5, type=float)
+    parser.add_argument('--in-flight', default=1, type=int)
     try:
         asyncio.run(main(parser.parse_args()))
     except KeyboardInterrupt:
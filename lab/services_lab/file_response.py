@@ -44,61 +44,49 @@ Am I "listening" for the request or the response?
 import argparse
 import asyncio
 import uuid
-from itertools import count
 
-from bow_msgs import BowMessages  # type: ignore
-ms = BowMessages()
+import bow_msgs
 
 
 async def main(args):
     """
+    Respond to each request on the channel as soon as it arrives.
+    Used to push a message every `interval` seconds, which added up
+    to a full interval of latency to every request and woke up
+    even when nobody was asking.
+
     For uuid, see: https://docs.python.org/3/library/uuid.html
     uuid4 is a random UUID.
     """
-    # Not sure why it is taking only the first part of the uuid.
     me = uuid.uuid4().hex[:8]
     print(f'Starting up {me}')
-    # Could probably blank out (_) the reader here. It is not used.
-    reader, writer = await asyncio.open_connection(
-        host=args.host, port=args.port)
-    # Could capture this into a variable for use in better console msgs.
-    print(f'I am {writer.get_extra_info("sockname")}')
 
-    channel = b'/null'
-    await ms.send_msg(writer, channel)
+    async def get_ontology_file(request: bytes) -> bytes:
+        # Modify this to save the ontology file to Redis if
+        # it is not already there, or if it is out of date.
+        # Then provide the Redis key to the ontology_file as data.
+        return b'X'*args.size or f'Re: {request.decode()} by {me}'.encode()
 
-    chan = args.channel.encode()
+    responder = bow_msgs.MsgResponder(args.channel.encode(),
+                                      get_ontology_file)
     try:
-        for i in count():
-            await asyncio.sleep(args.interval)
-            # Modify this to save the ontology file to Redis if
-            # it is not already there, or if it is out of date.
-            # Then provide the Redis key to the ontology_file as data.
-            data = b'X'*args.size or f'Msg {i} from {me}'.encode()
-            try:
-                await ms.send_msg(writer, chan)
-                await ms.send_msg(writer, data)
-            except OSError:
-                print('Connection ended.')
-                break
-    except asyncio.CancelledError:
-        writer.close()
-        await writer.wait_closed()
+        await responder.serve(args.host, args.port)
+        print('Connection ended.')
+    except OSError:
+        print('Connection ended.')
 
 if __name__ == '__main__':
     """
     Optionally set as arguments:
     - host: str
     - port: int
-    - channel: str  (set up to expect multiple listener workers)
+    - channel: str  (set up to expect multiple responder workers)
     - size: int (bytes)
-    - interval: float (seconds)
     """
     parser = argparse.ArgumentParser()
     parser.add_argument('--host', default='localhost')
     parser.add_argument('--port', default=52010, type=int)
     parser.add_argument('--channel', default='/queue/ontology_file')
-    parser.add_argument('--interval', default=1, type=float)
     parser.add_argument('--size', default=0, type=int)
     try:
         asyncio.run(main(parser.parse_args()))
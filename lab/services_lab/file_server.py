@@ -81,6 +81,9 @@ async def server(reader: StreamReader, writer: StreamWriter):
         await writer.wait_closed()
     except asyncio.IncompleteReadError:
         print(f'Remote {peername} disconnected')
+    except ValueError as err:
+        print(f'Remote {peername} refused: {err}')
+        writer.close()
     finally:
         print(f'Remote {peername} closed')
         SUBSCRIBERS[subscribe_chan].remove(writer)